@@ -0,0 +1,186 @@
+"""
+Batch (many-to-many) route queries.
+
+Queries are grouped by starting classroom so that every distinct
+source needs a single shortest-path tree, and the groups are spread
+over a pool of worker processes. The frozen graph is sent to each
+worker once, when the worker starts, instead of with every task.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from aueb_pathfinding.ultils import shortest_path_tree, reconstruct_path
+
+
+# Frozen graph of the current worker process (set by init_worker)
+_GRAPH = None
+
+
+# ==============================================================
+#                   Worker Side
+# ==============================================================
+
+def init_worker(graph):
+    """ Keep the frozen graph for all the tasks of this worker """
+    global _GRAPH
+    _GRAPH = graph
+
+
+def worker_graph():
+    """ Frozen graph of the current worker process """
+    return _GRAPH
+
+
+def _solve_group(source, targets):
+    """
+    Answer every query of one source with a single search.
+
+    :param source: int
+        Dense id of the starting classroom.
+    :param targets: list[int]
+        Dense ids of the target classrooms.
+
+    :Returns: list[tuple]
+        (path ids, distance) for every target, in the given order.
+    """
+
+    dist, previous = shortest_path_tree(_GRAPH, _GRAPH.nodes[source])
+
+    results = []
+    for target in targets:
+        if target in dist:
+            results.append((reconstruct_path(previous, target), dist[target]))
+        else:
+            results.append(([], math.inf))
+
+    return results
+
+
+# ==============================================================
+#                   Batch API
+# ==============================================================
+
+def pool_imap(graph, func, *iterables, workers=None, chunksize=None):
+    """
+    Lazily map a function over a pool of worker processes sharing one
+    graph.
+
+    Each worker receives the graph once, through the pool initializer,
+    and func reads it with worker_graph(). With a single worker (or a
+    single task) everything runs in this process. Results are yielded
+    in the order of the arguments as they arrive, so the caller can
+    consume each one before the next is held in memory.
+
+    :param graph: FrozenUniversity
+        Frozen university graph shared with the workers.
+    :param func: callable
+        Module-level function to apply (it must be picklable).
+    :param iterables: iterable
+        Arguments of func, as for the built-in map.
+    :param workers: int or None
+        Number of worker processes (None: one per CPU).
+    :param chunksize: int or None
+        Tasks sent to a worker at once (None: about four chunks per
+        worker).
+
+    :Returns: generator
+        Results of func, in the order of the arguments.
+    """
+
+    tasks = list(zip(*iterables))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(tasks) <= 1:
+        init_worker(graph)
+        for args in tasks:
+            yield func(*args)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+
+    # The graph is pickled once per worker through the initializer
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(graph,)
+    ) as pool:
+        yield from pool.map(func, *zip(*tasks), chunksize=chunksize)
+
+
+def pool_map(graph, func, *iterables, workers=None):
+    """
+    Map a function over a pool of worker processes sharing one graph
+    (see pool_imap).
+
+    :Returns: list
+        Results of func, in the order of the arguments.
+    """
+
+    return list(pool_imap(graph, func, *iterables, workers=workers))
+
+
+def group_by_source(graph, pairs):
+    """
+    Group (start, target) classroom names by starting classroom.
+
+    :param graph: FrozenUniversity
+        Frozen university graph.
+    :param pairs: list[tuple]
+        (start name, target name) pairs.
+
+    :Returns: dict
+        Source id -> list of (position in pairs, target id), in order
+        of first appearance.
+    """
+
+    ids = {node.name: i for i, node in enumerate(graph.nodes)}
+
+    groups = {}
+    for position, (start, target) in enumerate(pairs):
+        for name in (start, target):
+            if name not in ids:
+                raise ValueError(f"Unknown classroom: {name!r}")
+        groups.setdefault(ids[start], []).append((position, ids[target]))
+
+    return groups
+
+
+def batch_routes(uni, pairs, workers=None):
+    """
+    Compute the shortest paths of many (start, target) pairs.
+
+    Pairs sharing a start classroom are answered by one single-source
+    search. Groups are processed by a ProcessPoolExecutor (workers=1
+    runs them in this process). Results are returned in the order of
+    pairs, whatever the number of workers.
+
+    :param uni: University or FrozenUniversity
+        University graph (frozen once if needed).
+    :param pairs: list[tuple]
+        (start name, target name) pairs.
+    :param workers: int or None
+        Number of worker processes (None: one per CPU).
+
+    :Returns: list[tuple]
+        (path, distance) for every pair; unreachable pairs give
+        ([], inf).
+    """
+
+    graph = uni.freeze() if hasattr(uni, "freeze") else uni
+    groups = group_by_source(graph, pairs)
+
+    sources = list(groups)
+    targets = [[target for _, target in groups[source]] for source in sources]
+
+    answers = pool_map(graph, _solve_group, sources, targets, workers=workers)
+
+    # Back to the order of pairs
+    results = [None] * len(pairs)
+    for source, answer in zip(sources, answers):
+        for (position, _), (path, dist) in zip(groups[source], answer):
+            results[position] = ([graph.nodes[key] for key in path], dist)
+
+    return results
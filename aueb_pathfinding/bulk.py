@@ -0,0 +1,299 @@
+"""
+Vectorised (NumPy) helpers for building large university graphs.
+
+Instead of calling ultils.distance once per pair of classrooms,
+the candidate pairs of the grid index are gathered in blocks and
+their distances are computed with array operations.
+
+reachable_many runs bounded searches from many classrooms at once
+on the CSR arrays of a FrozenUniversity.
+"""
+
+import numpy as np
+
+from aueb_pathfinding.classes import log_edge_summary
+from aueb_pathfinding.ultils import floor_reach
+
+
+# ==============================================================
+#                   Bulk Distance Calculation
+# ==============================================================
+
+def bulk_distance(x1, y1, f1, x2, y2, f2, floor_weight=1.5):
+    """
+    Compute the weighted distances of many classroom pairs at once.
+
+    Same metric as ultils.distance: Euclidean distance plus
+    floor_weight times the squared floor difference.
+
+    :param x1, y1, f1: numpy.ndarray
+        Integer coordinates and floors of the first classrooms.
+    :param x2, y2, f2: numpy.ndarray
+        Integer coordinates and floors of the second classrooms.
+    :param floor_weight: float
+        Weight factor applied to floor differences.
+
+    :Returns: numpy.ndarray
+        Weighted distance of every pair (float64).
+    """
+
+    # Integer differences, so the squared sum is exact
+    dx = x2 - x1
+    dy = y2 - y1
+    df = f2 - f1
+
+    euclidean_distance = np.sqrt((dx * dx + dy * dy).astype(np.float64))
+    floor_penalty = floor_weight * (df * df)
+
+    return euclidean_distance + floor_penalty
+
+
+# ==============================================================
+#                   Candidate Pairs
+# ==============================================================
+
+def candidate_blocks(x, y, floor, max_distance, floor_weight=1.5, chunk_size=1_000_000):
+    """
+    Generate the candidate pairs of the grid index in bounded blocks.
+
+    Same grid as ultils.neighbour_pairs (cell size max_distance,
+    adjacent cells, reachable floors), but every pair of cells is
+    expanded into index arrays at once.
+
+    :param x, y, floor: numpy.ndarray
+        Integer coordinates and floors of the classrooms.
+    :param max_distance: float
+        Maximum allowed distance of an edge.
+    :param floor_weight: float
+        Weight factor applied to floor differences.
+    :param chunk_size: int
+        Approximate maximum number of pairs per block.
+
+    :Yields: tuple
+        Index arrays (i, j) of candidate pairs, each pair once.
+    """
+
+    n = len(x)
+    if n < 2 or max_distance < 0:
+        return
+
+    # A negative floor weight shortens distances, compare all pairs
+    if floor_weight < 0:
+        i, j = np.triu_indices(n, 1)
+        for start in range(0, len(i), chunk_size):
+            yield i[start:start + chunk_size], j[start:start + chunk_size]
+        return
+
+    size = max_distance if max_distance > 0 else 1.0
+    cx = np.floor_divide(x, size).astype(np.int64)
+    cy = np.floor_divide(y, size).astype(np.int64)
+
+    # Sort classrooms by cell and locate the members of every cell
+    order = np.lexsort((cy, cx, floor))
+    keys = np.stack((cx[order], cy[order], floor[order]), axis=1)
+    bounds = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [n]))
+
+    cells = {
+        tuple(keys[s].tolist()): order[s:e]
+        for s, e in zip(starts.tolist(), ends.tolist())
+    }
+
+    reach = floor_reach(max_distance, floor_weight, int(floor.max() - floor.min()))
+    offsets = [
+        (dx, dy, df)
+        for df in range(-reach, reach + 1)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+    ]
+
+    pending_i, pending_j, pending = [], [], 0
+
+    for key, members in cells.items():
+        kx, ky, kf = key
+
+        for dx, dy, df in offsets:
+            other_key = (kx + dx, ky + dy, kf + df)
+
+            # Each pair of cells is visited once, from the smaller key
+            if other_key < key:
+                continue
+
+            others = cells.get(other_key)
+            if others is None:
+                continue
+
+            if other_key == key:
+                a, b = np.triu_indices(len(members), 1)
+                pending_i.append(members[a])
+                pending_j.append(members[b])
+            else:
+                pending_i.append(np.repeat(members, len(others)))
+                pending_j.append(np.tile(others, len(members)))
+
+            pending += len(pending_i[-1])
+
+            # Flush a block once it is large enough
+            if pending >= chunk_size:
+                yield np.concatenate(pending_i), np.concatenate(pending_j)
+                pending_i, pending_j, pending = [], [], 0
+
+    if pending:
+        yield np.concatenate(pending_i), np.concatenate(pending_j)
+
+
+# ==============================================================
+#                   Bulk Edge Construction
+# ==============================================================
+
+def build_edges(uni, chunk_size=1_000_000):
+    """
+    Add every edge within uni.max_distance to the university graph.
+
+    Distances are computed block by block with bulk_distance, so memory
+    is bounded by chunk_size pairs. Accepted weights are rounded with
+    Python's round(..., 2), exactly as University.add_edge does.
+
+    :param uni: University
+        University graph whose nodes are already added.
+    :param chunk_size: int
+        Approximate maximum number of candidate pairs per block.
+
+    :Returns: dict
+        Summary of the candidate pairs, as University.add_edges.
+    """
+
+    nodes = uni.nodes
+    x = np.fromiter((node.x for node in nodes), dtype=np.int64, count=len(nodes))
+    y = np.fromiter((node.y for node in nodes), dtype=np.int64, count=len(nodes))
+    floor = np.fromiter((node.floor for node in nodes), dtype=np.int64, count=len(nodes))
+
+    tested = added = same = 0
+    for i, j in candidate_blocks(x, y, floor, uni.max_distance, uni.floor_weight, chunk_size):
+
+        dist = bulk_distance(x[i], y[i], floor[i], x[j], y[j], floor[j], uni.floor_weight)
+
+        # Threshold the whole block at once
+        keep = dist <= uni.max_distance
+        tested += len(keep)
+        i, j, dist = i[keep], j[keep], dist[keep]
+
+        for a, b, d in zip(i.tolist(), j.tolist(), dist.tolist()):
+            node1, node2 = nodes[a], nodes[b]
+            # Same classroom (by name), add_edge would skip it too
+            if node1 == node2:
+                same += 1
+                continue
+            uni._link(node1, node2, round(d, 2), components=False)
+            added += 1
+
+    too_far = tested - added - same
+    uni.rejections["same classroom"] += same
+    uni.rejections["too far"] += too_far
+
+    # One rebuild of the component index instead of a union per edge
+    if added:
+        uni.components.dirty = True
+
+    summary = {"tested": tested, "added": added, "same classroom": same, "too far": too_far}
+    log_edge_summary(summary)
+    return summary
+
+
+# ==============================================================
+#                   Bulk Reachability
+# ==============================================================
+
+def reachable_many(graph, starts, budget, block_size=None, max_cells=4_000_000):
+    """
+    Vectorised ultils.reachable_within for many source classrooms.
+
+    The searches of a block of sources advance together, one frontier
+    of (source, node) pairs at a time: all edges leaving the frontier
+    are relaxed with array operations, and the pairs whose cost
+    improved (within the budget) form the next frontier. Costs are
+    kept in a (sources, nodes) block, so memory is bounded by
+    max_cells entries per block.
+
+    :param graph: FrozenUniversity
+        Frozen university graph.
+    :param starts: list[Classroom]
+        Source classrooms.
+    :param budget: float
+        Maximum path cost.
+    :param block_size: int or None
+        Sources per block (None: as many as fit in max_cells).
+    :param max_cells: int
+        Cost entries per block when block_size is None.
+
+    :Returns: list[tuple]
+        For every start, (ids, costs) arrays of the classrooms within
+        the budget in increasing cost order; ids index graph.nodes.
+    """
+
+    n = len(graph.nodes)
+    indptr = np.asarray(graph.indptr, dtype=np.int64)
+    indices = np.asarray(graph.indices, dtype=np.int64)
+    weights = np.asarray(graph.weights, dtype=np.float64)
+
+    if block_size is None:
+        block_size = max(1, max_cells // max(n, 1))
+
+    results = []
+    for first in range(0, len(starts), block_size):
+        block = starts[first:first + block_size]
+        cost = np.full((len(block), n), np.inf)
+
+        # Frontier of (row, node) pairs, sources unknown to the graph stay empty
+        keys = [graph.key_of(start) for start in block]
+        rows = np.array([row for row, key in enumerate(keys) if key is not None], dtype=np.int64)
+        nodes = np.array([key for key in keys if key is not None], dtype=np.int64)
+        if budget >= 0:
+            cost[rows, nodes] = 0.0
+        else:
+            rows = nodes = rows[:0]
+
+        while len(rows):
+
+            # Every edge leaving the frontier, in CSR order
+            begin = indptr[nodes]
+            degree = indptr[nodes + 1] - begin
+            offsets = np.cumsum(degree) - degree
+            edge = np.arange(degree.sum()) - np.repeat(offsets - begin, degree)
+
+            from_cost = np.repeat(cost[rows, nodes], degree)
+            rows = np.repeat(rows, degree)
+            targets = indices[edge]
+            alt = from_cost + weights[edge]
+
+            # Improvements within the budget
+            better = (alt <= budget) & (alt < cost[rows, targets])
+            rows, targets, alt = rows[better], targets[better], alt[better]
+
+            # Keep the cheapest candidate of every (row, node) pair
+            order = np.argsort(alt, kind="stable")
+            cell, first_seen = np.unique((rows * n + targets)[order], return_index=True)
+            cost.flat[cell] = alt[order][first_seen]
+
+            rows, nodes = cell // n, cell % n
+
+        results.extend(_block_results(cost))
+
+    return results
+
+
+def _block_results(cost):
+    """
+    (ids, costs) of the finite entries of every row, by increasing cost.
+    """
+
+    results = []
+    for row in cost:
+        ids = np.flatnonzero(np.isfinite(row))
+        costs = row[ids]
+        order = np.argsort(costs, kind="stable")
+        results.append((ids[order], costs[order]))
+
+    return results
+
@@ -0,0 +1,181 @@
+"""
+Shortest-path result cache used by the University graph.
+
+The cache keeps two bounded LRU stores:
+- routes: (start, target) -> (path, distance)
+- trees: source -> complete shortest-path tree (dist, previous)
+
+The graph is undirected, so a route cached as (A, B) also answers
+(B, A), and a tree rooted at either end answers the query. A route
+answered backwards has its cost summed again from its start, so the
+result never depends on which end was searched first.
+"""
+
+import math
+from collections import OrderedDict
+
+from aueb_pathfinding.ultils import path_cost, reconstruct_path
+
+
+class RouteCache:
+
+    """
+    Bounded LRU cache of shortest-path results and trees.
+
+    Hit, miss and eviction counters are kept for both stores and can
+    be read with stats().
+    """
+
+    # Initialization
+    def __init__(self, max_routes=1024, max_trees=32):
+
+        # Basic validation
+        if not isinstance(max_routes, int) or max_routes < 0:
+            raise ValueError("max_routes must be a non-negative integer.")
+
+        if not isinstance(max_trees, int) or max_trees < 0:
+            raise ValueError("max_trees must be a non-negative integer.")
+
+        # Assign attributes
+        self.max_routes = max_routes
+        self.max_trees = max_trees
+        self.routes = OrderedDict()
+        self.trees = OrderedDict()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Lookup
+    def get(self, start, target, graph=None):
+
+        """
+        Look up a route in the cache.
+
+        :param start: Classroom
+            Starting classroom.
+        :param target: Classroom
+            Target classroom.
+        :param graph: University or None
+            Graph of the cached routes. If given, routes answered
+            backwards get their cost summed from start (see path_cost),
+            exactly as dijkstra(start, target) sums it.
+
+        :Returns: tuple or None
+            (path, distance) if the route can be answered from the
+            cache, None otherwise.
+        """
+
+        # Cached route, in either direction
+        for key, backwards in (((start, target), False), ((target, start), True)):
+            if key in self.routes:
+                self.routes.move_to_end(key)
+                self.hits += 1
+                path, dist = self.routes[key]
+                if backwards:
+                    path = path[::-1]
+                    dist = self._forward_cost(graph, path, dist)
+                return path, dist
+
+        # Cached tree rooted at either end, O(path length)
+        for root, other, backwards in ((start, target, False), (target, start, True)):
+            if root in self.trees:
+                self.trees.move_to_end(root)
+                self.hits += 1
+                dist, previous = self.trees[root]
+
+                if other in dist:
+                    path = reconstruct_path(previous, other)
+                    if backwards:
+                        path.reverse()
+                        route = path, self._forward_cost(graph, path, dist[other])
+                    else:
+                        route = path, dist[other]
+                else:
+                    route = [], math.inf
+
+                self.put(start, target, route)
+                return route
+
+        self.misses += 1
+        return None
+
+    @staticmethod
+    def _forward_cost(graph, path, dist):
+        """ Cost of a reversed path, summed again from its new start """
+        if graph is None or not path:
+            return dist
+        return path_cost(graph, path)
+
+    # Store a route
+    def put(self, start, target, route):
+
+        """
+        Store a (path, distance) result, evicting the least recently used.
+        """
+
+        self.routes[(start, target)] = route
+        self.routes.move_to_end((start, target))
+
+        while len(self.routes) > self.max_routes:
+            self.routes.popitem(last=False)
+            self.evictions += 1
+
+    # Store a tree
+    def put_tree(self, source, dist, previous):
+
+        """
+        Store a complete shortest-path tree rooted at source.
+
+        :param dist: dict
+            Shortest distance of every reachable classroom.
+        :param previous: dict
+            Predecessor of every reachable classroom.
+        """
+
+        self.trees[source] = (dist, previous)
+        self.trees.move_to_end(source)
+
+        while len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+            self.evictions += 1
+
+    # Invalidation
+    def clear(self):
+
+        """
+        Drop every cached result (the counters are kept).
+        """
+
+        self.routes.clear()
+        self.trees.clear()
+
+    def clear_routes(self):
+
+        """
+        Drop the cached routes but keep the trees (after the trees have
+        been repaired, see University.disable_edge).
+        """
+
+        self.routes.clear()
+
+    def drop_tree(self, source):
+        """ Drop the tree rooted at source, if cached """
+        self.trees.pop(source, None)
+
+    # Counters
+    def stats(self):
+
+        """
+        :Returns: dict
+            Hits, misses, evictions and current sizes of the cache.
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "routes": len(self.routes),
+            "trees": len(self.trees),
+        }
@@ -2,12 +2,40 @@
 This file contains the core classes used in the project:
 - Classroom
 - University
+- FrozenUniversity (read-only, array-backed University)
 
 These classes model the university map as a graph structure,
 where classrooms are nodes and walkable paths are edges.
 """
 
-from aueb_pathfinding.ultils import distance  # Used inside University for edge weights
+import sys
+import math
+import logging
+import threading
+from array import array
+
+from aueb_pathfinding import profiling
+from aueb_pathfinding.cache import RouteCache
+from aueb_pathfinding.components import ComponentIndex
+from aueb_pathfinding.spatial import SpatialIndex, route_from_position
+from aueb_pathfinding.ultils import distance, neighbour_pairs  # Used inside University for edges
+from aueb_pathfinding.ultils import shortest_path_tree, reconstruct_path, repair_tree
+
+# Shared empty adjacency for classrooms without edges
+_NO_EDGES = {}
+
+logger = logging.getLogger(__name__)
+
+def log_edge_summary(summary):
+    """
+    Log the outcome of a bulk edge insertion at INFO level.
+    """
+
+    logger.info(
+        "%d candidate pairs: %d edges added, %d too far, %d same classroom",
+        summary["tested"], summary["added"], summary["too far"], summary["same classroom"],
+    )
+
 
 class Classroom:
 
@@ -15,11 +43,19 @@ class Classroom:
     Classroom object representing a single room in the university.
 
     Each classroom is defined by its name, spatial coordinates,
-    and floor level.
+    and floor level, plus an optional dense integer id.
+
+    Classrooms are immutable and slotted (no instance __dict__). Names
+    are interned, so equal names share one string, and the hash is the
+    hash of the name, which the string computes once and keeps: the
+    dictionary lookups of the searches never hash a name twice.
+    Equality and hash still only depend on the name.
     """
 
+    __slots__ = ("name", "x", "y", "floor", "id")
+
     # Initialization
-    def __init__(self, name, x, y, floor):
+    def __init__(self, name, x, y, floor, id=None):
 
         # Basic validation
         if not isinstance(name, str) or name.strip() == "":
@@ -31,11 +67,39 @@ class Classroom:
         if not isinstance(floor, int):
             raise ValueError("Floor must be an integer.")
 
+        if id is not None and (not isinstance(id, int) or id < 0):
+            raise ValueError("Classroom id must be a non-negative integer.")
+
         # Assign attributes
-        self.name = name
-        self.x = x
-        self.y = y
-        self.floor = floor
+        self._assign(name, x, y, floor, id)
+
+    # Construction without validation
+    @classmethod
+    def _unchecked(cls, name, x, y, floor, id=None):
+        """ Create a classroom from already validated data (e.g. snapshots) """
+        node = cls.__new__(cls)
+        node._assign(name, x, y, floor, id)
+        return node
+
+    def _assign(self, name, x, y, floor, id):
+        name = sys.intern(name)
+        set_attribute = object.__setattr__
+        set_attribute(self, "name", name)
+        set_attribute(self, "x", x)
+        set_attribute(self, "y", y)
+        set_attribute(self, "floor", floor)
+        set_attribute(self, "id", id)
+
+    # Immutability
+    def __setattr__(self, attribute, value):
+        raise AttributeError("Classroom objects are immutable.")
+
+    def __delattr__(self, attribute):
+        raise AttributeError("Classroom objects are immutable.")
+
+    # Pickling
+    def __reduce__(self):
+        return Classroom._unchecked, (self.name, self.x, self.y, self.floor, self.id)
 
     # Print method
     def __str__(self):
@@ -51,13 +115,15 @@ class Classroom:
         But It was something disccussed in class and 
         thought of incorporating """
 
+        if self is other:
+            return True
         if not isinstance(other, Classroom):
             return False
         return self.name == other.name
 
-    # Hash items
+    # Hash items (str caches its own hash)
     def __hash__(self):
-        return hash((self.name))
+        return hash(self.name)
         
 
 class University: 
@@ -67,6 +133,13 @@ class University:
 
     This class stores classrooms as nodes and walking distances
     between them as edges, forming an undirected weighted graph.
+
+    Classrooms and edges can be closed temporarily (disable_node,
+    disable_edge) and edge weights changed (set_edge_weight): cached
+    shortest-path trees are then repaired instead of recomputed. Every
+    change increments version, and changes, cached queries and freeze()
+    are serialised by a lock, so a frozen copy is a consistent snapshot
+    of one version.
     """
 
     # Initialization
@@ -91,12 +164,112 @@ class University:
             if not isinstance(n, Classroom):
                 raise TypeError("All nodes must be Classroom objects")
 
+        # Shortest-path results, cleared whenever the graph changes
+        self.route_cache = RouteCache()
+
+        # Change counter and lock for consistent snapshots
+        self.version = 0
+        self._lock = threading.RLock()
+
+        # Closed edges ({node1, node2} -> weight) and closed classrooms
+        # (classroom -> its edges when it was closed)
+        self.closed_edges = {}
+        self.closed_nodes = {}
+
+        # Number of rejected nodes and edges, by reason
+        self.rejections = {"invalid classroom": 0, "same classroom": 0, "too far": 0}
+
         # Assign attributes
-        self.nodes = list(nodes)
-        self.edges = dict(edges)
+        self._nodes = list(nodes)
+        self._edges = dict(edges)
         self.max_distance = float(max_distance)
         self.floor_weight = floor_weight
-        
+
+        # Connected components, kept up to date by add_node and add_edge
+        # (rebuilt once after bulk edge building or closures)
+        self.components = ComponentIndex.from_graph(self._nodes, self._edges)
+
+        # Nearest-classroom index, built on first use (see spatial_index)
+        self._spatial = None
+
+    # Construction from parsed records
+    @classmethod
+    @profiling.stage("load")
+    def from_records(cls, records, max_distance=21.0, floor_weight=1.5):
+
+        """
+        Create a University (nodes only) from classroom records.
+
+        :param records: iterable
+            (name, x, y, floor) tuples, e.g. from ultils.iter_map.
+        :param max_distance: float
+            Graph's maximum distance.
+        :param floor_weight: float
+            Graph's floor weight.
+
+        :Returns: University
+            University whose nodes are the given classrooms.
+        """
+
+        uni = cls(max_distance=max_distance, floor_weight=floor_weight)
+        uni.nodes = [Classroom(name, x, y, floor) for name, x, y, floor in records]
+        return uni
+
+    # Graph contents (replacing them marks the component index dirty)
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, value):
+        self._nodes = value
+        self.components.dirty = True
+        self._invalidate()
+
+    @property
+    def edges(self):
+        return self._edges
+
+    @edges.setter
+    def edges(self, value):
+        self._edges = value
+        self.components.dirty = True
+        self._invalidate()
+
+    # Graph parameters (changing them invalidates cached routes)
+    @property
+    def max_distance(self):
+        return self._max_distance
+
+    @max_distance.setter
+    def max_distance(self, value):
+        self._max_distance = value
+        self._invalidate()
+
+    @property
+    def floor_weight(self):
+        return self._floor_weight
+
+    @floor_weight.setter
+    def floor_weight(self, value):
+        self._floor_weight = value
+        self._invalidate()
+
+    # Any change drops the cached routes and starts a new version
+    def _invalidate(self):
+        self.version += 1
+        self.route_cache.clear()
+
+    # Lock-free pickling (e.g. copies sent to other processes)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
     # Nodes
     def add_node(self, node):
         
@@ -109,9 +282,13 @@ class University:
 
         # Basic validation
         if isinstance(node, Classroom):
-            self.nodes.append(node)
+            with self._lock:
+                self.nodes.append(node)
+                self.components.add(node)
+                self._invalidate()
         else:
-            print("Invalid classroom. Please provide a Classroom object.")
+            self.rejections["invalid classroom"] += 1
+            logger.warning("Invalid classroom %r. Please provide a Classroom object.", node)
 
     # Edges
     def add_edge(self, node1, node2):
@@ -121,31 +298,335 @@ class University:
 
         The edge weight is calculated using the distance function
         and is only added if it does not exceed the maximum distance.
+        Rejected pairs are counted in rejections and logged at DEBUG
+        level (see add_edges to add many pairs at once).
+
+        :Returns: bool
+            True if the edge was added, False otherwise.
         """
         
         # Check if nodes are the same (eq from classroom object)
         if node1 == node2:
-            print("Node 1 and Node 2 are the same")
-            return
+            self.rejections["same classroom"] += 1
+            logger.debug("Node 1 and Node 2 are the same (%s)", node1.name)
+            return False
 
         # calsulate the distance between the nodes 
         dist = distance(node1, node2, floor_weight=self.floor_weight)
 
         # Distance has to be valid 
         if dist > self.max_distance:
-            print(f"{node1.name} is too far from {node2.name}")
-            return
+            self.rejections["too far"] += 1
+            logger.debug("%s is too far from %s", node1.name, node2.name)
+            return False
 
-        # Initialise place in dictionary to store each node
-        if node1 not in self.edges:
-            self.edges[node1] = {}
-        
-        if node2 not in self.edges:
-            self.edges[node2] = {}
+        self._link(node1, node2, round(dist, 2))
+        return True
+
+    def _link(self, node1, node2, weight, components=True):
+
+        """
+        Store an undirected edge whose weight is already computed.
+
+        Bulk callers pass components=False and mark the component
+        index dirty once all edges are stored.
+        """
+
+        with self._lock:
+            # Initialise place in dictionary to store each node
+            if node1 not in self.edges:
+                self.edges[node1] = {}
+
+            if node2 not in self.edges:
+                self.edges[node2] = {}
+
+            # Add both "directions" (A21 -> A22, A22 -> A21), the graph is undirected
+            self.edges[node1][node2] = weight
+            self.edges[node2][node1] = weight
+
+            if components:
+                self.components.union(node1, node2)
+            self._invalidate()
+
+    def add_edges(self, pairs, rejected=None):
+
+        """
+        Bulk version of add_edge for many classroom pairs.
+
+        Nothing is logged per pair: rejected pairs are only counted, and a
+        single summary is logged at INFO level once all pairs are added.
+
+        :param pairs: iterable
+            (node1, node2) pairs of classrooms.
+        :param rejected: list or None
+            If given, receives (node1, node2, reason) of every rejected pair.
+
+        :Returns: dict
+            Number of pairs "tested", edges "added", and rejected pairs
+            by reason ("same classroom", "too far").
+        """
+
+        floor_weight = self.floor_weight
+        max_distance = self.max_distance
+        tested = added = same = too_far = 0
+
+        for node1, node2 in pairs:
+            tested += 1
+
+            if node1 == node2:
+                same += 1
+                reason = "same classroom"
+            else:
+                dist = distance(node1, node2, floor_weight=floor_weight)
+                if dist <= max_distance:
+                    self._link(node1, node2, round(dist, 2), components=False)
+                    added += 1
+                    continue
+                too_far += 1
+                reason = "too far"
+
+            if rejected is not None:
+                rejected.append((node1, node2, reason))
+
+        self.rejections["same classroom"] += same
+        self.rejections["too far"] += too_far
+
+        # One rebuild of the component index instead of a union per edge
+        if added:
+            self.components.dirty = True
+
+        summary = {"tested": tested, "added": added, "same classroom": same, "too far": too_far}
+        log_edge_summary(summary)
+        return summary
+
+    # Build all edges
+    @profiling.stage("build edges")
+    def build_edges(self, vectorized=False, chunk_size=1_000_000):
+
+        """
+        Connect every pair of classrooms that lie within the maximum distance.
+
+        Candidate pairs come from a grid index (see ultils.neighbour_pairs),
+        so only nearby classrooms are passed to add_edges instead of all
+        n * (n - 1) / 2 pairs. The resulting edges are identical.
+
+        :param vectorized: bool
+            Compute the distances in NumPy blocks (see bulk.build_edges)
+            instead of one add_edge call per pair. Requires NumPy.
+        :param chunk_size: int
+            Maximum number of candidate pairs per block when vectorized.
+
+        :Returns: dict
+            Summary of the candidate pairs (see add_edges).
+        """
+
+        if vectorized:
+            # Imported here so that NumPy is only needed on this path
+            from aueb_pathfinding.bulk import build_edges
+            summary = build_edges(self, chunk_size=chunk_size)
+
+        else:
+            nodes = self.nodes
+            summary = self.add_edges(
+                (nodes[i], nodes[j])
+                for i, j in neighbour_pairs(nodes, self.max_distance, self.floor_weight)
+            )
+
+        profiling.count("pairs tested", summary["tested"])
+        profiling.count("edges accepted", summary["added"])
+        profiling.count("edges rejected", summary["tested"] - summary["added"])
+        return summary
+
+    # ==============================================================
+    #                   Closures and Weight Changes
+    # ==============================================================
+
+    def disable_edge(self, node1, node2):
+
+        """
+        Close the edge between two classrooms (e.g. a blocked corridor)
+        until enable_edge is called.
+
+        :Returns: bool
+            True if the edge was closed, False if there is no open edge.
+        """
+
+        with self._lock:
+            key = frozenset((node1, node2))
+            if key in self.closed_edges:
+                return False
+
+            weight = self.edges.get(node1, _NO_EDGES).get(node2)
+            if weight is not None:
+                del self.edges[node1][node2]
+                del self.edges[node2][node1]
+                self.closed_edges[key] = weight
+                self.components.dirty = True
+                self._changed([(node1, node2)])
+                return True
+
+            # Edge of a closed classroom: it now stays closed on its own
+            for node, other in ((node1, node2), (node2, node1)):
+                stash = self.closed_nodes.get(node)
+                if stash is not None and other in stash:
+                    self.closed_edges[key] = stash.pop(other)
+                    return True
+
+            return False
+
+    def enable_edge(self, node1, node2):
+
+        """
+        Reopen an edge closed by disable_edge. If one of its classrooms
+        is still closed, the edge reopens together with that classroom.
+
+        :Returns: bool
+            True if the edge was closed before.
+        """
+
+        with self._lock:
+            weight = self.closed_edges.pop(frozenset((node1, node2)), None)
+            if weight is None:
+                return False
+
+            for node, other in ((node1, node2), (node2, node1)):
+                if node in self.closed_nodes:
+                    self.closed_nodes[node][other] = weight
+                    return True
+
+            self._restore(node1, node2, weight)
+            self._changed([(node1, node2)])
+            return True
+
+    def disable_node(self, node):
+
+        """
+        Close a classroom: all its edges are removed until enable_node is
+        called. Routes can neither start, end nor pass through it.
+
+        :Returns: bool
+            True if the classroom was closed, False if it already was.
+        """
+
+        with self._lock:
+            if node in self.closed_nodes:
+                return False
+
+            stash = self.edges.pop(node, {})
+            for neighbour in stash:
+                del self.edges[neighbour][node]
+            self.edges[node] = {}
+            self.closed_nodes[node] = stash
+            self.components.dirty = True
+
+            self.route_cache.drop_tree(node)
+            self._changed([(node, neighbour) for neighbour in stash])
+            return True
+
+    def enable_node(self, node):
+
+        """
+        Reopen a classroom closed by disable_node. Its edges to classrooms
+        that are still closed reopen with those classrooms.
+
+        :Returns: bool
+            True if the classroom was closed before.
+        """
+
+        with self._lock:
+            stash = self.closed_nodes.pop(node, None)
+            if stash is None:
+                return False
+
+            changed = []
+            for neighbour, weight in stash.items():
+                if neighbour in self.closed_nodes:
+                    self.closed_nodes[neighbour][node] = weight
+                else:
+                    self._restore(node, neighbour, weight)
+                    changed.append((node, neighbour))
+
+            self._changed(changed)
+            return True
+
+    def set_edge_weight(self, node1, node2, weight):
+
+        """
+        Change the weight of an existing edge (open or closed), e.g. a
+        slow corridor. The distance rule of add_edge is not applied.
+
+        An edge can be made longer but never shorter than the distance
+        between its classrooms: the A* heuristic (see ultils.astar) is
+        only admissible when no edge weighs less than its distance().
+
+        :param weight: float
+            New weight, at least distance(node1, node2) (rounded to 2
+            decimals like add_edge) and non-negative.
 
-        # Add both "directions" (A21 -> A22, A22 -> A21), the graph is undirected
-        self.edges[node1][node2] = round(dist, 2)
-        self.edges[node2][node1] = round(dist, 2)
+        :Returns: float
+            Previous weight.
+
+        :Raises: KeyError
+            If there is no edge between the classrooms.
+        :Raises: ValueError
+            If the weight is below the distance of the classrooms.
+        """
+
+        if weight < 0:
+            raise ValueError("edge weights must be non-negative")
+
+        # Rounded like the weights of add_edge (the heuristic allows for it)
+        shortest = round(distance(node1, node2, self.floor_weight), 2)
+        if weight < shortest:
+            raise ValueError(
+                f"the edge between {node1.name} and {node2.name} cannot weigh less than "
+                f"their distance ({shortest})"
+            )
+
+        with self._lock:
+            old = self.edges.get(node1, _NO_EDGES).get(node2)
+            if old is not None:
+                self.edges[node1][node2] = weight
+                self.edges[node2][node1] = weight
+                if weight != old:
+                    self._changed([(node1, node2)])
+                return old
+
+            # Closed edges keep their new weight until they reopen
+            key = frozenset((node1, node2))
+            if key in self.closed_edges:
+                old, self.closed_edges[key] = self.closed_edges[key], weight
+                return old
+
+            for node, other in ((node1, node2), (node2, node1)):
+                stash = self.closed_nodes.get(node)
+                if stash is not None and other in stash:
+                    old, stash[other] = stash[other], weight
+                    return old
+
+            raise KeyError(f"no edge between {node1.name} and {node2.name}")
+
+    def _restore(self, node1, node2, weight):
+        self.edges.setdefault(node1, {})[node2] = weight
+        self.edges.setdefault(node2, {})[node1] = weight
+        self.components.union(node1, node2)
+
+    def _changed(self, pairs):
+
+        """
+        New version after a closure or weight change of the given
+        classroom pairs: cached routes are dropped, cached trees repaired.
+        """
+
+        self.version += 1
+        self.route_cache.clear_routes()
+
+        repaired = 0
+        for source, (dist, previous) in self.route_cache.trees.items():
+            repaired += repair_tree(self, dist, previous, pairs)
+
+        logger.debug("version %d: %d pairs changed, %d tree nodes repaired",
+                     self.version, len(pairs), repaired)
 
     # Neighbors
     def get_neighbors(self, node):
@@ -166,6 +647,197 @@ class University:
         neighbors = list(self.edges[node].keys())
         return neighbors
     
+    # Cached shortest path
+    def shortest_path(self, start, target):
+
+        """
+        Shortest path between two classrooms, answered from the route cache
+        whenever possible.
+
+        On a miss the complete shortest-path tree of start is computed and
+        cached, so later queries from (or to) the same classroom only walk
+        the tree. Classrooms on different islands of the graph are rejected
+        at once by the component index. The cache is cleared by add_node,
+        add_edge and by changes of max_distance or floor_weight; closures
+        and weight changes only repair the cached trees (see repair_tree).
+
+        Routes answered from the tree of target have their cost summed
+        from start, so a cached answer costs exactly what dijkstra() gives
+        for the same route (between routes of equal length, the tree of
+        target may hold a different one).
+
+        :param start: Classroom
+            Starting classroom.
+        :param target: Classroom
+            Target classroom.
+
+        :Returns: tuple
+            - path: list[Classroom]
+                Shortest path from start to target.
+            - distance: float
+                Total cost of the path.
+        """
+
+        with self._lock:
+            route = self.route_cache.get(start, target, self)
+
+            # Different islands of the graph, nothing to search
+            if route is None and not self.connected(start, target):
+                profiling.count("component rejections")
+                route = [], math.inf
+
+            if route is None:
+                dist, previous = shortest_path_tree(self, start)
+                self.route_cache.put_tree(start, dist, previous)
+
+                if target in dist:
+                    route = reconstruct_path(previous, target), dist[target]
+                else:
+                    route = [], math.inf
+                self.route_cache.put(start, target, route)
+
+        path, dist = route
+        if not path:
+            logger.info("%s is unreachable from %s !", target.name, start.name)
+
+        # Copy, so callers cannot alter the cached path
+        return list(path), dist
+
+    # Search interface (shared with FrozenUniversity)
+    def key_of(self, node):
+        """ Search key of a classroom (the classroom itself) """
+        return node
+
+    def node_of(self, key):
+        """ Classroom of a search key """
+        return key
+
+    def neighbours_of(self, key):
+        """ (neighbour key, weight) pairs of a search key """
+        return self._edges.get(key, _NO_EDGES).items()
+
+    def connected(self, start, target):
+        """ True if a path may exist between two classrooms (component index) """
+        return self.component_index().connected(start, target)
+
+    # Connected components
+    def component_index(self):
+
+        """
+        Component index of the graph, rebuilt first if edges were
+        closed since it was built.
+
+        :Returns: ComponentIndex
+            Up-to-date component index.
+        """
+
+        if self.components.dirty:
+            with self._lock:
+                if self.components.dirty:
+                    self.components = ComponentIndex.from_graph(self.nodes, self.edges)
+
+        return self.components
+
+    def component_sizes(self):
+        """ Sizes of the connected components, largest first """
+        return self.component_index().sizes()
+
+    # Positions
+    def spatial_index(self):
+
+        """
+        Nearest-classroom index over the open classrooms, rebuilt with
+        every new version (classrooms added, closed or reopened,
+        floor_weight changed).
+
+        :Returns: SpatialIndex
+            Up-to-date spatial index.
+        """
+
+        if self._spatial is None or self._spatial[0] != self.version:
+            with self._lock:
+                nodes = [node for node in self.nodes if node not in self.closed_nodes]
+                self._spatial = self.version, SpatialIndex(nodes, self.floor_weight)
+
+        return self._spatial[1]
+
+    def nearest_classroom(self, x, y, floor):
+
+        """
+        Classroom closest to a position (ultils.distance metric).
+
+        :Returns: tuple
+            (Classroom, distance), or (None, inf) without classrooms.
+        """
+
+        return self.spatial_index().nearest(x, y, floor)
+
+    def route_from_position(self, x, y, floor, target):
+
+        """
+        Shortest route from a position to a classroom, starting at the
+        nearest classroom (see spatial.route_from_position). The route
+        itself comes from shortest_path, so it is cached.
+
+        :Returns: tuple
+            (path, distance), distance including the walk from the
+            position to the first classroom of path.
+        """
+
+        return route_from_position(self, self.spatial_index(), x, y, floor, target,
+                                   search=University.shortest_path)
+
+    # Frozen form
+    def freeze(self):
+
+        """
+        Build a read-only, array-backed copy of the graph.
+
+        Classrooms are mapped to dense integer ids (their position in
+        nodes) and the adjacency is stored in CSR form, see
+        FrozenUniversity. Later changes to this University are not
+        reflected in the frozen copy, which records the version it was
+        taken from: it is a consistent snapshot for concurrent readers.
+
+        :Returns: FrozenUniversity
+            Frozen copy of the graph.
+        """
+
+        with self._lock:
+            # Dense ids (equal classrooms share one), edge-only classrooms last
+            index = {}
+            for node in self.nodes:
+                index.setdefault(node, len(index))
+            for node in self.edges:
+                index.setdefault(node, len(index))
+
+            indptr = array("l", [0])
+            indices = array("l")
+            weights = array("d")
+
+            # One row per id, in id order
+            for node in index:
+                for neighbour, weight in self.edges.get(node, _NO_EDGES).items():
+                    indices.append(index[neighbour])
+                    weights.append(weight)
+                indptr.append(len(indices))
+
+            # Component label of every id (roots numbered in id order)
+            components = self.component_index()
+            roots = {}
+            labels = array("l", (roots.setdefault(components.find(node), len(roots)) for node in index))
+
+            return FrozenUniversity(
+                nodes=list(index),
+                indptr=indptr,
+                indices=indices,
+                weights=weights,
+                max_distance=self.max_distance,
+                floor_weight=self.floor_weight,
+                version=self.version,
+                components=labels,
+            )
+
     # String represent
     def __str__(self):
         # Nice way to display Classrooms
@@ -186,6 +858,123 @@ class University:
             f"{links_str}"
         )
 
-        
 
+def component_labels(indptr, indices):
+
+    """
+    Connected-component label of every id of a CSR graph (labels are
+    numbered in order of their smallest id).
+
+    :Returns: array.array
+        Label of every id.
+    """
+
+    n = len(indptr) - 1
+    labels = array("l", [-1]) * n
+    label = 0
+
+    for root in range(n):
+        if labels[root] >= 0:
+            continue
 
+        # Depth-first walk of the component of root
+        labels[root] = label
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for v in indices[indptr[u]:indptr[u + 1]]:
+                if labels[v] < 0:
+                    labels[v] = label
+                    stack.append(v)
+        label += 1
+
+    return labels
+
+
+class FrozenUniversity:
+
+    """
+    Read-only, array-backed form of a University graph.
+
+    Classrooms are mapped to dense integer ids and the adjacency is
+    stored in compressed sparse row (CSR) arrays: the neighbours of
+    node i are indices[indptr[i]:indptr[i + 1]], with the matching
+    edge weights in weights. Create it with University.freeze(); version
+    is the University version it was frozen from (None if unknown).
+    components holds the connected-component label of every id; it is
+    computed on first use when not given.
+    """
+
+    # Initialization
+    def __init__(self, nodes, indptr, indices, weights, max_distance=21.0, floor_weight=1.5, index=None,
+                 version=None, components=None):
+
+        # Basic validation
+        if len(indptr) != len(nodes) + 1:
+            raise ValueError("indptr must have one entry more than nodes.")
+
+        if len(indices) != len(weights):
+            raise ValueError("indices and weights must have the same length.")
+
+        # Assign attributes
+        self.nodes = nodes
+        # Classroom -> dense id, anything with a get() method will do
+        self.index = index if index is not None else {node: i for i, node in enumerate(nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.max_distance = float(max_distance)
+        self.floor_weight = floor_weight
+        self.version = version
+        self.components = components
+
+    # Search interface (shared with University)
+    def key_of(self, node):
+        """ Dense id of a classroom (None if not in the graph) """
+        return self.index.get(node)
+
+    def node_of(self, key):
+        """ Classroom of a dense id """
+        return self.nodes[key]
+
+    def neighbours_of(self, key):
+        """ (neighbour id, weight) pairs of a dense id """
+        start, end = self.indptr[key], self.indptr[key + 1]
+        return zip(self.indices[start:end], self.weights[start:end])
+
+    def connected(self, start, target):
+        """ True if a path exists between two classrooms (component labels) """
+        source, goal = self.index.get(start), self.index.get(target)
+        if source is None or goal is None:
+            return False
+
+        if self.components is None:
+            self.components = component_labels(self.indptr, self.indices)
+        return self.components[source] == self.components[goal]
+
+    # Neighbors
+    def get_neighbors(self, node):
+
+        """
+        Retrieve neighboring classrooms of a given node.
+
+        :param node: Classroom
+            Classroom whose neighbors are requested.
+
+        :Returns: list[Classroom]
+            List of neighboring classrooms.
+        """
+
+        key = self.key_of(node)
+        if key is None:
+            return []
+
+        return [self.nodes[i] for i, _ in self.neighbours_of(key)]
+
+    # String represent
+    def __str__(self):
+        return (
+            f"Frozen University graph with {len(self.nodes)} classrooms and "
+            f"{len(self.indices) // 2} links (maximum distance {self.max_distance}, "
+            f"floor weight {self.floor_weight})"
+        )
@@ -0,0 +1,194 @@
+"""
+Headless batch mode of the indoor navigation system.
+
+Reads (start, target) classroom pairs from a file or stdin and streams
+one JSON object per route to stdout (JSON Lines), flushing every line,
+so memory stays constant whatever the input size.
+
+Usage:
+python -m aueb_pathfinding.cli aueb_map.txt --max-distance 21 --floor-weight 1 < pairs.txt
+
+Each input line holds two classroom names separated by ';', a tab or
+',', e.g. "A21; T201" or "Lab 1; Lab 2" (names may contain spaces, as
+in the map file). Lines without any of them are split on whitespace.
+Log records (malformed map lines included) go to stderr, stdout only
+carries the JSON objects; --log-level INFO adds the edge summary and
+unreachable pairs.
+
+With --profile, stage timings and counters (see profiling.py) are
+printed to stderr at the end; --profile cprofile or --profile
+tracemalloc also report the hottest functions or allocation sites.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import math
+import sys
+import time
+
+from aueb_pathfinding import profiling
+from aueb_pathfinding.menu import load_university
+from aueb_pathfinding.ultils import astar, bidirectional_dijkstra, dijkstra
+
+
+# Search algorithms selectable with --algorithm
+ALGORITHMS = {
+    "dijkstra": dijkstra,
+    "astar": astar,
+    "bidirectional": bidirectional_dijkstra,
+}
+
+# Name separators of an input line, the first one present is used
+# (whitespace otherwise)
+_SEPARATORS = (";", "\t", ",")
+
+
+# ==============================================================
+#                   Input / Output
+# ==============================================================
+
+def parse_pair(line):
+    """
+    Split an input line into (start name, target name).
+
+    :Returns: tuple or None
+        The two names, or None if the line does not hold exactly two.
+    """
+
+    separator = next((sep for sep in _SEPARATORS if sep in line), None)
+    names = [name.strip() for name in line.split(separator)]
+    names = [name for name in names if name]
+    return tuple(names) if len(names) == 2 else None
+
+
+def route_record(graph, search, nodes, start, target):
+    """
+    Compute one route and describe it as a JSON-serialisable dict.
+
+    :param graph: University
+        University graph.
+    :param search: callable
+        Search function with the dijkstra() contract.
+    :param nodes: dict
+        Classroom name -> Classroom.
+
+    :Returns: dict
+        start, target, path (names), cost (None if unreachable) and
+        elapsed_ms, or an error message.
+    """
+
+    record = {"start": start, "target": target}
+
+    unknown = [name for name in (start, target) if name not in nodes]
+    if unknown:
+        record["error"] = f"unknown classroom: {', '.join(unknown)}"
+        return record
+
+    begin = time.perf_counter()
+    path, cost = search(graph, nodes[start], nodes[target])
+    elapsed = time.perf_counter() - begin
+
+    record["path"] = [node.name for node in path]
+    record["cost"] = None if math.isinf(cost) else cost
+    record["elapsed_ms"] = round(elapsed * 1000, 3)
+    return record
+
+
+def stream_routes(graph, lines, out, algorithm="dijkstra"):
+    """
+    Answer every pair of lines, writing one JSON object per line to out.
+
+    :param graph: University or FrozenUniversity
+        University graph.
+    :param lines: iterable[str]
+        Input lines, one pair each.
+    :param out: file
+        Output stream (flushed after every line).
+    :param algorithm: str
+        Key of ALGORITHMS.
+
+    :Returns: int
+        Number of lines that could not be answered.
+    """
+
+    search = ALGORITHMS[algorithm]
+    nodes = {node.name: node for node in graph.nodes}
+    failures = 0
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        pair = parse_pair(line)
+        if pair is None:
+            record = {"line": line_number, "error": f"expected two classroom names, got {line.strip()!r}"}
+        else:
+            record = route_record(graph, search, nodes, *pair)
+
+        if "error" in record:
+            failures += 1
+
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    return failures
+
+
+# ==============================================================
+#                   Entry Point
+# ==============================================================
+
+def main(argv=None):
+
+    """
+    Run the headless batch mode.
+
+    :param argv: list[str] or None
+        Command line arguments (default: sys.argv[1:]).
+
+    :Returns: int
+        Exit status (0 if every line was answered, 1 otherwise).
+    """
+
+    parser = argparse.ArgumentParser(description="Stream shortest routes as JSON Lines.")
+    parser.add_argument("map_file", help="map text file (classroom_name; x; y; floor)")
+    parser.add_argument("--max-distance", type=float, default=21.0)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    parser.add_argument("--queries", default="-", help="file of classroom pairs (default: stdin)")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="dijkstra")
+    parser.add_argument("--profile", nargs="?", const="stages", default=None,
+                        choices=("stages",) + profiling.CAPTURES,
+                        help="print stage timings and counters to stderr at the end")
+    parser.add_argument("--log-level", default="WARNING",
+                        choices=("DEBUG", "INFO", "WARNING", "ERROR"))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level, stream=sys.stderr,
+                        format="%(levelname)s %(name)s: %(message)s")
+
+    out = sys.stdout
+
+    if args.profile is None:
+        recording = contextlib.nullcontext()
+    else:
+        recording = profiling.record(None if args.profile == "stages" else args.profile)
+
+    with recording as profile:
+        graph = load_university(args.map_file, args.max_distance, args.floor_weight)
+
+        if args.queries == "-":
+            failures = stream_routes(graph, sys.stdin, out, args.algorithm)
+        else:
+            with open(args.queries, "r") as lines:
+                failures = stream_routes(graph, lines, out, args.algorithm)
+
+    if profile is not None:
+        print(profile.summary(), file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
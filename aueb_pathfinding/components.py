@@ -0,0 +1,141 @@
+"""
+Connected-component index of the University graph.
+
+A union-find (disjoint sets) structure is kept up to date while edges
+are added, so whether two classrooms are connected at all is answered
+in (almost) O(1). Searches use it to reject pairs lying on different
+islands of the graph without exploring the whole start component.
+
+Removing edges can split a component, which union-find cannot undo:
+the index is then marked dirty and rebuilt on its next use (see
+University.component_index). Bulk edge building does the same, one
+rebuild in O(V + E) being cheaper than a union per edge.
+"""
+
+
+# ==============================================================
+#                   Union-Find
+# ==============================================================
+
+class ComponentIndex:
+
+    """
+    Union-find over search keys, with union by size and path halving.
+
+    Keys that were never added are their own singleton component.
+
+    :Attributes:
+        parent: dict
+            Key -> parent key (roots are their own parent).
+        size: dict
+            Root -> number of keys in its component.
+        dirty: bool
+            True when edges were removed or added in bulk since the
+            index was built: it must be rebuilt before use.
+    """
+
+    # Initialization
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.dirty = False
+
+    @classmethod
+    def from_graph(cls, nodes, edges):
+
+        """
+        Build the index of a graph from scratch.
+
+        :param nodes: iterable
+            Search keys of the graph.
+        :param edges: dict
+            Key -> {neighbour key: weight} adjacency.
+
+        :Returns: ComponentIndex
+            Clean index of the graph.
+        """
+
+        index = cls()
+        parent, size = index.parent, index.size
+
+        for root in [*nodes, *edges]:
+            if root in parent:
+                continue
+
+            # Depth-first walk of the component, every key points to root
+            parent[root] = root
+            stack = [root]
+            while stack:
+                for neighbour in edges.get(stack.pop(), ()):
+                    if neighbour not in parent:
+                        parent[neighbour] = root
+                        stack.append(neighbour)
+
+            size[root] = 0
+
+        for root in parent.values():
+            size[root] += 1
+
+        return index
+
+    # Keys and edges
+    def add(self, key):
+        """ Register a key as its own component (no-op if known) """
+        if key not in self.parent:
+            self.parent[key] = key
+            self.size[key] = 1
+
+    def find(self, key):
+
+        """
+        :Returns:
+            Root key of the component of key.
+        """
+
+        parent = self.parent
+        if key not in parent:
+            return key
+
+        # Path halving: every other key on the way points to its grandparent
+        while parent[key] is not key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+
+        return key
+
+    def union(self, key1, key2):
+
+        """
+        Merge the components of two keys (the ends of a new edge).
+
+        :Returns: bool
+            True if two different components were merged.
+        """
+
+        self.add(key1)
+        self.add(key2)
+        root1, root2 = self.find(key1), self.find(key2)
+
+        if root1 is root2:
+            return False
+
+        # The smaller tree goes below the larger one
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+
+        self.parent[root2] = root1
+        self.size[root1] += self.size.pop(root2)
+        return True
+
+    # Queries
+    def connected(self, key1, key2):
+        """ True if both keys are in the same component """
+        return key1 == key2 or self.find(key1) == self.find(key2)
+
+    def sizes(self):
+        """ Sizes of all components, largest first """
+        return sorted(self.size.values(), reverse=True)
+
+    def __len__(self):
+        """ Number of components """
+        return len(self.size)
@@ -0,0 +1,608 @@
+"""
+Contraction hierarchies for fast repeated route queries on large maps.
+
+Preprocessing contracts the classrooms one by one, from the least to
+the most important. When a classroom v is contracted, a shortcut u-w
+(remembering v as its middle classroom) is added between two of its
+neighbours unless a local search finds a witness, a shorter route
+that avoids v, so distances among the remaining classrooms never
+change. The witness search is bounded (settled classrooms and hops):
+a missed witness only costs a shortcut too many. Every
+classroom finally keeps only its edges to more important classrooms
+(the upward graph).
+
+A query is a bidirectional Dijkstra that only goes upward from both
+ends. A side skips the classrooms reached shorter through a more
+important neighbour (stall on demand) and, with the lower bound of
+astar(), those that cannot lead to a shorter meeting than the best
+one found. Shortcuts are then unpacked recursively into the
+original classrooms, and the cost is summed along the original edges
+from the start, exactly as dijkstra() accumulates it.
+
+The hierarchy is bound to a FrozenUniversity (dense ids) and can be
+saved to / memory-mapped from a binary file next to its snapshot
+(see snapshot.py).
+"""
+
+import hashlib
+import heapq
+import logging
+import math
+import mmap
+import os
+import struct
+from array import array
+
+from aueb_pathfinding import profiling
+from aueb_pathfinding.snapshot import HEADER, padded, section_reader
+from aueb_pathfinding.ultils import heuristic_scale
+
+
+MAGIC = b"AUEBHIER"
+VERSION = 2
+
+# The header is the snapshot one: magic, version, nodes, upward edges,
+# max_distance, floor_weight, graph checksum
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================
+#                   Preprocessing
+# ==============================================================
+
+def _witness_distances(adj, source, skip, targets, limit, hop_limit):
+    """
+    Local Dijkstra search for witnesses: routes from source that avoid
+    the classroom being contracted.
+
+    Every distance found is the length of a real route, so a search cut
+    short by the limits can only miss witnesses (an extra, harmless
+    shortcut).
+
+    :param adj: list[dict]
+        Current graph: adj[u][v] = weight.
+    :param skip: int
+        Classroom being contracted, never entered.
+    :param targets: dict
+        Classroom -> length of its route through skip. The search stops
+        once every route left is longer than the remaining ones.
+    :param limit: int
+        Maximum number of settled classrooms.
+    :param hop_limit: int
+        Maximum number of edges of a witness route.
+
+    :Returns: dict
+        Length of the shortest route found to every reached classroom.
+    """
+
+    left = dict(targets)
+    bound = max(left.values())
+    dist = {source: 0}
+    hops = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+
+    while heap and settled < limit:
+        d, u = heapq.heappop(heap)
+        if d > bound:
+            break
+        if d > dist[u]:
+            continue
+        settled += 1
+
+        if u in left:
+            del left[u]
+            if not left:
+                break
+            bound = max(left.values())
+
+        # Longer witnesses are not looked for (a shortcut too many is harmless)
+        hop = hops[u] + 1
+        if hop > hop_limit:
+            continue
+
+        for v, weight in adj[u].items():
+            alt = d + weight
+            if alt <= bound and v != skip and alt < dist.get(v, math.inf):
+                dist[v] = alt
+                hops[v] = hop
+                heapq.heappush(heap, (alt, v))
+
+    return dist
+
+
+def _shortcuts(adj, v, limit, hop_limit):
+    """
+    Shortcuts needed to contract v (without contracting it): one
+    witness search from each neighbour covers all the later ones.
+
+    A witness as long as u-v-w is enough: it avoids v and only goes
+    through classrooms that are still in the graph, so the contraction
+    keeps the distance from u to w. The list is only valid for the
+    current graph.
+
+    :Returns: list[tuple]
+        (u, w, weight) of every shortcut, u < w.
+    """
+
+    neighbours = sorted(adj[v].items())
+    shortcuts = []
+
+    for k, (u, weight_u) in enumerate(neighbours[:-1]):
+        direct = adj[u]
+        via = {}
+        for w, weight_w in neighbours[k + 1:]:
+            # A direct edge no longer than u-v-w is already a witness
+            if direct.get(w, math.inf) > weight_u + weight_w:
+                via[w] = weight_u + weight_w
+        if not via:
+            continue
+
+        dist = _witness_distances(adj, u, v, via, limit, hop_limit)
+        for w, length in via.items():
+            if dist.get(w, math.inf) > length:
+                shortcuts.append((u, w, length))
+
+    return shortcuts
+
+
+@profiling.stage("contraction")
+def build_hierarchy(graph, witness_limit=500, hop_limit=8):
+
+    """
+    Contract a university graph into a contraction hierarchy.
+
+    Classrooms are contracted by increasing priority: the edge
+    difference (shortcuts added minus edges removed), plus the number
+    of neighbours already contracted and the level (one more than the
+    highest contracted neighbour), which spread the contractions evenly
+    over the map. Priorities change as the graph shrinks: a popped
+    classroom is evaluated again and only contracted if it is still
+    the least important one (lazy updates).
+
+    :param graph: University or FrozenUniversity
+        University graph (a University is frozen first).
+    :param witness_limit: int
+        Maximum number of classrooms settled by one witness search.
+        Lower values do not build faster: the shortcuts they add make
+        the later searches longer.
+    :param hop_limit: int
+        Maximum number of edges of a witness route.
+
+    :Returns: ContractionHierarchy
+        Hierarchy bound to the frozen graph.
+    """
+
+    if hasattr(graph, "freeze"):
+        graph = graph.freeze()
+
+    n = len(graph.nodes)
+
+    # Working graph, adj[u][v] = weight, and the middle classroom of
+    # every shortcut (u, w), u < w
+    adj = [{} for _ in range(n)]
+    for u in range(n):
+        for v, weight in graph.neighbours_of(u):
+            if v != u and weight < adj[u].get(v, math.inf):
+                adj[u][v] = weight
+    middle_of = {}
+
+    contracted_neighbours = [0] * n
+    level = [0] * n
+    rank = array("q", [0]) * n
+    upward = [None] * n
+
+    def priority(v):
+        shortcuts = _shortcuts(adj, v, witness_limit, hop_limit)
+        key = len(shortcuts) - len(adj[v]) + contracted_neighbours[v] + level[v]
+        return key, shortcuts
+
+    current = [priority(v)[0] for v in range(n)]
+    heap = [(current[v], v) for v in range(n)]
+    heapq.heapify(heap)
+
+    order = 0
+    shortcuts_added = 0
+    evaluations = n
+
+    while heap:
+        key, v = heapq.heappop(heap)
+
+        # Stale entry (contracted or re-prioritised since)
+        if upward[v] is not None or key != current[v]:
+            continue
+
+        # Lazy update: contract v only if it is still the least important
+        current[v], shortcuts = priority(v)
+        evaluations += 1
+        if heap and current[v] > heap[0][0]:
+            heapq.heappush(heap, (current[v], v))
+            continue
+
+        # Contraction, with the shortcuts of this evaluation
+        for u, w, weight in shortcuts:
+            if weight < adj[u].get(w, math.inf):
+                adj[u][w] = adj[w][u] = weight
+                middle_of[u, w] = v
+                shortcuts_added += 1
+
+        # The remaining neighbours are all more important than v
+        upward[v] = [
+            (w, weight, middle_of.get((min(v, w), max(v, w)), -1))
+            for w, weight in sorted(adj[v].items())
+        ]
+        rank[v] = order
+        order += 1
+
+        neighbours = adj[v]
+        adj[v] = {}
+        for u in neighbours:
+            del adj[u][v]
+            contracted_neighbours[u] += 1
+            level[u] = max(level[u], level[v] + 1)
+
+            # Rough update (one edge less, one more contracted neighbour),
+            # the exact priority is computed when u is popped
+            current[u] += 2
+            heapq.heappush(heap, (current[u], u))
+
+    # Upward graph in CSR form
+    indptr = array("q", [0])
+    indices = array("q")
+    weights = array("d")
+    middles = array("q")
+
+    for v in range(n):
+        for w, weight, middle in upward[v]:
+            indices.append(w)
+            weights.append(weight)
+            middles.append(middle)
+        indptr.append(len(indices))
+
+    profiling.count("shortcuts added", shortcuts_added)
+    profiling.count("priority evaluations", evaluations)
+
+    return ContractionHierarchy(graph, rank, indptr, indices, weights, middles)
+
+
+# ==============================================================
+#                   Hierarchy
+# ==============================================================
+
+class ContractionHierarchy:
+
+    """
+    Upward graph of a contracted university graph.
+
+    :param graph: FrozenUniversity
+        Frozen graph the hierarchy was built from.
+    :param rank: array
+        Contraction order of every classroom.
+    :param indptr, indices, weights, middles: array
+        Upward edges in CSR form; middles holds the middle classroom of
+        each shortcut (-1 for an original edge).
+    """
+
+    # Initialization
+    def __init__(self, graph, rank, indptr, indices, weights, middles, path=None):
+        self.graph = graph
+        self.rank = rank
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.middles = middles
+        self.path = path
+        self._positions = None
+
+    # Loaded hierarchies pickle as their file (see batch.py)
+    def __reduce__(self):
+        if self.path is not None:
+            return load_hierarchy, (self.path, self.graph)
+        return ContractionHierarchy, (
+            self.graph, self.rank, self.indptr, self.indices, self.weights, self.middles,
+        )
+
+    def _coordinates(self):
+        """ x, y and floor of every classroom, by dense id (built once) """
+        if self._positions is None:
+            nodes = self.graph.nodes
+            self._positions = (
+                [node.x for node in nodes],
+                [node.y for node in nodes],
+                [node.floor for node in nodes],
+            )
+        return self._positions
+
+    def _edge(self, a, b):
+        """ (weight, middle) of the hierarchy edge between a and b """
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        for k in range(self.indptr[low], self.indptr[low + 1]):
+            if self.indices[k] == high:
+                return self.weights[k], self.middles[k]
+        raise KeyError((a, b))
+
+    def _unpack(self, keys):
+        """
+        Expand shortcuts into original edges.
+
+        :Returns: tuple
+            (dense ids of the original route, cost summed from the start)
+        """
+
+        path = [keys[0]]
+        cost = 0
+
+        for a, b in zip(keys, keys[1:]):
+            stack = [(a, b)]
+            while stack:
+                u, w = stack.pop()
+                weight, middle = self._edge(u, w)
+                if middle < 0:
+                    path.append(w)
+                    cost += weight
+                else:
+                    # First u -> middle, then middle -> w
+                    stack.append((middle, w))
+                    stack.append((u, middle))
+
+        return path, cost
+
+    @profiling.stage("hierarchy query")
+    def shortest_path(self, start, target, stats=None):
+
+        """
+        Shortest path between two classrooms.
+
+        The cost is summed along the unpacked route from start, like
+        dijkstra() does, so both give exactly the same cost for the same
+        route. Between routes of equal length the two searches may pick
+        different ones, whose float sums can differ in the last bits
+        (relative 1e-12): bench_hierarchy checks the costs with that
+        tolerance and counts the bit-identical ones.
+
+        :param start: Classroom
+            Starting classroom.
+        :param target: Classroom
+            Target classroom.
+        :param stats: dict or None
+            If given, receives the number of settled nodes (both sides)
+            under "expanded".
+
+        :Returns: tuple
+            - path: list[Classroom]
+                Shortest path from start to target.
+            - distance: float
+                Total cost of the path.
+        """
+
+        graph = self.graph
+        source = graph.key_of(start)
+        goal = graph.key_of(target)
+
+        if source is None or goal is None:
+            if stats is not None:
+                stats["expanded"] = 0
+            return [], math.inf
+
+        # Classrooms on different islands are rejected without searching
+        if not graph.connected(start, target):
+            profiling.count("component rejections")
+            logger.info("%s is unreachable from %s !", target.name, start.name)
+            if stats is not None:
+                stats["expanded"] = 0
+            return [], math.inf
+
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        xs, ys, floors = self._coordinates()
+
+        # Lower bound of the remaining cost, as in astar(): a side may
+        # stop at a classroom that cannot lead to a better meeting
+        scale = heuristic_scale(graph.floor_weight)
+        floor_scale = scale * max(graph.floor_weight, 0.0)
+        ends = (goal, source)
+
+        # Forward and backward upward searches
+        dist = ({source: 0}, {goal: 0})
+        previous = ({source: None}, {goal: None})
+        settled = (set(), set())
+        heaps = ([(0, source)], [(0, goal)])
+        pushes = 2
+
+        best = 0 if source == goal else math.inf
+        meet = source if source == goal else None
+
+        while heaps[0] or heaps[1]:
+
+            # Expand the side with the smaller queue key
+            if not heaps[1] or (heaps[0] and heaps[0][0][0] <= heaps[1][0][0]):
+                side = 0
+            else:
+                side = 1
+
+            d, u = heapq.heappop(heaps[side])
+
+            # Neither side can improve the best meeting any more
+            if d >= best:
+                heaps[side].clear()
+                continue
+
+            if u in settled[side]:
+                continue
+
+            # No meeting through u can beat the best one (lower bound)
+            end = ends[side]
+            tx, ty, tf = xs[end], ys[end], floors[end]
+            if d + scale * math.hypot(xs[u] - tx, ys[u] - ty) + floor_scale * abs(floors[u] - tf) >= best:
+                continue
+            settled[side].add(u)
+
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best = d + other
+                meet = u
+
+            own_dist, own_previous = dist[side], previous[side]
+            start_k, end_k = indptr[u], indptr[u + 1]
+
+            # Stall on demand: if a more important neighbour reaches u
+            # shorter, no shortest route goes up from u
+            relaxed = []
+            for v, weight in zip(indices[start_k:end_k], weights[start_k:end_k]):
+                known = own_dist.get(v, math.inf)
+                if known + weight < d:
+                    break
+                if d + weight < known:
+                    relaxed.append((d + weight, v))
+            else:
+                for alt, v in relaxed:
+                    if alt + scale * math.hypot(xs[v] - tx, ys[v] - ty) + floor_scale * abs(floors[v] - tf) >= best:
+                        continue
+                    own_dist[v] = alt
+                    own_previous[v] = u
+                    heapq.heappush(heaps[side], (alt, v))
+                    pushes += 1
+
+        if stats is not None:
+            stats["expanded"] = len(settled[0]) + len(settled[1])
+        profiling.count_search(len(settled[0]) + len(settled[1]), pushes, sources=2)
+
+        if meet is None:
+            logger.info("%s is unreachable from %s !", target.name, start.name)
+            return [], math.inf
+
+        # start -> meet upward, then meet -> target downward
+        keys = []
+        current = meet
+        while current is not None:
+            keys.append(current)
+            current = previous[0][current]
+        keys.reverse()
+
+        current = previous[1][meet]
+        while current is not None:
+            keys.append(current)
+            current = previous[1][current]
+
+        path, cost = self._unpack(keys)
+        return [graph.node_of(key) for key in path], cost
+
+    def __str__(self):
+        shortcuts = sum(1 for middle in self.middles if middle >= 0)
+        return (
+            f"Contraction hierarchy of {len(self.rank)} classrooms: "
+            f"{len(self.indices)} upward edges, {shortcuts} shortcuts"
+        )
+
+
+# ==============================================================
+#                   Save / Load
+# ==============================================================
+
+def graph_checksum(graph):
+    """
+    SHA-256 digest of the adjacency (indptr, indices, weights) of a
+    frozen graph, identifying the graph a hierarchy was built from.
+
+    :param graph: FrozenUniversity
+        Frozen university graph (or snapshot).
+
+    :Returns: bytes
+        32-byte digest.
+    """
+
+    digest = hashlib.sha256()
+    for section, typecode in ((graph.indptr, "q"), (graph.indices, "q"), (graph.weights, "d")):
+        data = memoryview(section)
+
+        # Same bytes whatever the integer type of the arrays (freeze uses "l")
+        if data.itemsize != 8:
+            data = memoryview(array(typecode, section))
+        digest.update(data.cast("B"))
+
+    return digest.digest()
+
+
+def save_hierarchy(hierarchy, path):
+    """
+    Write a contraction hierarchy to a binary file.
+
+    Only the hierarchy is stored, the classrooms stay in the graph
+    (e.g. a snapshot) it is loaded with. The checksum of that graph
+    is stored too, see load_hierarchy.
+
+    :param hierarchy: ContractionHierarchy
+        Hierarchy to save.
+    :param path: str
+        File to write (renamed into place once complete).
+    """
+
+    graph = hierarchy.graph
+    header = HEADER.pack(
+        MAGIC, VERSION, len(hierarchy.rank), len(hierarchy.indices),
+        graph.max_distance, graph.floor_weight, graph_checksum(graph),
+    )
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path + ".tmp", "wb") as file:
+        file.write(header)
+        for section in (
+            array("q", hierarchy.rank),
+            array("q", hierarchy.indptr),
+            array("q", hierarchy.indices),
+            array("d", hierarchy.weights),
+            array("q", hierarchy.middles),
+        ):
+            file.write(padded(section.tobytes()))
+
+    os.replace(path + ".tmp", path)
+
+
+def load_hierarchy(path, graph):
+    """
+    Memory-map a contraction hierarchy saved with save_hierarchy.
+
+    The graph must be the one the hierarchy was built from: same size,
+    parameters and adjacency (see graph_checksum). Another map, even of
+    the same size, would give wrong routes.
+
+    :param path: str
+        Hierarchy file.
+    :param graph: FrozenUniversity
+        The graph the hierarchy was built from.
+
+    :Returns: ContractionHierarchy
+        Hierarchy backed by the file.
+
+    :Raises: ValueError
+        If the file is not a hierarchy or was built from another graph.
+    """
+
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is not a contraction hierarchy.")
+
+    magic, version = struct.unpack_from("=8sH", buffer)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} contraction hierarchy.")
+
+    _, _, n, m, max_distance, floor_weight, checksum = HEADER.unpack_from(buffer)
+    if (
+        (n, max_distance, floor_weight) != (len(graph.nodes), graph.max_distance, graph.floor_weight)
+        or checksum != graph_checksum(graph)
+    ):
+        raise ValueError(f"{path} was not built from this graph.")
+
+    section = section_reader(buffer)
+    rank = section(8 * n, "q")
+    indptr = section(8 * (n + 1), "q")
+    indices = section(8 * m, "q")
+    weights = section(8 * m, "d")
+    middles = section(8 * m, "q")
+
+    return ContractionHierarchy(graph, rank, indptr, indices, weights, middles, path=path)
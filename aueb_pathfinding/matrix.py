@@ -0,0 +1,239 @@
+"""
+All-pairs shortest-path matrix with on-disk persistence.
+
+For maps of up to a few thousand classrooms it is cheaper to run one
+single-source search from every classroom once, store the distance
+and predecessor matrices as .npy files, and answer every later query
+in O(1) (distance) or O(path length) (path).
+
+The files are keyed by ultils.map_fingerprint, so they are rebuilt
+when the map file, max_distance or floor_weight change, and they are
+memory-mapped on load instead of being read in full.
+
+Command line usage:
+python -m aueb_pathfinding.matrix aueb_map.txt --max-distance 21 --floor-weight 1
+"""
+
+import argparse
+import math
+import os
+
+import numpy as np
+
+from aueb_pathfinding.batch import pool_imap, worker_graph
+from aueb_pathfinding.menu import load_university
+from aueb_pathfinding.ultils import map_fingerprint, shortest_path_tree
+
+
+# ==============================================================
+#                   Precomputation
+# ==============================================================
+
+def _tree_rows(sources):
+    """
+    Distance and predecessor rows of a block of sources (worker side).
+    """
+
+    graph = worker_graph()
+    n = len(graph.nodes)
+
+    dist = np.full((len(sources), n), np.inf)
+    pred = np.full((len(sources), n), -1, dtype=np.int32)
+
+    for row, source in enumerate(sources):
+        tree_dist, previous = shortest_path_tree(graph, graph.nodes[source])
+
+        keys = np.fromiter(tree_dist.keys(), dtype=np.int64, count=len(tree_dist))
+        dist[row, keys] = np.fromiter(tree_dist.values(), dtype=np.float64, count=len(tree_dist))
+
+        # The source has no predecessor (stays -1)
+        for key, before in previous.items():
+            if before is not None:
+                pred[row, key] = before
+
+    return dist, pred
+
+
+def compute_matrix(graph, dist_out, pred_out, workers=None, block_size=64):
+    """
+    Fill the all-pairs distance and predecessor matrices.
+
+    One single-source search runs from every classroom, in blocks of
+    sources spread over worker processes (see batch.pool_imap). Every
+    block is written out as soon as it arrives, so only a few blocks
+    are held in memory at once, whatever the size of the matrices.
+
+    :param graph: FrozenUniversity
+        Frozen university graph.
+    :param dist_out: numpy.ndarray
+        (n, n) float64 output, dist_out[s, t] is the cost from s to t.
+    :param pred_out: numpy.ndarray
+        (n, n) int32 output, pred_out[s, t] is the predecessor of t on
+        the shortest path from s (-1 for s itself or unreachable t).
+    :param workers: int or None
+        Number of worker processes (None: one per CPU).
+    :param block_size: int
+        Number of sources per task.
+    """
+
+    n = len(graph.nodes)
+    blocks = [list(range(start, min(start + block_size, n))) for start in range(0, n, block_size)]
+
+    results = pool_imap(graph, _tree_rows, blocks, workers=workers, chunksize=1)
+    for block, (dist, pred) in zip(blocks, results):
+        dist_out[block[0]:block[-1] + 1] = dist
+        pred_out[block[0]:block[-1] + 1] = pred
+
+
+# ==============================================================
+#                   Distance Matrix
+# ==============================================================
+
+class DistanceMatrix:
+
+    """
+    Precomputed all-pairs shortest paths of a university graph.
+
+    Classrooms are identified by their position in nodes (dense ids
+    in the order of University.freeze).
+    """
+
+    # Initialization
+    def __init__(self, nodes, dist, pred):
+
+        # Basic validation
+        if dist.shape != (len(nodes), len(nodes)) or pred.shape != dist.shape:
+            raise ValueError("dist and pred must be square matrices matching nodes.")
+
+        # Assign attributes
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.dist = dist
+        self.pred = pred
+
+    # O(1) distance
+    def distance(self, start, target):
+
+        """
+        :Returns: float
+            Shortest path cost from start to target (inf if unreachable).
+        """
+
+        return float(self.dist[self.index[start], self.index[target]])
+
+    # Path from the predecessor matrix
+    def shortest_path(self, start, target):
+
+        """
+        Rebuild the shortest path by walking the predecessor matrix.
+
+        :param start: Classroom
+            Starting classroom.
+        :param target: Classroom
+            Target classroom.
+
+        :Returns: tuple
+            - path: list[Classroom]
+                Shortest path from start to target.
+            - distance: float
+                Total cost of the path.
+        """
+
+        source, current = self.index[start], self.index[target]
+        cost = float(self.dist[source, current])
+
+        if math.isinf(cost):
+            return [], math.inf
+
+        row = self.pred[source]
+        path = []
+        while current != -1:
+            path.append(self.nodes[current])
+            current = int(row[current])
+
+        path.reverse()
+        return path, cost
+
+
+# ==============================================================
+#                   Persistence
+# ==============================================================
+
+def load_or_compute(txt_file="aueb_map.txt", max_distance=21.0, floor_weight=1.5,
+                    cache_dir=".aueb_cache", workers=None):
+    """
+    Load the precomputed matrices of a map, computing them if needed.
+
+    The matrices are stored in cache_dir as <fingerprint>.dist.npy and
+    <fingerprint>.pred.npy, and are always returned memory-mapped.
+
+    :param txt_file: str
+        Path to the map text file.
+    :param max_distance: float
+        Graph's maximum distance.
+    :param floor_weight: float
+        Graph's floor weight.
+    :param cache_dir: str
+        Directory of the .npy files.
+    :param workers: int or None
+        Number of worker processes used when computing.
+
+    :Returns: DistanceMatrix
+        Precomputed all-pairs shortest paths.
+    """
+
+    key = map_fingerprint(txt_file, max_distance, floor_weight)
+    dist_file = os.path.join(cache_dir, f"{key}.dist.npy")
+    pred_file = os.path.join(cache_dir, f"{key}.pred.npy")
+
+    if os.path.exists(dist_file) and os.path.exists(pred_file):
+        # Only the classrooms are needed, ids follow the freeze order
+        uni = load_university(txt_file, max_distance, floor_weight, edges=False)
+        nodes = list(dict.fromkeys(uni.nodes))
+
+    else:
+        graph = load_university(txt_file, max_distance, floor_weight).freeze()
+        nodes = graph.nodes
+        n = len(nodes)
+
+        # Written under temporary names, renamed once complete
+        os.makedirs(cache_dir, exist_ok=True)
+        dist_tmp, pred_tmp = dist_file + ".tmp", pred_file + ".tmp"
+
+        dist = np.lib.format.open_memmap(dist_tmp, mode="w+", dtype=np.float64, shape=(n, n))
+        pred = np.lib.format.open_memmap(pred_tmp, mode="w+", dtype=np.int32, shape=(n, n))
+        compute_matrix(graph, dist, pred, workers=workers)
+        dist.flush()
+        pred.flush()
+        del dist, pred
+
+        os.replace(dist_tmp, dist_file)
+        os.replace(pred_tmp, pred_file)
+
+    return DistanceMatrix(
+        nodes,
+        np.load(dist_file, mmap_mode="r"),
+        np.load(pred_file, mmap_mode="r"),
+    )
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Precompute the all-pairs shortest paths of a map.")
+    parser.add_argument("map_file", nargs="?", default="aueb_map.txt")
+    parser.add_argument("--max-distance", type=float, default=21.0)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    parser.add_argument("--cache-dir", default=".aueb_cache")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    matrix = load_or_compute(
+        args.map_file, args.max_distance, args.floor_weight,
+        cache_dir=args.cache_dir, workers=args.workers,
+    )
+
+    reachable = np.isfinite(matrix.dist).sum() - len(matrix.nodes)
+    print(
+        f"All-pairs matrix of {len(matrix.nodes)} classrooms ready in {args.cache_dir} "
+        f"({reachable} reachable ordered pairs)."
+    )
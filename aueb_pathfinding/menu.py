@@ -7,15 +7,13 @@ It handles:
 - Validating user input
 - Loading the map data
 - Creating the university graph
-- Visualizing the graph
+- Visualizing the graph (plotting libraries are loaded lazily)
 - Initiating shortest path computations
 """
 
 from aueb_pathfinding.classes import Classroom, University
-from aueb_pathfinding.ultils import clean_values, distance
+from aueb_pathfinding.ultils import iter_map
 
-import networkx as nx
-import matplotlib.pyplot as plt
 
 # ==============================================================
 #                  Init Check Functions
@@ -269,21 +267,47 @@ def load_map(txt_file="aueb_map.txt"):
     # Initialize storage for classroom information
     uni_map = {"classroom": [], "x": [], "y": [], "floor": []}
 
-    # Open and read the text file
-    with open(txt_file, "r") as file:
-        for row in file:
-            # Separate values by ';' and clean each entry
-            parts = [clean_values(v) for v in row.strip().split(";")]
+    # Stream the records of the text file
+    for name, x, y, floor in iter_map(txt_file):
 
-            # Assign values to the corresponding categories
-            uni_map["classroom"].append(parts[0])
-            uni_map["x"].append(parts[1])
-            uni_map["y"].append(parts[2])
-            uni_map["floor"].append(parts[3])
+        # Assign values to the corresponding categories
+        uni_map["classroom"].append(name)
+        uni_map["x"].append(x)
+        uni_map["y"].append(y)
+        uni_map["floor"].append(floor)
 
     return uni_map
 
 
+def load_university(txt_file="aueb_map.txt", max_distance=21.0, floor_weight=1.5, edges=True):
+
+    """
+    Build a University straight from a map file, without any prompt.
+
+    Records are streamed into the University (no intermediate map
+    dictionary), which suits large map files.
+
+    :param txt_file: str
+        Path to the map text file.
+    :param max_distance: float
+        Graph's maximum distance.
+    :param floor_weight: float
+        Graph's floor weight.
+    :param edges: bool
+        Also build the edges (False: classrooms only).
+
+    :Returns: University
+        University graph of the map.
+    """
+
+    uni = University.from_records(iter_map(txt_file), max_distance, floor_weight)
+
+    if edges:
+        uni.build_edges()
+
+    return uni
+
+
 
 # ==============================================================
 #                     CREATE Graph
@@ -337,14 +361,21 @@ def create_graph(uni_map = None):
     ):
         uni.add_node(Classroom(name=name, x=x, y=y, floor=floor))
 
-    for i in range(len(uni.nodes)):
-        for j in range(i + 1, len(uni.nodes)):
-            uni.add_edge(uni.nodes[i], uni.nodes[j])
+    summary = uni.build_edges()
 
     print("\n      ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
     print("               University Graph          ")
     print("        ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
     print(f"\nUniversity Graph with maximum distance {uni.max_distance} and floor weight equal to {uni.floor_weight} created!\n")
+    print(
+        f"{summary['added']} edges added, {summary['tested'] - summary['added']} candidate pairs rejected "
+        f"({summary['too far']} too far, {summary['same classroom']} same classroom).\n"
+    )
+
+    # Islands of the graph: rooms of different components are unreachable
+    sizes = uni.component_sizes()
+    shown = ", ".join(map(str, sizes[:10])) + (", ..." if len(sizes) > 10 else "")
+    print(f"{len(sizes)} connected component(s), sizes: {shown}\n")
     return uni 
 
 
@@ -353,69 +384,29 @@ def create_graph(uni_map = None):
 #                     Vizualize Graph
 # ==============================================================
 
-def visualize_graph(classrooms, max_distance=21.0, floor_weight=1.0):
+def visualize_graph(uni, path=None, by_floor=False):
 
     """
-    Visualize the university graph using NetworkX and Matplotlib.
+    Visualize the university graph using Matplotlib.
 
-    This function creates a graphical representation of the classrooms
-    and their connections based on the given distance constraints.
+    The plotting library is heavy to import, so it is only loaded
+    here, on first use (see visualize.py). The edges already built
+    in uni are drawn as they are.
 
-    :param classrooms: list[Classroom]
-        List of classroom nodes to be visualized.
-    :param max_distance: float
-        Maximum allowed distance between two classrooms to draw an edge.
-    :param floor_weight: float
-        Weight applied to floor differences when computing distances.
+    :param uni: University
+        University graph to be visualized.
+    :param path: list[Classroom] or None
+        Shortest path to highlight.
+    :param by_floor: bool
+        Draw one panel per floor.
 
     :Returns: matplotlib.figure.Figure
         Figure object containing the rendered graph.
     """
 
-    # Initialise nx object
-    uniGraph = nx.Graph()
-
-    # Add each node
-    for node in classrooms:
-        uniGraph.add_node(node.name, pos=(node.x, node.y))
-
-    # Add the edges without duplicates 
-    for i in range(len(classrooms)):
-        for j in range(i + 1, len(classrooms)):
-
-            u, v = classrooms[i], classrooms[j]
-            dist = distance(u, v, floor_weight)
-            if dist <= max_distance:
-                uniGraph.add_edge(u.name, v.name, weight=round(dist))
-
-    pos = nx.get_node_attributes(uniGraph, 'pos')
-
-    # Find the min and max x and y values to set the axis limits
-    x_vals = [coord[0] for coord in pos.values()]
-    y_vals = [coord[1] for coord in pos.values()]
-
-    # Set the axis limits based on the min and max values of the coordinates
-    x_min, x_max = min(x_vals) - 10, max(x_vals) + 10  # Add some padding
-    y_min, y_max = min(y_vals) - 10, max(y_vals) + 10  # Add some padding
-
-    # Create a plot to visualize the graph
-    fig = plt.figure(figsize=(10, 10))
-
-    # Draw the graph with the adjusted position layout
-    nx.draw(uniGraph, pos, with_labels=True, node_size=1500, node_color='lightblue', font_size=12, font_weight='bold', edge_color='gray')
-
-    # Optionally, display edge weights (Euclidean distances) on the graph
-    edge_labels = nx.get_edge_attributes(uniGraph, 'weight')
-    nx.draw_networkx_edge_labels(uniGraph, pos=pos, edge_labels=edge_labels)
-
-    # Adjust the axis to fit the nodes nicely
-    plt.xlim(x_min, x_max)
-    plt.ylim(y_min, y_max)
-
-    # Add title and show the plot
-    plt.title("Aueb Classrooms Graph")
+    from aueb_pathfinding.visualize import draw_university
 
-    return fig
+    return draw_university(uni, path=path, by_floor=by_floor)
 
 
 
@@ -0,0 +1,247 @@
+"""
+Opt-in instrumentation of the indoor navigation system.
+
+Nothing is recorded unless a block of code runs inside record():
+
+    with profiling.record() as profile:
+        uni = load_university("aueb_map.txt")
+        uni.shortest_path(start, target)
+    print(profile.summary())
+
+While recording, every instrumented stage (loading, edge building,
+searches) accumulates its wall time and number of calls, and the hot
+paths add their counters (lines parsed, pairs tested, edges accepted
+and rejected, nodes settled, edges relaxed, heap pushes). Counters are
+added once per stage call, never inside the inner loops, and when no
+recording is active each hook is a single global lookup.
+
+record(capture="cprofile") additionally runs cProfile over the block,
+record(capture="tracemalloc") traces the memory allocations.
+"""
+
+import functools
+import io
+import time
+from contextlib import contextmanager
+
+
+# Profile being recorded (None: instrumentation disabled)
+_active = None
+
+# Capture modes of record()
+CAPTURES = ("cprofile", "tracemalloc")
+
+
+# ==============================================================
+#                   Recorded Data
+# ==============================================================
+
+class Profile:
+
+    """
+    Timings and counters recorded during one record() block.
+
+    :Attributes:
+        timings: dict
+            Stage name -> total wall time in seconds.
+        calls: dict
+            Stage name -> number of calls.
+        counters: dict
+            Counter name -> value.
+        cprofile: pstats.Stats or None
+            cProfile statistics (capture="cprofile").
+        memory: dict or None
+            Current and peak traced memory in bytes, and the top
+            allocation sites (capture="tracemalloc").
+    """
+
+    # Initialization
+    def __init__(self):
+        self.timings = {}
+        self.calls = {}
+        self.counters = {}
+        self.cprofile = None
+        self.memory = None
+
+    def add_time(self, stage, seconds):
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    def add(self, counter, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def as_dict(self):
+        """ JSON-serialisable form of the timings, counters and memory """
+        return {
+            "timings": dict(self.timings),
+            "calls": dict(self.calls),
+            "counters": dict(self.counters),
+            "memory": self.memory,
+        }
+
+    def summary(self, top=15):
+
+        """
+        Human-readable report of the recorded data.
+
+        :param top: int
+            Number of functions (cProfile) or allocation sites
+            (tracemalloc) listed.
+
+        :Returns: str
+            Multi-line summary.
+        """
+
+        lines = [f"{'stage':<24} {'calls':>8} {'total s':>10} {'mean ms':>10}"]
+        for stage, seconds in sorted(self.timings.items(), key=lambda item: -item[1]):
+            calls = self.calls[stage]
+            lines.append(f"{stage:<24} {calls:>8} {seconds:10.4f} {seconds / calls * 1000:10.4f}")
+
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<24} {'value':>12}")
+            for counter, value in self.counters.items():
+                lines.append(f"{counter:<24} {value:>12}")
+
+        if self.memory is not None:
+            lines.append("")
+            lines.append(f"memory: current {self.memory['current'] / 2**20:.1f} MiB, "
+                         f"peak {self.memory['peak'] / 2**20:.1f} MiB")
+            for site, size, blocks in self.memory["top"][:top]:
+                lines.append(f"  {size / 1024:10.1f} KiB {blocks:>9} blocks  {site}")
+
+        if self.cprofile is not None:
+            stream = io.StringIO()
+            self.cprofile.stream = stream
+            self.cprofile.sort_stats("cumulative").print_stats(top)
+            lines.append("")
+            lines.append(stream.getvalue().strip())
+
+        return "\n".join(lines)
+
+
+# ==============================================================
+#                   Recording
+# ==============================================================
+
+@contextmanager
+def record(capture=None, top=25):
+
+    """
+    Record the instrumented stages run inside the with block.
+
+    :param capture: str or None
+        Also run "cprofile" or "tracemalloc" over the block.
+    :param top: int
+        Number of allocation sites kept with capture="tracemalloc".
+
+    :Yields: Profile
+        Filled while the block runs (capture results on exit).
+    """
+
+    global _active
+
+    if capture is not None and capture not in CAPTURES:
+        raise ValueError(f"capture must be one of {CAPTURES} or None")
+
+    profile = Profile()
+    outer, _active = _active, profile
+
+    # The capture modules are only imported when asked for
+    profiler = None
+    if capture == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif capture == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start()
+
+    try:
+        yield profile
+
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            import pstats
+            profile.cprofile = pstats.Stats(profiler)
+
+        elif capture == "tracemalloc":
+            current, peak = tracemalloc.get_traced_memory()
+            sites = tracemalloc.take_snapshot().statistics("lineno")[:top]
+            tracemalloc.stop()
+            profile.memory = {
+                "current": current,
+                "peak": peak,
+                "top": [(str(stat.traceback), stat.size, stat.count) for stat in sites],
+            }
+
+        _active = outer
+
+
+def enabled():
+    """ True while a record() block is running """
+    return _active is not None
+
+
+# ==============================================================
+#                   Hooks
+# ==============================================================
+
+def count(counter, value=1):
+    """ Add to a counter of the active profile (no-op when disabled) """
+    if _active is not None:
+        _active.add(counter, value)
+
+
+def count_search(settled, pushes, sources=1):
+
+    """
+    Counters of one shortest-path search.
+
+    Every successful relaxation pushes one heap entry, so the number of
+    relaxed edges is the number of pushes minus the initial entries.
+
+    :param settled: int
+        Nodes settled by the search.
+    :param pushes: int
+        Heap pushes, initial entries included.
+    :param sources: int
+        Initial heap entries.
+    """
+
+    if _active is not None:
+        _active.add("nodes settled", settled)
+        _active.add("edges relaxed", max(pushes - sources, 0))
+        _active.add("heap pushes", pushes)
+
+
+def stage(name):
+
+    """
+    Decorator timing every call of a function as a stage.
+
+    When no record() block is active, the wrapper only adds one global
+    lookup to the call.
+
+    :param name: str
+        Stage name in the profile.
+    """
+
+    def decorate(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active
+            if profile is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add_time(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,320 @@
+"""
+Local asyncio routing service.
+
+The university graph is loaded (and frozen) once, then route queries
+are answered over HTTP on localhost or over a Unix socket:
+
+GET /route?start=A21&target=D33  -> {"start", "target", "path", "cost"}
+GET /stats                       -> request counters and latency percentiles
+
+Searches run in an executor (worker processes by default) so the event
+loop stays responsive, and identical queries that arrive while one is
+being computed share that single computation.
+
+Usage:
+python -m aueb_pathfinding.server aueb_map.txt --max-distance 21 --floor-weight 1 --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from aueb_pathfinding.batch import init_worker, worker_graph
+from aueb_pathfinding.menu import load_university
+from aueb_pathfinding.ultils import astar
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================
+#                   Worker Side
+# ==============================================================
+
+def _route(start, target):
+    """
+    Shortest path between two dense ids of the worker's graph.
+
+    :Returns: tuple
+        (classroom names of the path, cost)
+    """
+
+    graph = worker_graph()
+    path, cost = astar(graph, graph.nodes[start], graph.nodes[target])
+    return [node.name for node in path], cost
+
+
+def percentile(sorted_values, fraction):
+    """ Nearest-rank percentile of an already sorted list """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# ==============================================================
+#                   Routing Service
+# ==============================================================
+
+class RouteService:
+
+    """
+    Asynchronous route queries over one frozen university graph.
+
+    :param graph: FrozenUniversity
+        Frozen university graph, shared with the executor once.
+    :param workers: int
+        Size of the executor.
+    :param processes: bool
+        Use worker processes (True) or threads (False).
+    :param window: int
+        Number of recent requests kept for the latency percentiles.
+    """
+
+    # Initialization
+    def __init__(self, graph, workers=2, processes=True, window=10_000):
+
+        self.graph = graph
+        self.ids = {node.name: i for i, node in enumerate(graph.nodes)}
+
+        if processes:
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker, initargs=(graph,)
+            )
+            # Start the workers now: forked later, they would inherit (and
+            # keep open) the client connections of the event loop
+            self.executor.submit(len, ()).result()
+        else:
+            init_worker(graph)
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        # Queries being computed, shared by identical requests
+        self.in_flight = {}
+
+        # Counters
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=window)
+
+    # One route query
+    async def route(self, start, target):
+
+        """
+        Shortest path between two classroom names.
+
+        :Returns: dict
+            start, target, path (names) and cost (None if unreachable).
+        """
+
+        begin = time.perf_counter()
+        self.requests += 1
+
+        for name in (start, target):
+            if name not in self.ids:
+                raise KeyError(name)
+
+        key = (start, target)
+        future = self.in_flight.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, _route, self.ids[start], self.ids[target])
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            self.computed += 1
+        else:
+            self.coalesced += 1
+
+        # Shielded, a cancelled client must not cancel the shared query
+        path, cost = await asyncio.shield(future)
+
+        self.latencies.append((time.perf_counter() - begin) * 1000)
+        return {
+            "start": start,
+            "target": target,
+            "path": path,
+            "cost": None if math.isinf(cost) else cost,
+        }
+
+    # Counters and latency percentiles
+    def stats(self):
+
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.in_flight),
+            "latency_ms": {
+                name: percentile(latencies, fraction)
+                for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+            },
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+# ==============================================================
+#                   HTTP Layer
+# ==============================================================
+
+async def dispatch(service, request_line):
+    """
+    Answer one parsed request line.
+
+    :Returns: tuple
+        (HTTP status, JSON-serialisable body)
+    """
+
+    if len(request_line) < 2 or request_line[0] != "GET":
+        return 405, {"error": "only GET is supported"}
+
+    url = urlsplit(request_line[1])
+    query = parse_qs(url.query)
+
+    if url.path == "/route":
+        start = query.get("start", [None])[0]
+        target = query.get("target", [None])[0]
+        if start is None or target is None:
+            return 400, {"error": "start and target are required"}
+        try:
+            return 200, await service.route(start, target)
+        except KeyError as error:
+            return 404, {"error": f"unknown classroom: {error.args[0]}"}
+
+    if url.path == "/stats":
+        return 200, service.stats()
+
+    return 404, {"error": "not found"}
+
+
+async def handle_http(service, reader, writer):
+    """
+    Serve one HTTP/1.1 request (the connection is then closed).
+
+    Any failure while answering (a broken worker pool, an exception in
+    a worker) is reported as a 500 JSON response.
+    """
+
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+
+        # Skip the headers
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+
+        try:
+            status, body = await dispatch(service, request_line)
+        except Exception as error:
+            logger.exception("Request %r failed", " ".join(request_line))
+            status, body = 500, {"error": f"internal error: {type(error).__name__}"}
+
+        payload = json.dumps(body).encode()
+        reason = {
+            200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error",
+        }[status]
+
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + payload
+        )
+        await writer.drain()
+
+    finally:
+        writer.close()
+
+
+async def start_server(service, host="127.0.0.1", port=8765, unix_path=None):
+    """
+    Start serving a RouteService on localhost (or a Unix socket).
+
+    :Returns: asyncio.Server
+        The running server.
+    """
+
+    def handler(reader, writer):
+        return handle_http(service, reader, writer)
+
+    if unix_path is not None:
+        return await asyncio.start_unix_server(handler, path=unix_path)
+
+    return await asyncio.start_server(handler, host=host, port=port)
+
+
+# ==============================================================
+#                   Local Client
+# ==============================================================
+
+async def fetch(path, host="127.0.0.1", port=8765, unix_path=None):
+    """
+    GET a path from a local routing server.
+
+    :Returns: tuple
+        (HTTP status, decoded JSON body)
+    """
+
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, json.loads(body)
+
+
+# ==============================================================
+#                   Entry Point
+# ==============================================================
+
+async def serve(args):
+
+    # The graph is built once
+    graph = load_university(args.map_file, args.max_distance, args.floor_weight).freeze()
+
+    service = RouteService(graph, workers=args.workers, processes=not args.threads)
+    server = await start_server(service, port=args.port, unix_path=args.unix)
+
+    where = args.unix or f"http://127.0.0.1:{args.port}"
+    print(f"Routing {len(graph.nodes)} classrooms on {where}", file=sys.stderr)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Local routing service.")
+    parser.add_argument("map_file", nargs="?", default="aueb_map.txt")
+    parser.add_argument("--max-distance", type=float, default=21.0)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", action="store_true", help="use threads instead of processes")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
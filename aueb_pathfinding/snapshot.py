@@ -0,0 +1,333 @@
+"""
+Binary snapshots of frozen university graphs.
+
+A snapshot holds everything needed to answer route queries: the
+classrooms, their dense ids, the CSR adjacency, the connected-component
+labels, max_distance, floor_weight and the checksum of the map file it
+was built from.
+Loading memory-maps the file, so even a large campus graph is ready
+in milliseconds: classrooms are only decoded when accessed and are
+not validated again.
+
+File layout (native byte order, every section 8-byte aligned):
+- header: magic, version, node count, adjacency size, max_distance,
+  floor_weight, SHA-256 of the map file
+- name offsets (n + 1), UTF-8 names
+- x, y, floor (n each), ids sorted by name (n)
+- indptr (n + 1), indices (m), weights (m)
+- component labels (n)
+"""
+
+import mmap
+import os
+import struct
+from array import array
+
+from aueb_pathfinding.classes import Classroom, FrozenUniversity, component_labels
+from aueb_pathfinding.menu import load_university
+from aueb_pathfinding.ultils import file_checksum
+
+
+MAGIC = b"AUEBSNAP"
+VERSION = 2
+
+# magic, version, nodes, adjacency entries, max_distance, floor_weight,
+# checksum (shared with the hierarchy files of hierarchy.py)
+HEADER = struct.Struct("=8sHxxxxxxqqdd32s")
+
+
+# ==============================================================
+#                   Lazy Classroom Access
+# ==============================================================
+
+class _SnapshotNodes:
+
+    """
+    Read-only sequence of the classrooms of a snapshot.
+
+    Classrooms are decoded from the memory-mapped tables on access.
+    """
+
+    def __init__(self, offsets, names, x, y, floor, by_name):
+        self.offsets = offsets
+        self.names = names
+        self.x = x
+        self.y = y
+        self.floor = floor
+        self.by_name = by_name
+
+    def name(self, i):
+        return str(self.names[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return Classroom._unchecked(self.name(i), self.x[i], self.y[i], self.floor[i], i)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    # Lookup by id (decoded classrooms carry it) or by name, with a
+    # binary search over the sorted ids
+    def get(self, node, default=None):
+        name = node.name
+        if node.id is not None and node.id < len(self) and self.name(node.id) == name:
+            return node.id
+        low, high = 0, len(self.by_name)
+        while low < high:
+            middle = (low + high) // 2
+            if self.name(self.by_name[middle]) < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.by_name) and self.name(self.by_name[low]) == name:
+            return self.by_name[low]
+        return default
+
+
+class SnapshotUniversity(FrozenUniversity):
+
+    """
+    FrozenUniversity backed by a memory-mapped snapshot file.
+
+    It pickles as its file path, so worker processes (see batch.py)
+    map the same file instead of receiving a copy of the graph.
+    """
+
+    def __init__(self, path, checksum, buffer, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.checksum = checksum
+        self._buffer = buffer
+
+    def __reduce__(self):
+        return load_snapshot, (self.path,)
+
+
+# ==============================================================
+#                   Save / Load
+# ==============================================================
+
+def padded(data):
+    """ Bytes padded with zeros to a multiple of 8 """
+    return data + b"\0" * (-len(data) % 8)
+
+
+def section_reader(buffer, position=HEADER.size):
+    """
+    Reader of the consecutive sections of a mapped file, each padded
+    to 8 bytes (see padded).
+
+    :param buffer: mmap.mmap
+        Mapped file.
+    :param position: int
+        Offset of the first section.
+
+    :Returns: callable
+        section(size, typecode=None) returns the next size bytes as a
+        memoryview, cast to typecode if given.
+    """
+
+    view = memoryview(buffer)
+
+    def section(size, typecode=None):
+        nonlocal position
+        data = view[position:position + size]
+        position += size + (-size % 8)
+        return data.cast(typecode) if typecode else data
+
+    return section
+
+
+def save_snapshot(graph, path, checksum=bytes(32)):
+    """
+    Write a frozen graph to a binary snapshot file.
+
+    The file is written under a temporary name and renamed once
+    complete, so readers never see a partial snapshot.
+
+    :param graph: FrozenUniversity
+        Frozen university graph.
+    :param path: str
+        Snapshot file to write.
+    :param checksum: bytes
+        SHA-256 digest of the map file the graph was built from.
+    """
+
+    nodes = graph.nodes
+    names = [node.name.encode("utf-8") for node in nodes]
+
+    offsets = array("q", [0])
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+
+    by_name = sorted(range(len(nodes)), key=lambda i: nodes[i].name)
+
+    # Labels are stored so that connected() needs no walk after loading
+    labels = graph.components
+    if labels is None:
+        labels = component_labels(graph.indptr, graph.indices)
+
+    sections = [
+        offsets.tobytes(),
+        b"".join(names),
+        array("q", (node.x for node in nodes)).tobytes(),
+        array("q", (node.y for node in nodes)).tobytes(),
+        array("q", (node.floor for node in nodes)).tobytes(),
+        array("q", by_name).tobytes(),
+        array("q", graph.indptr).tobytes(),
+        array("q", graph.indices).tobytes(),
+        array("d", graph.weights).tobytes(),
+        array("q", labels).tobytes(),
+    ]
+
+    header = HEADER.pack(
+        MAGIC, VERSION, len(nodes), len(graph.indices),
+        graph.max_distance, graph.floor_weight, checksum,
+    )
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path + ".tmp", "wb") as file:
+        file.write(header)
+        for section in sections:
+            file.write(padded(section))
+
+    os.replace(path + ".tmp", path)
+
+
+def read_header(path):
+    """
+    Read the header of a snapshot file.
+
+    :Returns: dict or None
+        Header fields, or None if the file is missing, is not a
+        snapshot or was written by another format version.
+    """
+
+    try:
+        with open(path, "rb") as file:
+            data = file.read(HEADER.size)
+    except OSError:
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+
+    magic, version, n, m, max_distance, floor_weight, checksum = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+
+    return {
+        "nodes": n,
+        "entries": m,
+        "max_distance": max_distance,
+        "floor_weight": floor_weight,
+        "checksum": checksum,
+    }
+
+
+def load_snapshot(path):
+    """
+    Memory-map a snapshot file as a frozen graph.
+
+    :param path: str
+        Snapshot file.
+
+    :Returns: SnapshotUniversity
+        Frozen university graph backed by the file.
+    """
+
+    header = read_header(path)
+    if header is None:
+        raise ValueError(f"{path} is not a version {VERSION} graph snapshot.")
+
+    n, m = header["nodes"], header["entries"]
+
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    section = section_reader(buffer)
+    offsets = section(8 * (n + 1), "q")
+    names = section(offsets[n])
+    x, y, floor = section(8 * n, "q"), section(8 * n, "q"), section(8 * n, "q")
+    by_name = section(8 * n, "q")
+    indptr = section(8 * (n + 1), "q")
+    indices = section(8 * m, "q")
+    weights = section(8 * m, "d")
+    labels = section(8 * n, "q")
+
+    nodes = _SnapshotNodes(offsets, names, x, y, floor, by_name)
+
+    return SnapshotUniversity(
+        path=path,
+        checksum=header["checksum"],
+        buffer=buffer,
+        nodes=nodes,
+        indptr=indptr,
+        indices=indices,
+        weights=weights,
+        max_distance=header["max_distance"],
+        floor_weight=header["floor_weight"],
+        index=nodes,
+        components=labels,
+    )
+
+
+# ==============================================================
+#                   Snapshot Cache
+# ==============================================================
+
+def snapshot_path(txt_file, cache_dir=".aueb_cache"):
+    """ Default snapshot file of a map file """
+    return os.path.join(cache_dir, os.path.basename(txt_file) + ".snap")
+
+
+def load_or_build(txt_file="aueb_map.txt", max_distance=21.0, floor_weight=1.5,
+                  path=None, vectorized=False):
+    """
+    Load the snapshot of a map, rebuilding it if it is out of date.
+
+    The snapshot is rebuilt (text parse, edge construction, freeze)
+    when it is missing, was written by another format version, or
+    when the map file checksum, max_distance or floor_weight differ.
+
+    :param txt_file: str
+        Path to the map text file.
+    :param max_distance: float
+        Graph's maximum distance.
+    :param floor_weight: float
+        Graph's floor weight.
+    :param path: str or None
+        Snapshot file (default: see snapshot_path).
+    :param vectorized: bool
+        Build the edges with NumPy when rebuilding.
+
+    :Returns: SnapshotUniversity
+        Frozen university graph backed by the snapshot.
+    """
+
+    if path is None:
+        path = snapshot_path(txt_file)
+
+    checksum = file_checksum(txt_file)
+    header = read_header(path)
+
+    if (
+        header is None
+        or header["checksum"] != checksum
+        or header["max_distance"] != float(max_distance)
+        or header["floor_weight"] != float(floor_weight)
+    ):
+        uni = load_university(txt_file, max_distance, floor_weight, edges=False)
+        uni.build_edges(vectorized=vectorized)
+        save_snapshot(uni.freeze(), path, checksum)
+
+    return load_snapshot(path)
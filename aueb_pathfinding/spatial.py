@@ -0,0 +1,240 @@
+"""
+Nearest-classroom lookup from arbitrary positions.
+
+Clients know where they stand (x, y, floor), not which classroom is
+closest. SpatialIndex keeps one KD-tree per floor over the classroom
+coordinates and answers nearest and k-nearest queries under the same
+floor-weighted metric as ultils.distance:
+
+    hypot(dx, dy) + floor_weight * (floor difference) ** 2
+
+Floors are searched in order of increasing floor penalty, and a floor
+is skipped as soon as its penalty alone exceeds the best distance
+found, so a query visits O(log n) tree nodes on one or a few floors.
+"""
+
+import heapq
+import math
+
+from aueb_pathfinding.ultils import dijkstra
+
+
+# Classrooms per leaf, scanned linearly
+LEAF_SIZE = 8
+
+
+# ==============================================================
+#                   KD-Tree
+# ==============================================================
+
+def build_tree(points, leaf_size=LEAF_SIZE):
+
+    """
+    Arrange points in place as an implicit 2-d tree.
+
+    The median of every range (by x on even depths, y on odd depths) is
+    moved to the middle of the range, with the smaller coordinates on
+    its left: the tree needs no node objects, only the point list.
+    Ranges of at most leaf_size points are left as they are.
+
+    :param points: list[tuple]
+        (x, y, id) of the classrooms of one floor (reordered).
+    :param leaf_size: int
+        Largest range that is not split.
+    """
+
+    stack = [(0, len(points), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= leaf_size:
+            continue
+
+        mid = (lo + hi) // 2
+        axis = depth % 2
+        points[lo:hi] = sorted(points[lo:hi], key=lambda point: point[axis])
+
+        stack.append((lo, mid, depth + 1))
+        stack.append((mid + 1, hi, depth + 1))
+
+
+def search_tree(points, x, y, penalty, k, best, leaf_size=LEAF_SIZE):
+
+    """
+    Offer the points of one tree to the k nearest found so far.
+
+    :param points: list[tuple]
+        Tree built with build_tree.
+    :param penalty: float
+        Floor penalty added to every distance of this tree.
+    :param k: int
+        Number of neighbours wanted.
+    :param best: list
+        Max-heap of (-distance, -id, id) holding the k best so far (updated).
+    """
+
+    def offer(point):
+        entry = (-(math.hypot(point[0] - x, point[1] - y) + penalty), -point[2], point[2])
+        if len(best) < k:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            # Closer, or as close with a smaller id
+            heapq.heapreplace(best, entry)
+
+    query = (x, y)
+
+    # Entries are (lo, hi, depth, lower bound of the range's distances)
+    stack = [(0, len(points), 0, penalty)]
+    while stack:
+        lo, hi, depth, bound = stack.pop()
+
+        # The whole range is further than the k-th best
+        if len(best) == k and bound > -best[0][0]:
+            continue
+
+        if hi - lo <= leaf_size:
+            for i in range(lo, hi):
+                offer(points[i])
+            continue
+
+        mid = (lo + hi) // 2
+        axis = depth % 2
+        offer(points[mid])
+
+        # Near side first (pushed last), far side only if it may be closer
+        diff = query[axis] - points[mid][axis]
+        near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+        stack.append((*far, depth + 1, max(bound, abs(diff) + penalty)))
+        stack.append((*near, depth + 1, bound))
+
+
+# ==============================================================
+#                   Spatial Index
+# ==============================================================
+
+class SpatialIndex:
+
+    """
+    Per-floor KD-trees over the classrooms of a map.
+
+    :Attributes:
+        nodes: list[Classroom]
+            Indexed classrooms (ids are positions in this list).
+        floor_weight: float
+            Weight factor applied to floor differences.
+        trees: dict
+            Floor -> point list arranged by build_tree.
+    """
+
+    # Initialization
+    def __init__(self, nodes, floor_weight=1.5, leaf_size=LEAF_SIZE):
+
+        self.nodes = list(nodes)
+        self.floor_weight = floor_weight
+        self.leaf_size = leaf_size
+
+        self.trees = {}
+        for i, node in enumerate(self.nodes):
+            self.trees.setdefault(node.floor, []).append((node.x, node.y, i))
+
+        for points in self.trees.values():
+            build_tree(points, leaf_size)
+
+    def floor_penalty(self, floor1, floor2):
+        """ Floor term of ultils.distance """
+        return self.floor_weight * (floor1 - floor2) ** 2 if floor1 != floor2 else 0.0
+
+    # Queries
+    def k_nearest(self, x, y, floor, k):
+
+        """
+        The k classrooms closest to a position.
+
+        :param x: float
+            x coordinate of the position.
+        :param y: float
+            y coordinate of the position.
+        :param floor: int
+            Floor of the position.
+        :param k: int
+            Number of classrooms wanted.
+
+        :Returns: list[tuple]
+            (Classroom, distance) pairs, closest first (fewer than k if
+            the map has fewer classrooms). Ties are broken by position
+            in nodes.
+        """
+
+        if k <= 0:
+            return []
+
+        # Cheapest floors first, ultils.distance penalty per floor
+        floors = sorted(self.trees, key=lambda other: self.floor_penalty(floor, other))
+
+        best = []
+        for other in floors:
+            penalty = self.floor_penalty(floor, other)
+
+            # With a non-negative weight the remaining floors are all further
+            if len(best) == k and self.floor_weight >= 0 and penalty > -best[0][0]:
+                break
+
+            search_tree(self.trees[other], x, y, penalty, k, best, self.leaf_size)
+
+        found = sorted((-d, i) for d, _, i in best)
+        return [(self.nodes[i], d) for d, i in found]
+
+    def nearest(self, x, y, floor):
+
+        """
+        The classroom closest to a position.
+
+        :Returns: tuple
+            (Classroom, distance), or (None, inf) for an empty map.
+        """
+
+        found = self.k_nearest(x, y, floor, 1)
+        return found[0] if found else (None, math.inf)
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+# ==============================================================
+#                   Route from a Position
+# ==============================================================
+
+def route_from_position(graph, index, x, y, floor, target, search=dijkstra):
+
+    """
+    Shortest route from an arbitrary position to a classroom: walk to
+    the nearest classroom, then follow the graph.
+
+    :param graph: University or FrozenUniversity
+        University graph.
+    :param index: SpatialIndex
+        Index over the classrooms of graph.
+    :param x: float
+        x coordinate of the position.
+    :param y: float
+        y coordinate of the position.
+    :param floor: int
+        Floor of the position.
+    :param target: Classroom
+        Target classroom.
+    :param search: callable
+        Search function with the dijkstra() contract.
+
+    :Returns: tuple
+        - path: list[Classroom]
+            Shortest path from the nearest classroom to target.
+        - distance: float
+            Walk to the nearest classroom plus the cost of the path
+            (inf if unreachable).
+    """
+
+    start, walk = index.nearest(x, y, floor)
+    if start is None:
+        return [], math.inf
+
+    path, cost = search(graph, start, target)
+    return path, walk + cost
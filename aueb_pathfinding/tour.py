@@ -0,0 +1,365 @@
+"""
+Multi-stop routes: the shortest tour through a set of classrooms.
+
+plan_tour works in three steps:
+- Pairwise costs: one single-source search per stop, each stopping as
+  soon as the later stops are settled (the graph is undirected, so the
+  cost from b to a is the cost from a to b).
+- Visiting order: exact Held-Karp dynamic programming up to
+  EXACT_LIMIT stops; above, nearest neighbour improved by 2-opt and
+  Or-opt moves until no move helps or the time budget runs out.
+- Expansion: the legs of the order are rebuilt from the search trees
+  into one Classroom path.
+
+The tour starts at the first stop and ends at any stop, or returns to
+the first one with closed=True.
+"""
+
+import logging
+import math
+import time
+
+from aueb_pathfinding import profiling
+from aueb_pathfinding.ultils import reconstruct_path, shortest_path_tree
+
+logger = logging.getLogger(__name__)
+
+
+# Largest number of stops ordered exactly (2^(n-1) * (n-1)^2 steps, ~0.35 s)
+EXACT_LIMIT = 15
+
+# Longest segment moved by Or-opt
+OR_OPT_LENGTH = 3
+
+
+# ==============================================================
+#                   Pairwise Costs
+# ==============================================================
+
+def stop_costs(graph, stops):
+
+    """
+    Shortest path costs between every pair of stops.
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param stops: list[Classroom]
+        Distinct classrooms to visit.
+
+    :Returns: tuple
+        - costs: list[list[float]]
+            costs[i][j] is the cost between stops i and j (inf if
+            unreachable).
+        - trees: list[dict]
+            Predecessor map of the search from every stop (see leg).
+    """
+
+    n = len(stops)
+    keys = [graph.key_of(stop) for stop in stops]
+    costs = [[0.0 if i == j else math.inf for j in range(n)] for i in range(n)]
+    trees = []
+
+    for i, stop in enumerate(stops):
+
+        # Earlier stops already searched towards this one
+        dist, previous = shortest_path_tree(graph, stop, targets=stops[i + 1:])
+        trees.append(previous)
+
+        for j in range(i + 1, n):
+            if keys[j] in dist:
+                costs[i][j] = costs[j][i] = dist[keys[j]]
+
+    return costs, trees
+
+
+def leg(graph, stops, trees, i, j):
+
+    """
+    Classroom path from stop i to stop j, from the search of either end.
+    """
+
+    key_i, key_j = graph.key_of(stops[i]), graph.key_of(stops[j])
+
+    if i < j:
+        path = reconstruct_path(trees[i], key_j)
+    else:
+        path = reconstruct_path(trees[j], key_i)
+        path.reverse()
+
+    return [graph.node_of(key) for key in path]
+
+
+# ==============================================================
+#                   Visiting Order
+# ==============================================================
+
+def tour_cost(order, costs, closed=False):
+    """ Total cost of visiting the stops in order """
+    total = sum(costs[a][b] for a, b in zip(order, order[1:]))
+    if closed and len(order) > 1:
+        total += costs[order[-1]][order[0]]
+    return total
+
+
+def held_karp(costs, closed=False):
+
+    """
+    Optimal visiting order by dynamic programming over subsets, starting
+    at stop 0: best[mask][j] is the cheapest way to visit the stops of
+    mask (stop 0 excluded) ending at stop j.
+
+    :param costs: list[list[float]]
+        Pairwise costs (see stop_costs).
+    :param closed: bool
+        Return to stop 0 at the end.
+
+    :Returns: list[int]
+        Optimal order of the stops.
+    """
+
+    n = len(costs)
+    if n <= 2:
+        return list(range(n))
+
+    m = n - 1
+    full = (1 << m) - 1
+
+    # Others are numbered 0..m-1 (stop k + 1), masks cover the others
+    best = [[math.inf] * m for _ in range(1 << m)]
+    parent = [[-1] * m for _ in range(1 << m)]
+    for k in range(m):
+        best[1 << k][k] = costs[0][k + 1]
+
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j in range(m):
+            cost = row[j]
+            if cost == math.inf or not mask >> j & 1:
+                continue
+
+            from_j = costs[j + 1]
+            for k in range(m):
+                if mask >> k & 1:
+                    continue
+                alt = cost + from_j[k + 1]
+                nxt = mask | 1 << k
+                if alt < best[nxt][k]:
+                    best[nxt][k] = alt
+                    parent[nxt][k] = j
+
+    # Best last stop, with the way back if the tour is closed
+    ends = [best[full][j] + (costs[j + 1][0] if closed else 0) for j in range(m)]
+    last = min(range(m), key=ends.__getitem__)
+
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        mask, last = mask & ~(1 << last), parent[mask][last]
+
+    order.append(0)
+    order.reverse()
+    return order
+
+
+def nearest_neighbour(costs):
+
+    """
+    Greedy order: from stop 0, always go to the cheapest unvisited stop.
+    """
+
+    n = len(costs)
+    order = [0]
+    left = set(range(1, n))
+
+    while left:
+        here = costs[order[-1]]
+        nxt = min(left, key=lambda k: (here[k], k))
+        order.append(nxt)
+        left.remove(nxt)
+
+    return order
+
+
+def two_opt(order, costs, closed, deadline):
+
+    """
+    Reverse segments of the order while that shortens it (first
+    improvement), stop 0 staying first.
+
+    :Returns: bool
+        True if the order was improved.
+    """
+
+    n = len(order)
+    improved = False
+    changed = True
+
+    while changed and time.perf_counter() < deadline:
+        changed = False
+
+        for i in range(1, n - 1):
+            a, b = order[i - 1], order[i]
+            for j in range(i + 1, n):
+                c = order[j]
+                d = order[j + 1] if j + 1 < n else (order[0] if closed else None)
+
+                # Edges (a, b) and (c, d) become (a, c) and (b, d)
+                delta = costs[a][c] - costs[a][b]
+                if d is not None:
+                    delta += costs[b][d] - costs[c][d]
+
+                if delta < -1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    b = order[i]
+                    changed = improved = True
+
+            if time.perf_counter() >= deadline:
+                break
+
+    return improved
+
+
+def or_opt(order, costs, closed, deadline):
+
+    """
+    Move segments of up to OR_OPT_LENGTH stops (possibly reversed) to
+    a better place in the order while that shortens it.
+
+    :Returns: bool
+        True if the order was improved.
+    """
+
+    n = len(order)
+    improved = False
+    changed = True
+
+    def step(a, b):
+        return 0.0 if a is None or b is None else costs[a][b]
+
+    def after(position, sequence):
+        if position + 1 < len(sequence):
+            return sequence[position + 1]
+        return sequence[0] if closed else None
+
+    while changed and time.perf_counter() < deadline:
+        changed = False
+
+        for length in range(1, OR_OPT_LENGTH + 1):
+            i = 1
+            while i + length <= n:
+                first, last = order[i], order[i + length - 1]
+                before, behind = order[i - 1], after(i + length - 1, order)
+
+                # Gain of taking the segment out
+                gain = step(before, first) + step(last, behind) - step(before, behind)
+
+                rest = order[:i] + order[i + length:]
+                segment = order[i:i + length]
+                best, where, flip = 1e-9, None, False
+
+                # Insert between rest[p] and its successor
+                for p in range(len(rest)):
+                    if p == i - 1:
+                        continue
+                    u, v = rest[p], after(p, rest)
+                    base = step(u, v)
+                    forward = step(u, first) + step(last, v) - base
+                    backward = step(u, last) + step(first, v) - base
+                    if gain - forward > best:
+                        best, where, flip = gain - forward, p, False
+                    if gain - backward > best:
+                        best, where, flip = gain - backward, p, True
+
+                if where is not None:
+                    moved = segment[::-1] if flip else segment
+                    order[:] = rest[:where + 1] + moved + rest[where + 1:]
+                    changed = improved = True
+                i += 1
+
+            if time.perf_counter() >= deadline:
+                break
+
+    return improved
+
+
+def improve_order(costs, closed=False, time_budget=1.0):
+
+    """
+    Heuristic order for many stops: nearest neighbour, then 2-opt and
+    Or-opt in turn until neither helps or time_budget seconds passed.
+
+    :Returns: list[int]
+        Order of the stops, stop 0 first.
+    """
+
+    deadline = time.perf_counter() + time_budget
+    order = nearest_neighbour(costs)
+
+    while time.perf_counter() < deadline:
+        moved = two_opt(order, costs, closed, deadline)
+        moved = or_opt(order, costs, closed, deadline) or moved
+        if not moved:
+            break
+
+    return order
+
+
+# ==============================================================
+#                   Tour Planning
+# ==============================================================
+
+@profiling.stage("tour")
+def plan_tour(graph, stops, closed=False, time_budget=1.0, exact_limit=EXACT_LIMIT):
+
+    """
+    Shortest route visiting every stop, starting at the first one.
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param stops: list[Classroom]
+        Classrooms to visit (repeated classrooms are visited once).
+    :param closed: bool
+        Return to the first stop at the end.
+    :param time_budget: float
+        Seconds given to the heuristic (above exact_limit stops).
+    :param exact_limit: int
+        Largest number of stops ordered exactly with Held-Karp.
+
+    :Returns: tuple
+        - path: list[Classroom]
+            Complete path through every stop.
+        - distance: float
+            Total cost of the path (inf if some stop is unreachable).
+        - order: list[Classroom]
+            Stops in visiting order (the first stop again at the end
+            when closed).
+    """
+
+    stops = list(dict.fromkeys(stops))
+    if not stops:
+        return [], 0, []
+
+    # Stops on another island than the first one can never be visited
+    unreachable = [stop for stop in stops[1:] if not graph.connected(stops[0], stop)]
+    if unreachable:
+        logger.info("%s unreachable from %s !", ", ".join(stop.name for stop in unreachable), stops[0].name)
+        return [], math.inf, []
+
+    costs, trees = stop_costs(graph, stops)
+
+    if len(stops) <= exact_limit:
+        order = held_karp(costs, closed)
+    else:
+        order = improve_order(costs, closed, time_budget)
+
+    if closed and len(order) > 1:
+        order.append(order[0])
+
+    # Expand the legs, each leg starting where the previous one ended
+    path = [stops[order[0]]]
+    for i, j in zip(order, order[1:]):
+        path.extend(leg(graph, stops, trees, i, j)[1:])
+
+    profiling.count("tour stops", len(stops))
+    return path, tour_cost(order, costs), [stops[i] for i in order]
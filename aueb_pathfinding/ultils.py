@@ -3,18 +3,32 @@ Helper functions for the indoor navigation system.
 
 This file contains utility functions used across the project,
 including data cleaning, distance calculation, and the implemetation
-of Dijsktra algorithm for the shortest path computation.
+of Dijsktra and A* algorithms for the shortest path computation.
 """
 
 import re
 import math
+import hashlib
+import heapq
+import logging
+from bisect import bisect_right
+from itertools import count
+
+from aueb_pathfinding import profiling
+
+logger = logging.getLogger(__name__)
 
 
 # ==============================================================
 #                   Data Cleaning Function
 # ==============================================================
 
-def clean_values(value, special_symbols=r"[@#!$\*]"):
+# Special symbols found in the map files
+_SPECIAL_SYMBOLS = re.compile(r"[@#!$\*]")
+_SYMBOLS_TABLE = str.maketrans("", "", "@#!$*")
+
+
+def clean_values(value, special_symbols=_SPECIAL_SYMBOLS):
     """
     Clean input values by removing special symbols.
 
@@ -23,7 +37,7 @@ def clean_values(value, special_symbols=r"[@#!$\*]"):
 
     :param value: str
         Raw value read from the input file.
-    :param special_symbols: str
+    :param special_symbols: str or re.Pattern
         Regular expression of symbols to be removed.
 
     :Returns: int or str
@@ -31,7 +45,9 @@ def clean_values(value, special_symbols=r"[@#!$\*]"):
     """
 
     # Remove special symbols
-    clean_value = re.sub(special_symbols, "", value)
+    if isinstance(special_symbols, str):
+        special_symbols = re.compile(special_symbols)
+    clean_value = special_symbols.sub("", value)
 
     try:
         return int(clean_value)
@@ -40,6 +56,104 @@ def clean_values(value, special_symbols=r"[@#!$\*]"):
         return clean_value
 
 
+def iter_map(txt_file, errors=None):
+    """
+    Stream classroom records from a map file.
+
+    Each line is expected as: classroom_name; x; y; floor. Special
+    symbols are stripped with a translate table and every column is
+    parsed by type (the name stays a string, x, y and floor are
+    integers). Malformed lines are logged (WARNING) with their line
+    number and skipped, empty lines are ignored.
+
+    :param txt_file: str
+        Path to the map text file.
+    :param errors: list or None
+        If given, receives (line number, line) of every malformed line
+        instead of logging it.
+
+    :Yields: tuple
+        (name, x, y, floor) of every classroom, in file order.
+    """
+
+    line_number = malformed = 0
+
+    with open(txt_file, "r") as file:
+        for line_number, row in enumerate(file, start=1):
+
+            parts = row.translate(_SYMBOLS_TABLE).split(";")
+
+            try:
+                name, x, y, floor = parts
+                name = name.strip()
+                if not name:
+                    raise ValueError("empty classroom name")
+                record = (name, int(x), int(y), int(floor))
+
+            except ValueError:
+                # Blank lines are not worth a report
+                if not row.strip():
+                    continue
+                malformed += 1
+                if errors is not None:
+                    errors.append((line_number, row.rstrip("\n")))
+                else:
+                    logger.warning("Skipping malformed line %d of %s: %r", line_number, txt_file, row.strip())
+                continue
+
+            yield record
+
+    profiling.count("lines parsed", line_number)
+    profiling.count("lines malformed", malformed)
+
+
+# ==============================================================
+#                   Map Fingerprint
+# ==============================================================
+
+def file_checksum(txt_file):
+    """
+    SHA-256 digest of a file's content, read in blocks.
+
+    :param txt_file: str
+        Path to the file.
+
+    :Returns: bytes
+        32-byte digest.
+    """
+
+    digest = hashlib.sha256()
+
+    with open(txt_file, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.digest()
+
+
+def map_fingerprint(txt_file, max_distance, floor_weight):
+    """
+    Identify a map file together with the graph parameters.
+
+    Used as key of the files precomputed from a map, so that they are
+    rebuilt whenever the map or the parameters change.
+
+    :param txt_file: str
+        Path to the map text file.
+    :param max_distance: float
+        Maximum allowed distance of an edge.
+    :param floor_weight: float
+        Weight factor applied to floor differences.
+
+    :Returns: str
+        SHA-256 hex digest of the file content and the parameters.
+    """
+
+    digest = hashlib.sha256(file_checksum(txt_file))
+    digest.update(f"|{float(max_distance)!r}|{float(floor_weight)!r}".encode())
+    return digest.hexdigest()
+
+
 # ==============================================================
 #                   Distance Calculation
 # ==============================================================
@@ -82,21 +196,150 @@ def distance(node1, node2, floor_weight=1.5):
     return euclidean_distance + floor_penalty
 
 
+# ==============================================================
+#                   Neighbour Search
+# ==============================================================
+
+def floor_reach(max_distance, floor_weight, floor_span):
+    """
+    Compute the largest floor difference that can still fit within
+    the maximum distance.
+
+    Two classrooms whose floors differ by d are at least
+    floor_weight * d ** 2 apart, whatever their coordinates.
+
+    :param max_distance: float
+        Maximum allowed distance of an edge.
+    :param floor_weight: float
+        Weight factor applied to floor differences.
+    :param floor_span: int
+        Difference between the highest and the lowest floor of the map.
+
+    :Returns: int
+        Largest reachable floor difference (at most floor_span).
+    """
+
+    reach = 0
+    while reach < floor_span and floor_weight * (reach + 1) ** 2 <= max_distance:
+        reach += 1
+
+    return reach
+
+
+def neighbour_pairs(nodes, max_distance, floor_weight=1.5):
+    """
+    Generate the index pairs of classrooms that may be connected.
+
+    Classrooms are bucketed in a uniform grid keyed on (x, y, floor)
+    with cell size equal to max_distance. Each classroom is then only
+    compared with the classrooms in its own and the adjacent cells, on
+    the floors that floor_weight still allows within max_distance.
+    Pairs are yielded in the same order as the brute-force double loop,
+    so every pair within max_distance is guaranteed to be included.
+
+    :param nodes: list[Classroom]
+        Classrooms of the map.
+    :param max_distance: float
+        Maximum allowed distance of an edge.
+    :param floor_weight: float
+        Weight factor applied to floor differences.
+
+    :Yields: tuple
+        Index pair (i, j) with i < j.
+    """
+
+    # A negative floor weight shortens distances, no cell bound holds
+    if floor_weight < 0:
+        for i in range(len(nodes)):
+            for j in range(i + 1, len(nodes)):
+                yield i, j
+        return
+
+    # Nothing can be within a negative distance
+    if max_distance < 0 or not nodes:
+        return
+
+    size = max_distance if max_distance > 0 else 1.0
+    cells = {}
+
+    # Bucket classrooms by cell, indices stay sorted within a bucket
+    keys = []
+    for i, node in enumerate(nodes):
+        key = (int(node.x // size), int(node.y // size), node.floor)
+        keys.append(key)
+        cells.setdefault(key, []).append(i)
+
+    floors = [node.floor for node in nodes]
+    reach = floor_reach(max_distance, floor_weight, max(floors) - min(floors))
+
+    for i, (cx, cy, floor) in enumerate(keys):
+
+        candidates = []
+        for df in range(-reach, reach + 1):
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    bucket = cells.get((cx + dx, cy + dy, floor + df))
+                    if bucket:
+                        # Keep only the classrooms after i (each pair once)
+                        candidates.extend(bucket[bisect_right(bucket, i):])
+
+        candidates.sort()
+        for j in candidates:
+            yield i, j
+
+
 # ==============================================================
 #                   Shortest Path Algorithm
 # ==============================================================
 
-def dijkstra(graph, start, target):
+def reconstruct_path(previous, target):
+    """
+    Rebuild a path by walking the predecessor map back from the target.
+
+    :param previous: dict
+        Predecessor of every discovered node (None for the source).
+    :param target: Classroom or int
+        Last node (or dense id) of the path.
+
+    :Returns: list
+        Path from the source to the target.
+    """
+
+    # Append while walking backwards, then reverse once
+    path = []
+    current = target
+    while current is not None:
+        path.append(current)
+        current = previous[current]
+
+    path.reverse()
+    return path
+
+
+@profiling.stage("dijkstra")
+def dijkstra(graph, start, target, stats=None):
     """
     Compute the shortest path between two classrooms using
     Dijkstra's algorithm.
 
-    :param graph: University
+    A binary heap with lazy deletion is used as priority queue,
+    so a query runs in O((V + E) log V). The search stops as soon
+    as the target is settled.
+
+    The graph is accessed through key_of / node_of / neighbours_of,
+    so the same code runs on a University (dict adjacency) and on a
+    FrozenUniversity (CSR arrays and integer ids).
+    Pairs in different connected components (graph.connected) are
+    rejected before any node is settled.
+
+    :param graph: University or FrozenUniversity
         University graph containing nodes and weighted edges.
     :param start: Classroom
         Starting classroom.
     :param target: Classroom
         Target classroom.
+    :param stats: dict or None
+        If given, receives the number of settled nodes under "expanded".
 
     :Returns: tuple
         - path: list[Classroom]
@@ -105,55 +348,550 @@ def dijkstra(graph, start, target):
             Total cost of the path.
     """
 
-    # Initialization of helper dictionaries
-    dist = {}
-    previous = {}
-    visited = {}
+    neighbours = graph.neighbours_of
+    source = graph.key_of(start)
+    goal = graph.key_of(target)
 
-    for node in graph.nodes:
-        dist[node] = math.inf
-        previous[node] = None
-        visited[node] = False
+    # Helper dictionaries, filled only for discovered nodes
+    dist = {source: 0}
+    previous = {source: None}
+    visited = set()
 
-    dist[start] = 0
+    # Heap entries are (distance, tie-breaker, node), the counter
+    # avoids comparing Classroom objects on equal distances
+    tie = count()
+    heap = [(0, next(tie), source)] if source is not None else []
+
+    # Classrooms on different islands are rejected without searching
+    if heap and not graph.connected(start, target):
+        profiling.count("component rejections")
+        heap = []
 
     # Main Dijkstra loop
-    while True:
+    while heap:
 
         # Select unvisited node with minimum distance
-        u = min(
-            (node for node in graph.nodes if not visited[node]),
-            key=lambda node: dist[node],
-            default=None
-        )
+        d, _, u = heapq.heappop(heap)
 
-        # Stop if no reachable node remains
-        if u is None or dist[u] == math.inf:
-            break
+        # Stale entry, the node was already settled (lazy deletion)
+        if u in visited:
+            continue
 
         # Stop if target is reached
-        if u == target:
+        if u == goal:
             break
 
-        visited[u] = True
+        visited.add(u)
 
         # Update shortest path
-        for v in graph.get_neighbors(u):
-            if not visited[v]:
-                alt = dist[u] + graph.edges[u][v]
-                if alt < dist[v]:
+        for v, weight in neighbours(u):
+            if v not in visited:
+                alt = d + weight
+                if alt < dist.get(v, math.inf):
                     dist[v] = alt
                     previous[v] = u
+                    heapq.heappush(heap, (alt, next(tie), v))
+
+    if stats is not None:
+        stats["expanded"] = len(visited)
+    profiling.count_search(len(visited), next(tie))
 
     # Path reconstruction
-    if dist[target] == math.inf:
-        print(f"{target.name} is unreachable from {start.name} !")
+    if goal is None or goal not in dist:
+        logger.info("%s is unreachable from %s !", target.name, start.name)
         return [], math.inf
 
-    path = []
-    current = target
-    while current is not None:
-        path.insert(0, current)
-        current = previous[current]
+    path = [graph.node_of(key) for key in reconstruct_path(previous, goal)]
+    return path, dist[goal]
+
+
+@profiling.stage("shortest path tree")
+def shortest_path_tree(graph, start, stats=None, targets=None):
+    """
+    Compute the shortest paths from one classroom to every reachable one.
+
+    Same heap-based Dijkstra as dijkstra(), without a target, so the
+    whole component of start is settled. With targets, the search stops
+    as soon as all of them are settled: only their distances (and the
+    paths to them) are then final.
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param start: Classroom
+        Source classroom.
+    :param stats: dict or None
+        If given, receives the number of settled nodes under "expanded".
+    :param targets: iterable or None
+        Classrooms whose settling ends the search.
+
+    :Returns: tuple
+        - dist: dict
+            Shortest distance of every reachable search key.
+        - previous: dict
+            Predecessor of every reachable search key (see
+            reconstruct_path).
+    """
+
+    neighbours = graph.neighbours_of
+    source = graph.key_of(start)
+
+    if source is None:
+        return {}, {}
+
+    dist = {source: 0}
+    previous = {source: None}
+    visited = set()
+
+    # Targets not settled yet (None: settle everything)
+    remaining = None
+    if targets is not None:
+        remaining = {graph.key_of(node) for node in targets} - {None}
+
+    tie = count()
+    heap = [(0, next(tie), source)]
+
+    while heap:
+        d, _, u = heapq.heappop(heap)
+
+        if u in visited:
+            continue
+
+        visited.add(u)
+
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+
+        for v, weight in neighbours(u):
+            if v not in visited:
+                alt = d + weight
+                if alt < dist.get(v, math.inf):
+                    dist[v] = alt
+                    previous[v] = u
+                    heapq.heappush(heap, (alt, next(tie), v))
+
+    if stats is not None:
+        stats["expanded"] = len(visited)
+    profiling.count_search(len(visited), next(tie))
+
+    return dist, previous
+
+
+@profiling.stage("reachable within")
+def reachable_within(graph, start, budget, stats=None):
+    """
+    Find every classroom reachable from start within a cost budget
+    (isochrone), e.g. for evacuation planning.
+
+    Same heap-based Dijkstra as shortest_path_tree(), but entries
+    costing more than the budget are never pushed, so the search stops
+    at the budget and memory stays proportional to the classrooms
+    reached (no predecessors are kept).
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param start: Classroom
+        Source classroom.
+    :param budget: float
+        Maximum path cost.
+    :param stats: dict or None
+        If given, receives the number of settled nodes under "expanded".
+
+    :Returns: dict
+        Classroom -> shortest path cost, for every classroom within the
+        budget (start included), in increasing cost order.
+    """
+
+    neighbours = graph.neighbours_of
+    source = graph.key_of(start)
+
+    if source is None or budget < 0:
+        return {}
+
+    # Tentative costs of discovered nodes, settled costs in settle order
+    dist = {source: 0}
+    reached = {}
+
+    tie = count()
+    heap = [(0, next(tie), source)]
+
+    while heap:
+        d, _, u = heapq.heappop(heap)
+
+        if u in reached:
+            continue
+
+        reached[u] = d
+        del dist[u]
+
+        for v, weight in neighbours(u):
+            if v not in reached:
+                alt = d + weight
+                if alt <= budget and alt < dist.get(v, math.inf):
+                    dist[v] = alt
+                    heapq.heappush(heap, (alt, next(tie), v))
+
+    if stats is not None:
+        stats["expanded"] = len(reached)
+    profiling.count_search(len(reached), next(tie))
+
+    node_of = graph.node_of
+    return {node_of(key): cost for key, cost in reached.items()}
+
+
+def repair_tree(graph, dist, previous, changed):
+    """
+    Repair a shortest-path tree in place after some edges changed.
+
+    The edges in changed have already been removed, added or
+    re-weighted in the graph. Tree edges that no longer match their
+    weight invalidate the subtree below them: those nodes are reset
+    and re-seeded from their neighbours outside the subtree. Edges
+    that became shorter are relaxed from their ends. A Dijkstra
+    restricted to the improved nodes then propagates the new
+    distances, so only the affected part of the tree is searched.
+
+    :param graph: University or FrozenUniversity
+        University graph, already updated.
+    :param dist: dict
+        Shortest distance of every reachable search key (updated).
+    :param previous: dict
+        Predecessor of every reachable search key (updated).
+    :param changed: iterable
+        (u, v) search-key pairs of the changed edges.
+
+    :Returns: int
+        Number of nodes whose distance or predecessor was recomputed.
+    """
+
+    neighbours = graph.neighbours_of
+
+    def weight_of(u, v):
+        return next((weight for key, weight in neighbours(u) if key == v), None)
+
+    changed = [(u, v) for a, b in changed for u, v in ((a, b), (b, a))]
+
+    # Tree edges that are gone or no longer consistent
+    roots = []
+    for u, v in changed:
+        if v in previous and previous[v] == u:
+            weight = weight_of(u, v)
+            if weight is None or dist[u] + weight != dist[v]:
+                roots.append(v)
+
+    # Every node below an invalid tree edge loses its distance
+    invalid = set()
+    if roots:
+        children = {}
+        for node, parent in previous.items():
+            if parent is not None:
+                children.setdefault(parent, []).append(node)
+
+        stack = [root for root in roots if root not in invalid]
+        while stack:
+            node = stack.pop()
+            if node in invalid:
+                continue
+            invalid.add(node)
+            stack.extend(children.get(node, ()))
+
+        for node in invalid:
+            del dist[node]
+            del previous[node]
+
+    tie = count()
+    heap = []
+
+    # Re-seed the invalid nodes from their valid neighbours
+    for node in invalid:
+        best, parent = math.inf, None
+        for other, weight in neighbours(node):
+            if other in dist and dist[other] + weight < best:
+                best, parent = dist[other] + weight, other
+        if parent is not None:
+            dist[node] = best
+            previous[node] = parent
+            heapq.heappush(heap, (best, next(tie), node))
+
+    # Shorter (or new) edges
+    for u, v in changed:
+        if u in dist:
+            weight = weight_of(u, v)
+            if weight is not None and dist[u] + weight < dist.get(v, math.inf):
+                dist[v] = dist[u] + weight
+                previous[v] = u
+                heapq.heappush(heap, (dist[v], next(tie), v))
+
+    # Propagate the improvements
+    touched = set(invalid)
+    while heap:
+        d, _, u = heapq.heappop(heap)
+
+        # Stale entry, a shorter distance was found since
+        if d > dist[u]:
+            continue
+        touched.add(u)
+
+        for v, weight in neighbours(u):
+            alt = d + weight
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                previous[v] = u
+                heapq.heappush(heap, (alt, next(tie), v))
+
+    profiling.count("nodes repaired", len(touched))
+    return len(touched)
+
+
+def path_cost(graph, path):
+    """
+    Sum the edge weights along a path of search keys, from the start.
+
+    The sum is accumulated in the same order as dijkstra() does, so
+    the same path always gives exactly the same float.
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param path: list
+        Consecutive search keys (see key_of) of the path.
+
+    :Returns: float
+        Total cost of the path.
+    """
+
+    cost = 0
+    for u, v in zip(path, path[1:]):
+        cost += next(weight for key, weight in graph.neighbours_of(u) if key == v)
+
+    return cost
+
+
+@profiling.stage("bidirectional dijkstra")
+def bidirectional_dijkstra(graph, start, target, stats=None):
+    """
+    Compute the shortest path between two classrooms by running
+    Dijkstra's algorithm from both ends at once.
+
+    The graph is undirected, so the backward search uses the same
+    edges. The side with the smaller queue key is expanded first and
+    the search stops when the two queue keys together reach the best
+    meeting cost found so far, at which point that cost is optimal.
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param start: Classroom
+        Starting classroom.
+    :param target: Classroom
+        Target classroom.
+    :param stats: dict or None
+        If given, receives the number of settled nodes (both sides)
+        under "expanded".
+
+    :Returns: tuple
+        - path: list[Classroom]
+            Shortest path from start to target.
+        - distance: float
+            Total cost of the path.
+    """
+
+    neighbours = graph.neighbours_of
+    source = graph.key_of(start)
+    goal = graph.key_of(target)
+
+    # One set of helper structures per direction: forward, backward
+    dist = ({source: 0}, {goal: 0})
+    previous = ({source: None}, {goal: None})
+    visited = (set(), set())
+
+    tie = count()
+    heaps = ([(0, next(tie), source)], [(0, next(tie), goal)])
+
+    # Trivial query, nothing to search
+    if source is not None and source == goal:
+        if stats is not None:
+            stats["expanded"] = 0
+        return [start], 0
+
+    # Best meeting edge so far
+    best = math.inf
+    meet = None
+    if source is None or goal is None:
+        heaps = ([], [])
+
+    # Classrooms on different islands are rejected without searching
+    elif not graph.connected(start, target):
+        profiling.count("component rejections")
+        heaps = ([], [])
+
+    # Main loop, stops once no shorter meeting is possible
+    while heaps[0] and heaps[1]:
+
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        # Expand the side with the smaller queue key
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, _, u = heapq.heappop(heaps[side])
+
+        # Stale entry (lazy deletion)
+        if u in visited[side]:
+            continue
+
+        visited[side].add(u)
+        own_dist, own_previous = dist[side], previous[side]
+        other_dist = dist[1 - side]
+
+        for v, weight in neighbours(u):
+            alt = d + weight
+
+            if v not in visited[side] and alt < own_dist.get(v, math.inf):
+                own_dist[v] = alt
+                own_previous[v] = u
+                heapq.heappush(heaps[side], (alt, next(tie), v))
+
+            # Edge (u, v) joins the two searches
+            if v in other_dist and alt + other_dist[v] < best:
+                best = alt + other_dist[v]
+                meet = (u, v) if side == 0 else (v, u)
+
+    if stats is not None:
+        stats["expanded"] = len(visited[0]) + len(visited[1])
+    profiling.count_search(len(visited[0]) + len(visited[1]), next(tie), sources=2)
+
+    if meet is None:
+        logger.info("%s is unreachable from %s !", target.name, start.name)
+        return [], math.inf
+
+    # Path splicing: start -> u from the forward search, v -> target
+    # from the backward one
+    u, v = meet
+    keys = reconstruct_path(previous[0], u)
+    keys.extend(reversed(reconstruct_path(previous[1], v)))
+
+    path = [graph.node_of(key) for key in keys]
+    return path, path_cost(graph, keys)
+
+
+def heuristic_scale(floor_weight):
+    """
+    Compute the factor that keeps the A* heuristic admissible.
+
+    An edge between two classrooms costs at least their straight-line
+    distance plus floor_weight * |floor difference|: the squared floor
+    penalty of distance() is never below the absolute difference for
+    integer floors, so a route through intermediate floors costs at
+    least as much as the direct penalty. Edge weights are however
+    rounded to 2 decimals (up to 0.005 lower), and the shortest edge
+    between different positions is at least min(1, floor_weight) long
+    (integer coordinates), hence the scale below.
+
+    :param floor_weight: float
+        Weight factor applied to floor differences.
+
+    :Returns: float
+        Scale factor in [0, 1) applied to the heuristic.
+    """
+
+    # Negative penalties make distances shorter than the straight line
+    if floor_weight < 0:
+        return 0.0
+
+    shortest_edge = min(1.0, floor_weight) if floor_weight > 0 else 1.0
+    return max(0.0, 1.0 - 0.005 / shortest_edge - 1e-9)
+
+
+@profiling.stage("astar")
+def astar(graph, start, target, stats=None):
+    """
+    Compute the shortest path between two classrooms using A* search.
+
+    The heuristic is the same metric as distance(), made admissible:
+    straight-line distance plus floor_weight times the absolute floor
+    difference, scaled by heuristic_scale(). It is also consistent, so
+    the result is the same shortest path as dijkstra() while far fewer
+    nodes are expanded. Edge weights are assumed to come from distance().
+
+    :param graph: University or FrozenUniversity
+        University graph containing nodes and weighted edges.
+    :param start: Classroom
+        Starting classroom.
+    :param target: Classroom
+        Target classroom.
+    :param stats: dict or None
+        If given, receives the number of settled nodes under "expanded".
+
+    :Returns: tuple
+        - path: list[Classroom]
+            Shortest path from start to target.
+        - distance: float
+            Total cost of the path.
+    """
+
+    neighbours = graph.neighbours_of
+    node_of = graph.node_of
+    source = graph.key_of(start)
+    goal = graph.key_of(target)
+
+    scale = heuristic_scale(graph.floor_weight)
+    floor_scale = scale * max(graph.floor_weight, 0.0)
+    tx, ty, tfloor = target.x, target.y, target.floor
+
+    # Lower bound of the remaining cost from a node to the target
+    def heuristic(key):
+        node = node_of(key)
+        return (
+            scale * math.hypot(tx - node.x, ty - node.y)
+            + floor_scale * abs(tfloor - node.floor)
+        )
+
+    # Helper dictionaries, filled only for discovered nodes
+    dist = {source: 0}
+    previous = {source: None}
+    visited = set()
+
+    # Heap entries are (distance + heuristic, tie-breaker, node)
+    tie = count()
+    heap = [(heuristic(source), next(tie), source)] if source is not None else []
+
+    # Classrooms on different islands are rejected without searching
+    if heap and not graph.connected(start, target):
+        profiling.count("component rejections")
+        heap = []
+
+    # Main A* loop
+    while heap:
+
+        _, _, u = heapq.heappop(heap)
+
+        # Stale entry, the node was already settled (lazy deletion)
+        if u in visited:
+            continue
+
+        # Stop if target is reached
+        if u == goal:
+            break
+
+        visited.add(u)
+        d = dist[u]
+
+        # Update shortest path
+        for v, weight in neighbours(u):
+            if v not in visited:
+                alt = d + weight
+                if alt < dist.get(v, math.inf):
+                    dist[v] = alt
+                    previous[v] = u
+                    heapq.heappush(heap, (alt + heuristic(v), next(tie), v))
+
+    if stats is not None:
+        stats["expanded"] = len(visited)
+    profiling.count_search(len(visited), next(tie))
+
+    # Path reconstruction
+    if goal is None or goal not in dist:
+        logger.info("%s is unreachable from %s !", target.name, start.name)
+        return [], math.inf
 
-    return path, dist[target]
+    path = [node_of(key) for key in reconstruct_path(previous, goal)]
+    return path, dist[goal]
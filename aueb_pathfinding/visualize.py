@@ -0,0 +1,234 @@
+"""
+Graph visualisation of the indoor navigation system.
+
+This is the only module importing Matplotlib (and NumPy, which
+Matplotlib requires anyway). It is imported lazily
+(menu.visualize_graph), so the routing modules start with the
+standard library only.
+
+The drawing reads the edges already stored in a University: nothing
+is recomputed, and the edges of a panel are drawn as a single line
+broken by NaN gaps (one artist, instead of one line object per edge),
+so maps with a hundred thousand classrooms render in seconds. Names and weights are
+only written on small panels (level of detail).
+"""
+
+import math
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+
+# Panels with more classrooms (edges) than this get no names (weights)
+LABEL_LIMIT = 200
+
+
+# ==============================================================
+#                     Vizualize Graph
+# ==============================================================
+
+class GraphArrays:
+
+    """
+    Coordinates and edges of a University as NumPy arrays.
+
+    :Attributes:
+        nodes: list[Classroom]
+            Classrooms, in the order of the arrays.
+        x, y, floor: numpy.ndarray
+            Coordinates of every classroom.
+        first, second, weight: numpy.ndarray
+            Positions of the two classrooms and weight of every
+            undirected edge (stored once).
+    """
+
+    # Initialization
+    def __init__(self, uni):
+
+        order = {}
+        for node in uni.nodes:
+            order.setdefault(node, len(order))
+        for node in uni.edges:
+            order.setdefault(node, len(order))
+
+        self.nodes = list(order)
+        self.x = np.array([node.x for node in self.nodes], dtype=float)
+        self.y = np.array([node.y for node in self.nodes], dtype=float)
+        self.floor = np.array([node.floor for node in self.nodes])
+
+        # Each edge is stored in both directions, keep one of them
+        first, second, weight = [], [], []
+        for node1, targets in uni.edges.items():
+            rank = order[node1]
+            for node2, w in targets.items():
+                other = order[node2]
+                if rank < other:
+                    first.append(rank)
+                    second.append(other)
+                    weight.append(w)
+
+        self.first = np.array(first, dtype=np.int64)
+        self.second = np.array(second, dtype=np.int64)
+        self.weight = np.array(weight, dtype=float)
+
+
+def draw_university(uni, path=None, by_floor=False, label_limit=LABEL_LIMIT, panel_size=6):
+
+    """
+    Draw a University graph from its stored edges.
+
+    Classrooms are coloured by floor. With by_floor every floor gets its
+    own panel; edges between floors (stairs) are then drawn dashed on
+    both floors they join.
+
+    :param uni: University
+        University graph with its edges built.
+    :param path: list[Classroom] or None
+        Route to highlight, e.g. the path returned by shortest_path.
+    :param by_floor: bool
+        One panel per floor instead of a single overview.
+    :param label_limit: int
+        Classroom names (edge weights) are only written on panels with
+        at most this many classrooms (edges).
+    :param panel_size: float
+        Width and height of each panel in inches.
+
+    :Returns: matplotlib.figure.Figure
+        Figure object containing the rendered graph.
+    """
+
+    graph = GraphArrays(uni)
+    floors = sorted(set(graph.floor.tolist())) or [0]
+
+    # One panel per floor, or a single panel showing every floor
+    panels = [[floor] for floor in floors] if by_floor else [floors]
+
+    columns = min(len(panels), 3)
+    rows = math.ceil(len(panels) / columns)
+    fig, axes = plt.subplots(rows, columns, figsize=(panel_size * columns, panel_size * rows), squeeze=False)
+    axes = axes.ravel()
+
+    for ax, shown in zip(axes, panels):
+        draw_panel(ax, graph, shown, floors, path, label_limit)
+        ax.set_title(f"Floor {shown[0]}" if by_floor else "Aueb Classrooms Graph")
+
+    # Unused panels of the last row
+    for ax in axes[len(panels):]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    return fig
+
+
+def segments_xy(graph, first, second):
+
+    """
+    x and y of many edges as one line: start, end, NaN gap, start, ...
+    """
+
+    x = np.full((len(first), 3), np.nan)
+    y = np.full((len(first), 3), np.nan)
+    x[:, 0], x[:, 1] = graph.x[first], graph.x[second]
+    y[:, 0], y[:, 1] = graph.y[first], graph.y[second]
+
+    return x.ravel(), y.ravel()
+
+
+def draw_panel(ax, graph, shown, floors, path, label_limit):
+
+    """
+    Draw the classrooms and edges of the shown floors on one axes.
+
+    :param shown: list
+        Floors drawn on this panel.
+    :param floors: list
+        Every floor of the map (fixes the floor colours across panels).
+    """
+
+    on_panel = np.isin(graph.floor, shown)
+    in1, in2 = on_panel[graph.first], on_panel[graph.second]
+
+    # Edges on the shown floors, and edges leaving them (stairs)
+    inside = np.flatnonzero(in1 & in2)
+    stairs = np.flatnonzero(in1 ^ in2)
+
+    for edges, style in ((inside, "solid"), (stairs, "dashed")):
+        if len(edges):
+            x, y = segments_xy(graph, graph.first[edges], graph.second[edges])
+            ax.plot(x, y, color="gray", linewidth=0.6, linestyle=style, zorder=1)
+
+    # Classrooms, coloured by floor
+    panel_nodes = np.flatnonzero(on_panel)
+    small = len(panel_nodes) <= label_limit
+    ax.scatter(
+        graph.x[panel_nodes], graph.y[panel_nodes], c=graph.floor[panel_nodes],
+        cmap="viridis", vmin=floors[0], vmax=max(floors[-1], floors[0] + 1),
+        s=60 if small else 4, edgecolors="none", zorder=2,
+    )
+
+    # Level of detail: names and weights only on small panels
+    if small:
+        for i in panel_nodes:
+            ax.annotate(graph.nodes[i].name, (graph.x[i], graph.y[i]), xytext=(0, 5),
+                        textcoords="offset points", ha="center", fontsize=8, fontweight="bold")
+
+    if len(inside) <= label_limit:
+        for i, j, weight in zip(graph.first[inside], graph.second[inside], graph.weight[inside]):
+            ax.text((graph.x[i] + graph.x[j]) / 2, (graph.y[i] + graph.y[j]) / 2, f"{weight:g}",
+                    fontsize=7, color="dimgray", ha="center", va="center")
+
+    if path:
+        draw_path(ax, path, shown)
+
+    ax.autoscale_view()
+    ax.set_aspect("equal", adjustable="datalim")
+    ax.margins(0.05)
+
+
+def draw_path(ax, path, shown):
+
+    """
+    Highlight the steps of a route that touch the shown floors, and
+    mark its start and target.
+    """
+
+    steps = [
+        ((node1.x, node1.y), (node2.x, node2.y))
+        for node1, node2 in zip(path, path[1:])
+        if node1.floor in shown or node2.floor in shown
+    ]
+    ax.add_collection(LineCollection(steps, colors="crimson", linewidths=2.5, zorder=3))
+
+    for node, marker in ((path[0], "o"), (path[-1], "*")):
+        if node.floor in shown:
+            ax.scatter([node.x], [node.y], c="crimson", marker=marker, s=160, zorder=4)
+
+
+def draw_graph(classrooms, max_distance=21.0, floor_weight=1.0, path=None, by_floor=False):
+
+    """
+    Visualize classrooms that are not in a University yet.
+
+    The edges are built with University.build_edges first, so prefer
+    draw_university when the graph already exists.
+
+    :param classrooms: list[Classroom]
+        List of classroom nodes to be visualized.
+    :param max_distance: float
+        Maximum allowed distance between two classrooms to draw an edge.
+    :param floor_weight: float
+        Weight applied to floor differences when computing distances.
+
+    :Returns: matplotlib.figure.Figure
+        Figure object containing the rendered graph.
+    """
+
+    from aueb_pathfinding.classes import University
+
+    uni = University(max_distance=max_distance, floor_weight=floor_weight)
+    for node in classrooms:
+        uni.add_node(node)
+    uni.build_edges()
+
+    return draw_university(uni, path=path, by_floor=by_floor)
@@ -0,0 +1,6 @@
+"""
+Benchmark scripts for the indoor navigation system.
+
+Run them from the project directory as modules, e.g.:
+python -m benchmarks.bench_dijkstra
+"""
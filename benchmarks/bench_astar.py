@@ -0,0 +1,60 @@
+"""
+Benchmark of A* against Dijkstra: nodes expanded and latency per
+query, with a check that both return the same path costs.
+
+Usage (from the project directory):
+python -m benchmarks.bench_astar [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import math
+
+from aueb_pathfinding.classes import University
+from aueb_pathfinding.ultils import astar, dijkstra
+from benchmarks.common import random_classrooms, random_pairs, timed
+
+
+def run(sizes, queries, floor_weight):
+
+    print(f"{'nodes':>8} {'dijkstra exp':>13} {'astar exp':>10} {'dijkstra ms':>12} {'astar ms':>9}")
+
+    for n in sizes:
+        uni = University(max_distance=21.0, floor_weight=floor_weight)
+        for node in random_classrooms(n, seed=n):
+            uni.add_node(node)
+
+        pairs = random_pairs(uni.nodes, queries, seed=n)
+        totals = {"dijkstra": [0, 0.0], "astar": [0, 0.0]}
+
+        uni.build_edges()
+
+        for start, target in pairs:
+            costs = []
+            for name, search in (("dijkstra", dijkstra), ("astar", astar)):
+                stats = {}
+                (_, cost), elapsed = timed(search, uni, start, target, stats)
+                totals[name][0] += stats["expanded"]
+                totals[name][1] += elapsed
+                costs.append(cost)
+
+            # Same shortest path cost from both searches (equal-cost
+            # paths may only differ in float summation order)
+            assert math.isclose(costs[0], costs[1], rel_tol=1e-12), costs
+
+        d_exp, d_time = totals["dijkstra"]
+        a_exp, a_time = totals["astar"]
+        print(
+            f"{n:>8} {d_exp / queries:13.0f} {a_exp / queries:10.0f} "
+            f"{d_time / queries * 1000:12.2f} {a_time / queries * 1000:9.2f}"
+        )
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    args = parser.parse_args()
+
+    run(args.sizes, args.queries, args.floor_weight)
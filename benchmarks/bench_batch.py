@@ -0,0 +1,51 @@
+"""
+Throughput benchmark of the batch route API (queries per second)
+against the number of worker processes.
+
+Usage (from the project directory):
+python -m benchmarks.bench_batch [--nodes 20000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import random
+
+from aueb_pathfinding.batch import batch_routes
+from benchmarks.common import lattice_university, timed
+
+
+def run(n_nodes, n_queries, n_sources, workers_list):
+
+    frozen = lattice_university(n_nodes).freeze()
+
+    # Many queries sharing a limited number of sources
+    rng = random.Random(0)
+    names = [node.name for node in frozen.nodes]
+    sources = rng.sample(names, n_sources)
+    pairs = [(rng.choice(sources), rng.choice(names)) for _ in range(n_queries)]
+
+    print(f"nodes: {len(frozen.nodes)}, queries: {n_queries}, sources: {n_sources}\n")
+    print(f"{'workers':>8} {'seconds':>8} {'queries/s':>10}")
+
+    reference = None
+    for workers in workers_list:
+        results, elapsed = timed(batch_routes, frozen, pairs, workers=workers)
+
+        # Deterministic output whatever the number of workers
+        costs = [dist for _, dist in results]
+        if reference is None:
+            reference = costs
+        assert costs == reference
+
+        print(f"{workers:>8} {elapsed:8.2f} {n_queries / elapsed:10.0f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--sources", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    run(args.nodes, args.queries, args.sources, args.workers)
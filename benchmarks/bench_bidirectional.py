@@ -0,0 +1,51 @@
+"""
+Benchmark of bidirectional Dijkstra against the one-sided search:
+settled nodes and latency over random start/target pairs.
+
+Usage (from the project directory):
+python -m benchmarks.bench_bidirectional [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import math
+
+from aueb_pathfinding.ultils import bidirectional_dijkstra, dijkstra
+from benchmarks.common import lattice_university, random_pairs, timed
+
+
+def run(sizes, queries):
+
+    print(f"{'nodes':>8} {'dijkstra set':>13} {'bidir set':>10} {'dijkstra ms':>12} {'bidir ms':>9}")
+
+    for n in sizes:
+        uni = lattice_university(n)
+        pairs = random_pairs(uni.nodes, queries, seed=n)
+        totals = {dijkstra: [0, 0.0], bidirectional_dijkstra: [0, 0.0]}
+
+        for start, target in pairs:
+            costs = []
+            for search in totals:
+                stats = {}
+                (_, cost), elapsed = timed(search, uni, start, target, stats)
+                totals[search][0] += stats["expanded"]
+                totals[search][1] += elapsed
+                costs.append(cost)
+
+            assert math.isclose(costs[0], costs[1], rel_tol=1e-12), costs
+
+        d_set, d_time = totals[dijkstra]
+        b_set, b_time = totals[bidirectional_dijkstra]
+        print(
+            f"{n:>8} {d_set / queries:13.0f} {b_set / queries:10.0f} "
+            f"{d_time / queries * 1000:12.2f} {b_time / queries * 1000:9.2f}"
+        )
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    run(args.sizes, args.queries)
@@ -0,0 +1,117 @@
+"""
+Benchmark of the slotted, immutable Classroom against the original
+dict-based class: bytes per node and Dijkstra latency.
+
+Bytes per node are measured twice: for the classroom objects alone
+(names created beforehand, as a parsed map already holds them), and
+with unique names built from scratch, where the slotted class also
+pays for interning. The slotted classroom must be the smaller one.
+
+Usage (from the project directory):
+python -m benchmarks.bench_classroom [--nodes 200000]
+"""
+
+import argparse
+import math
+import sys
+import tracemalloc
+
+from aueb_pathfinding.classes import Classroom
+from aueb_pathfinding.ultils import dijkstra
+from benchmarks.common import lattice_university, random_pairs, timed
+
+
+class LegacyClassroom:
+    """
+    Original Classroom (instance __dict__, hash on every lookup).
+    """
+
+    def __init__(self, name, x, y, floor):
+        self.name = name
+        self.x = x
+        self.y = y
+        self.floor = floor
+
+    def __eq__(self, other):
+        if not isinstance(other, LegacyClassroom):
+            return False
+        return self.name == other.name
+
+    def __hash__(self):
+        return hash((self.name))
+
+
+def bytes_per_node(cls, n_nodes, names=False):
+    """
+    Memory allocated per classroom.
+
+    :param names: bool
+        Count the names too (built from scratch), instead of creating
+        them (interned) before the measurement.
+    """
+
+    shared = None if names else [sys.intern("R" + str(k)) for k in range(n_nodes)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    if names:
+        nodes = [cls("R" + str(k), k, -k, k % 7) for k in range(n_nodes)]
+    else:
+        nodes = [cls(shared[k], k, -k, k % 7) for k in range(n_nodes)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del nodes
+    return (after - before) / n_nodes
+
+
+def legacy_copy(uni):
+    """
+    Same graph with LegacyClassroom nodes (the search only needs edges).
+    """
+
+    legacy = {node: LegacyClassroom(node.name, node.x, node.y, node.floor) for node in uni.nodes}
+    uni.nodes = [legacy[node] for node in uni.nodes]
+    uni.edges = {
+        legacy[a]: {legacy[b]: weight for b, weight in targets.items()}
+        for a, targets in uni.edges.items()
+    }
+    return legacy
+
+
+def run(n_nodes, queries):
+
+    new_bytes = bytes_per_node(Classroom, n_nodes)
+    old_bytes = bytes_per_node(LegacyClassroom, n_nodes)
+    new_named = bytes_per_node(Classroom, n_nodes, names=True)
+    old_named = bytes_per_node(LegacyClassroom, n_nodes, names=True)
+
+    # Size check: the slotted object is smaller than the original one
+    assert new_bytes < old_bytes, (new_bytes, old_bytes)
+
+    uni = lattice_university(n_nodes)
+    pairs = random_pairs(uni.nodes, queries, seed=n_nodes)
+    new_results, new_time = timed(lambda: [dijkstra(uni, s, t) for s, t in pairs])
+
+    legacy = legacy_copy(uni)
+    legacy_pairs = [(legacy[s], legacy[t]) for s, t in pairs]
+    old_results, old_time = timed(lambda: [dijkstra(uni, s, t) for s, t in legacy_pairs])
+
+    for (_, d1), (_, d2) in zip(new_results, old_results):
+        assert math.isclose(d1, d2), (d1, d2)
+
+    print(f"nodes: {n_nodes}\n")
+    print(f"{'class':>8} {'bytes/node':>11} {'with names':>11} {'dijkstra ms':>12}")
+    print(f"{'legacy':>8} {old_bytes:11.1f} {old_named:11.1f} {old_time / queries * 1000:12.2f}")
+    print(f"{'slotted':>8} {new_bytes:11.1f} {new_named:11.1f} {new_time / queries * 1000:12.2f}")
+    print(f"\nDijkstra speedup: {old_time / new_time:.2f}x")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.nodes, args.queries)
@@ -0,0 +1,58 @@
+"""
+Benchmark of unreachable-pair rejection by the component index: time
+of a dijkstra query between two buildings that are not connected,
+against exploring the start component (what the query cost before).
+
+Usage (from the project directory):
+python -m benchmarks.bench_components [--sizes 10000 100000] [--queries 200]
+"""
+
+import argparse
+import random
+
+from aueb_pathfinding.classes import Classroom, University
+from aueb_pathfinding.ultils import dijkstra, shortest_path_tree
+from benchmarks.common import timed
+from benchmarks.generate_map import generate_rooms
+
+
+def run(sizes, queries, buildings):
+
+    print(f"{'nodes':>8} {'components':>11} {'index s':>8} {'rejected us':>12} {'explored ms':>12}")
+
+    for n in sizes:
+        # Buildings further apart than max_distance are islands
+        uni = University(max_distance=21.0, floor_weight=1.0)
+        for room in generate_rooms(n, buildings=buildings, gap=100, seed=n):
+            uni.add_node(Classroom(*room))
+        uni.build_edges(vectorized=True)
+
+        # Full rebuild of the index, for reference (build_edges keeps it up to date)
+        uni.components.dirty = True
+        _, index_time = timed(uni.component_index)
+
+        frozen = uni.freeze()
+        rng = random.Random(n)
+        pairs = []
+        while len(pairs) < queries:
+            start, target = rng.choice(frozen.nodes), rng.choice(frozen.nodes)
+            if not frozen.connected(start, target):
+                pairs.append((start, target))
+
+        _, rejected = timed(lambda: [dijkstra(frozen, start, target) for start, target in pairs])
+        sample = pairs[:10]
+        _, explored = timed(lambda: [shortest_path_tree(frozen, start) for start, _ in sample])
+
+        print(f"{n:>8} {len(uni.component_sizes()):>11} {index_time:8.2f} "
+              f"{rejected / queries * 1e6:12.1f} {explored / len(sample) * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--buildings", type=int, default=4)
+    args = parser.parse_args()
+
+    run(args.sizes, args.queries, args.buildings)
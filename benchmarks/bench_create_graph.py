@@ -0,0 +1,78 @@
+"""
+Benchmark of graph construction with the grid neighbour index
+(scalar and NumPy-vectorised) against the original all-pairs
+add_edge loop.
+
+Usage (from the project directory):
+python -m benchmarks.bench_create_graph [--sizes 1000 5000 20000 50000]
+"""
+
+import argparse
+
+from aueb_pathfinding.classes import University
+from benchmarks.common import random_classrooms, timed
+
+
+def brute_force(uni):
+    """
+    Original construction: add_edge on every pair of classrooms.
+    """
+
+    for i in range(len(uni.nodes)):
+        for j in range(i + 1, len(uni.nodes)):
+            uni.add_edge(uni.nodes[i], uni.nodes[j])
+
+
+def new_university(classrooms, max_distance, floor_weight):
+
+    uni = University(max_distance=max_distance, floor_weight=floor_weight)
+    for node in classrooms:
+        uni.add_node(node)
+    return uni
+
+
+def run(sizes, max_distance, floor_weight, brute_limit):
+
+    print(f"{'nodes':>8} {'edges':>9} {'grid s':>8} {'numpy s':>8} {'brute s':>9} {'speedup':>8}")
+
+    for n in sizes:
+        classrooms = random_classrooms(n, seed=n)
+
+        grid_uni = new_university(classrooms, max_distance, floor_weight)
+        _, grid_time = timed(grid_uni.build_edges)
+
+        bulk_uni = new_university(classrooms, max_distance, floor_weight)
+        _, bulk_time = timed(bulk_uni.build_edges, vectorized=True)
+
+        if n <= brute_limit:
+            brute_uni = new_university(classrooms, max_distance, floor_weight)
+            _, brute_time = timed(brute_force, brute_uni)
+        else:
+            brute_uni = None
+
+        n_edges = sum(len(t) for t in grid_uni.edges.values()) // 2
+        assert bulk_uni.edges == grid_uni.edges
+
+        if brute_uni is not None:
+            # The edge sets (and weights) must be identical
+            assert grid_uni.edges == brute_uni.edges
+            brute = f"{brute_time:9.2f}"
+            speedup = f"{brute_time / grid_time:7.1f}x"
+        else:
+            brute = f"{'skipped':>9}"
+            speedup = f"{'-':>8}"
+
+        print(f"{n:>8} {n_edges:>9} {grid_time:8.2f} {bulk_time:8.2f} {brute} {speedup}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000, 50_000])
+    parser.add_argument("--max-distance", type=float, default=21.0)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    parser.add_argument("--brute-limit", type=int, default=5_000,
+                        help="largest map on which the all-pairs baseline is run")
+    args = parser.parse_args()
+
+    run(args.sizes, args.max_distance, args.floor_weight, args.brute_limit)
@@ -0,0 +1,77 @@
+"""
+Benchmark of the frozen CSR graph (University.freeze) against the
+dict-of-dicts adjacency: memory per edge and query latency.
+
+Usage (from the project directory):
+python -m benchmarks.bench_csr [--nodes 100000]
+"""
+
+import argparse
+import math
+import tracemalloc
+
+from aueb_pathfinding.ultils import dijkstra
+from benchmarks.common import lattice_university, random_pairs, timed
+
+
+def traced(func):
+    """
+    Run a function and return (result, bytes still allocated by it).
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def copy_edges(edges):
+    """
+    Rebuild a dict adjacency with fresh weight objects, one per edge
+    (shared by both directions, as University._link stores them).
+    """
+
+    copy = {}
+    for a, targets in edges.items():
+        row = copy.setdefault(a, {})
+        for b, weight in targets.items():
+            if b in copy and a in copy[b]:
+                row[b] = copy[b][a]
+            else:
+                row[b] = weight + 0.0
+    return copy
+
+
+def run(n_nodes, queries):
+
+    # Dict form: measure only the edges, nodes are shared by both forms
+    uni = lattice_university(n_nodes)
+    uni.edges, dict_bytes = traced(lambda: copy_edges(uni.edges))
+
+    frozen, csr_bytes = traced(uni.freeze)
+    n_edges = len(frozen.indices) // 2
+
+    pairs = random_pairs(uni.nodes, queries, seed=n_nodes)
+    dict_results, dict_time = timed(lambda: [dijkstra(uni, s, t) for s, t in pairs])
+    csr_results, csr_time = timed(lambda: [dijkstra(frozen, s, t) for s, t in pairs])
+
+    for (_, d1), (_, d2) in zip(dict_results, csr_results):
+        assert math.isclose(d1, d2), (d1, d2)
+
+    print(f"nodes: {len(frozen.nodes)}, edges: {n_edges}\n")
+    print(f"{'form':>6} {'bytes/edge':>11} {'ms/query':>9}")
+    print(f"{'dict':>6} {dict_bytes / n_edges:11.1f} {dict_time / queries * 1000:9.2f}")
+    print(f"{'csr':>6} {csr_bytes / n_edges:11.1f} {csr_time / queries * 1000:9.2f}")
+    print("\n(csr bytes include the classroom -> id index)")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.nodes, args.queries)
@@ -0,0 +1,106 @@
+"""
+Benchmark of the heap-based Dijkstra against the original
+linear min-scan implementation.
+
+Usage (from the project directory):
+python -m benchmarks.bench_dijkstra [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import math
+
+from aueb_pathfinding.ultils import dijkstra
+from benchmarks.common import lattice_university, random_pairs, timed
+
+
+# ==============================================================
+#                   Original Implementation
+# ==============================================================
+
+def legacy_dijkstra(graph, start, target):
+    """
+    Original O(V^2) Dijkstra, kept here only as a baseline.
+    """
+
+    dist = {}
+    previous = {}
+    visited = {}
+
+    for node in graph.nodes:
+        dist[node] = math.inf
+        previous[node] = None
+        visited[node] = False
+
+    dist[start] = 0
+
+    while True:
+        u = min(
+            (node for node in graph.nodes if not visited[node]),
+            key=lambda node: dist[node],
+            default=None
+        )
+        if u is None or dist[u] == math.inf:
+            break
+        if u == target:
+            break
+        visited[u] = True
+        for v in graph.get_neighbors(u):
+            if not visited[v]:
+                alt = dist[u] + graph.edges[u][v]
+                if alt < dist[v]:
+                    dist[v] = alt
+                    previous[v] = u
+
+    if dist[target] == math.inf:
+        return [], math.inf
+
+    path = []
+    current = target
+    while current is not None:
+        path.insert(0, current)
+        current = previous[current]
+
+    return path, dist[target]
+
+
+# ==============================================================
+#                   Benchmark
+# ==============================================================
+
+def run(sizes, queries, legacy_limit):
+
+    print(f"{'nodes':>8} {'edges':>9} {'heap ms/q':>10} {'legacy ms/q':>12} {'speedup':>8}")
+
+    for n in sizes:
+        uni = lattice_university(n)
+        n_edges = sum(len(t) for t in uni.edges.values()) // 2
+        pairs = random_pairs(uni.nodes, queries, seed=n)
+
+        results, heap_time = timed(lambda: [dijkstra(uni, s, t) for s, t in pairs])
+
+        if n <= legacy_limit:
+            expected, legacy_time = timed(
+                lambda: [legacy_dijkstra(uni, s, t) for s, t in pairs]
+            )
+            # Both implementations must agree on the path costs
+            for (_, d1), (_, d2) in zip(results, expected):
+                assert math.isclose(d1, d2), (d1, d2)
+            legacy_ms = f"{legacy_time / queries * 1000:12.2f}"
+            speedup = f"{legacy_time / heap_time:7.1f}x"
+        else:
+            legacy_ms = f"{'skipped':>12}"
+            speedup = f"{'-':>8}"
+
+        print(f"{n:>8} {n_edges:>9} {heap_time / queries * 1000:10.2f} {legacy_ms} {speedup}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--legacy-limit", type=int, default=10_000,
+                        help="largest map on which the O(V^2) baseline is run")
+    args = parser.parse_args()
+
+    run(args.sizes, args.queries, args.legacy_limit)
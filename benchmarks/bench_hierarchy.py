@@ -0,0 +1,91 @@
+"""
+Benchmark of contraction-hierarchy queries against heap Dijkstra
+(preprocessing time, settled nodes and time per query) on lattice and
+random maps, checking that both return the same costs on random pairs
+and that the hierarchy settles fewer classrooms in less time.
+
+Usage (from the project directory):
+python -m benchmarks.bench_hierarchy [--lattice 1000 2000] [--random 500 1000] [--queries 500]
+"""
+
+import argparse
+import math
+
+from aueb_pathfinding.classes import University
+from aueb_pathfinding.hierarchy import build_hierarchy
+from aueb_pathfinding.ultils import dijkstra
+from benchmarks.common import lattice_university, random_classrooms, random_pairs, timed
+
+
+def random_university(n, density):
+    """ University of n random classrooms (see random_classrooms) """
+    uni = University()
+    for node in random_classrooms(n, density=density, seed=n):
+        uni.add_node(node)
+    uni.build_edges()
+    return uni
+
+
+def compare(kind, frozen, queries):
+
+    n = len(frozen.nodes)
+    hierarchy, build_time = timed(build_hierarchy, frozen)
+    shortcuts = sum(1 for middle in hierarchy.middles if middle >= 0)
+
+    totals = {"dijkstra": [0, 0.0], "ch": [0, 0.0]}
+    exact = 0
+
+    for start, target in random_pairs(frozen.nodes, queries, seed=n):
+        stats = {}
+        (_, d_cost), elapsed = timed(dijkstra, frozen, start, target, stats)
+        totals["dijkstra"][0] += stats["expanded"]
+        totals["dijkstra"][1] += elapsed
+
+        stats = {}
+        (_, c_cost), elapsed = timed(hierarchy.shortest_path, start, target, stats)
+        totals["ch"][0] += stats["expanded"]
+        totals["ch"][1] += elapsed
+
+        # Same cost; equal-cost routes may only differ in float summation order
+        assert d_cost == c_cost or math.isclose(d_cost, c_cost, rel_tol=1e-12), (d_cost, c_cost)
+        exact += d_cost == c_cost
+
+    d_set, d_time = totals["dijkstra"]
+    c_set, c_time = totals["ch"]
+
+    # Speed check: the hierarchy settles fewer classrooms and answers faster
+    assert c_set < d_set, (kind, n, c_set, d_set)
+    assert c_time < d_time, (kind, n, c_time, d_time)
+
+    print(
+        f"{kind:>8} {n:>7} {build_time:8.1f} {shortcuts:>10} {d_set / queries:13.0f} {c_set / queries:7.0f} "
+        f"{d_time / queries * 1000:12.2f} {c_time / queries * 1000:7.2f} {d_time / c_time:7.1f}x "
+        f"{exact:>3}/{queries:<3}"
+    )
+
+
+def run(lattice_sizes, random_sizes, queries, density):
+
+    print(f"{'map':>8} {'nodes':>7} {'build s':>8} {'shortcuts':>10} {'dijkstra set':>13} {'ch set':>7} "
+          f"{'dijkstra ms':>12} {'ch ms':>7} {'speedup':>8} {'exact':>7}")
+
+    for n in lattice_sizes:
+        compare("lattice", lattice_university(n).freeze(), queries)
+
+    for n in random_sizes:
+        compare("random", random_university(n, density).freeze(), queries)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lattice", type=int, nargs="*", default=[1_000, 2_000],
+                        help="sizes of the lattice maps")
+    parser.add_argument("--random", type=int, nargs="*", default=[500, 1_000],
+                        help="sizes of the random maps")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--density", type=float, default=0.01,
+                        help="classrooms per unit area and floor of the random maps")
+    args = parser.parse_args()
+
+    run(args.lattice, args.random, args.queries, args.density)
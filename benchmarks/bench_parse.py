@@ -0,0 +1,76 @@
+"""
+Parse-throughput benchmark (lines per second) of the streaming map
+parser against the original regex-per-field load_map.
+
+Usage (from the project directory):
+python -m benchmarks.bench_parse [--lines 1000000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+
+from aueb_pathfinding.ultils import clean_values, iter_map
+from benchmarks.common import timed
+
+
+def legacy_load_map(txt_file):
+    """
+    Original load_map, kept here only as a baseline.
+    """
+
+    uni_map = {"classroom": [], "x": [], "y": [], "floor": []}
+
+    with open(txt_file, "r") as file:
+        for row in file:
+            parts = [clean_values(v, r"[@#!$\*]") for v in row.strip().split(";")]
+            uni_map["classroom"].append(parts[0])
+            uni_map["x"].append(parts[1])
+            uni_map["y"].append(parts[2])
+            uni_map["floor"].append(parts[3])
+
+    return uni_map
+
+
+def write_map(path, n_lines, seed=0):
+    """
+    Write a map file with random rooms and aueb_map.txt-like noise.
+    """
+
+    rng = random.Random(seed)
+    noise = "@#!$*"
+
+    def field(value):
+        return f"{value}{rng.choice(noise) if rng.random() < 0.5 else ''}"
+
+    with open(path, "w") as file:
+        for k in range(n_lines):
+            values = (f"R{k}", rng.randint(0, 10_000), rng.randint(0, 10_000), rng.randint(-2, 9))
+            file.write("; ".join(field(v) for v in values) + "\n")
+
+
+def run(n_lines):
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "map.txt")
+        write_map(path, n_lines)
+
+        legacy, legacy_time = timed(legacy_load_map, path)
+        records, stream_time = timed(lambda: list(iter_map(path)))
+
+    assert records == list(zip(*legacy.values()))
+
+    print(f"lines: {n_lines}\n")
+    print(f"{'parser':>10} {'seconds':>8} {'lines/s':>10}")
+    print(f"{'legacy':>10} {legacy_time:8.2f} {n_lines / legacy_time:10.0f}")
+    print(f"{'streaming':>10} {stream_time:8.2f} {n_lines / stream_time:10.0f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    run(args.lines)
@@ -0,0 +1,53 @@
+"""
+Benchmark of budget-bounded reachability (isochrone) queries: one
+dijkstra call per target, one reachable_within search per source, and
+the vectorised reachable_many over all sources at once.
+
+Usage (from the project directory):
+python -m benchmarks.bench_reachable [--sizes 10000 100000] [--sources 50] [--budget 60]
+"""
+
+import argparse
+import random
+
+from aueb_pathfinding.bulk import reachable_many
+from aueb_pathfinding.ultils import dijkstra, reachable_within
+from benchmarks.common import lattice_university, timed
+
+
+def run(sizes, n_sources, budget, sample):
+
+    print(f"{'nodes':>8} {'reached':>8} {'per target ms':>14} {'reachable ms':>13} {'bulk ms':>8}")
+
+    for n in sizes:
+        uni = lattice_university(n)
+        frozen = uni.freeze()
+        rng = random.Random(n)
+        starts = rng.sample(frozen.nodes, n_sources)
+
+        # One bounded search per source
+        single, single_time = timed(lambda: [reachable_within(frozen, start, budget) for start in starts])
+        reached = sum(len(rooms) for rooms in single) / n_sources
+
+        # One dijkstra per target, extrapolated from a sample of targets
+        targets = rng.sample(frozen.nodes, sample)
+        _, sample_time = timed(lambda: [dijkstra(frozen, starts[0], target) for target in targets])
+        per_target = sample_time / sample * n
+
+        many, many_time = timed(reachable_many, frozen, starts, budget)
+        assert [len(ids) for ids, _ in many] == [len(rooms) for rooms in single]
+
+        print(f"{n:>8} {reached:8.0f} {per_target * 1000:14.0f} {single_time / n_sources * 1000:13.2f} "
+              f"{many_time / n_sources * 1000:8.2f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--sources", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=60.0)
+    parser.add_argument("--sample", type=int, default=20, help="targets timed for the per-target baseline")
+    args = parser.parse_args()
+
+    run(args.sizes, args.sources, args.budget, args.sample)
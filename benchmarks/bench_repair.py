@@ -0,0 +1,105 @@
+"""
+Benchmark of edge closures: repairing the cached shortest-path trees
+(University.disable_edge / enable_edge) against recomputing them from
+scratch, checking that both give the same distances. Corridor weights
+are then raised and lowered again, checking that A* still finds the
+same costs as Dijkstra and that no corridor gets shorter than its
+distance.
+
+Usage (from the project directory):
+python -m benchmarks.bench_repair [--sizes 2000 10000 50000] [--trees 8] [--changes 50]
+"""
+
+import argparse
+import math
+import random
+import time
+
+from aueb_pathfinding.ultils import astar, dijkstra, distance, shortest_path_tree
+from benchmarks.common import lattice_university
+
+
+def check_weights(uni, rng, changes, queries=20):
+
+    """
+    Raise the weights of random corridors, lower half of them again (to
+    their distance, the lowest weight allowed) and compare A* with
+    Dijkstra on the graph and on a frozen copy.
+    """
+
+    nodes = uni.nodes
+    edited = []
+    for _ in range(changes):
+        node = rng.choice(nodes)
+        neighbour = rng.choice(list(uni.edges[node]))
+        uni.set_edge_weight(node, neighbour, uni.edges[node][neighbour] * rng.uniform(1, 5))
+        edited.append((node, neighbour))
+
+    for node, neighbour in edited[::2]:
+        shortest = round(distance(node, neighbour, uni.floor_weight), 2)
+        uni.set_edge_weight(node, neighbour, shortest)
+
+        # Shorter than the straight line would break the A* heuristic
+        try:
+            uni.set_edge_weight(node, neighbour, shortest / 2)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("corridor made shorter than its distance")
+
+    frozen = uni.freeze()
+    for graph in (uni, frozen):
+        for _ in range(queries):
+            start, target = rng.sample(nodes, 2)
+            _, expected = dijkstra(graph, start, target)
+            _, found = astar(graph, start, target)
+            assert math.isclose(found, expected), (found, expected)
+
+
+def run(sizes, trees, changes):
+
+    print(f"{'nodes':>8} {'trees':>6} {'repair ms':>10} {'recompute ms':>13} {'speedup':>8}")
+
+    for n in sizes:
+        uni = lattice_university(n)
+        rng = random.Random(n)
+        nodes = uni.nodes
+
+        for source in rng.sample(nodes, trees):
+            uni.shortest_path(source, nodes[0])
+
+        repair = recompute = 0.0
+        for _ in range(changes):
+            node = rng.choice(nodes)
+            neighbour = rng.choice(list(uni.edges[node]))
+
+            # Close, then reopen, one corridor: two repairs of every tree
+            for change in (uni.disable_edge, uni.enable_edge):
+                start = time.perf_counter()
+                change(node, neighbour)
+                repair += time.perf_counter() - start
+
+                start = time.perf_counter()
+                fresh = {source: shortest_path_tree(uni, source)[0] for source in uni.route_cache.trees}
+                recompute += time.perf_counter() - start
+
+            for source, (dist, _) in uni.route_cache.trees.items():
+                assert fresh[source].keys() == dist.keys()
+                assert all(math.isclose(fresh[source][key], dist[key]) for key in dist)
+
+        check_weights(uni, rng, changes)
+
+        steps = 2 * changes
+        print(f"{n:>8} {trees:>6} {repair / steps * 1000:10.3f} {recompute / steps * 1000:13.3f} "
+              f"{recompute / repair:8.1f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 10_000, 50_000])
+    parser.add_argument("--trees", type=int, default=8, help="cached trees repaired on every change")
+    parser.add_argument("--changes", type=int, default=50, help="corridors closed and reopened")
+    args = parser.parse_args()
+
+    run(args.sizes, args.trees, args.changes)
@@ -0,0 +1,86 @@
+"""
+Cold-start benchmark: text map (parse, build edges, freeze) against
+loading a binary graph snapshot, each in a fresh interpreter. The
+snapshot start includes a first connected() query, answered from the
+stored component labels.
+
+Usage (from the project directory):
+python -m benchmarks.bench_snapshot [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from aueb_pathfinding.classes import component_labels
+from aueb_pathfinding.snapshot import load_snapshot
+from benchmarks.common import lattice_university
+
+
+TEXT_START = """
+from aueb_pathfinding.menu import load_university
+graph = load_university({path!r}, 21.0, 1.5).freeze()
+"""
+
+SNAPSHOT_START = """
+from aueb_pathfinding.snapshot import load_snapshot
+graph = load_snapshot({path!r})
+graph.connected(graph.nodes[0], graph.nodes[len(graph.nodes) // 2])
+"""
+
+
+def cold_start(code):
+    """
+    Wall time of a fresh interpreter running code.
+    """
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def run(sizes):
+
+    baseline = cold_start("import aueb_pathfinding")
+
+    print(f"(interpreter start-up: {baseline:.2f} s)\n")
+    print(f"{'nodes':>8} {'text s':>8} {'snapshot s':>11} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            map_file = os.path.join(tmp, f"map_{n}.txt")
+            snap_file = map_file + ".snap"
+
+            with open(map_file, "w") as file:
+                for node in lattice_university(n).nodes:
+                    file.write(f"{node.name}; {node.x}; {node.y}; {node.floor}\n")
+
+            # Build the snapshot once (not timed)
+            subprocess.run(
+                [sys.executable, "-c",
+                 f"from aueb_pathfinding.snapshot import load_or_build\n"
+                 f"load_or_build({map_file!r}, 21.0, 1.5, path={snap_file!r})"],
+                check=True,
+            )
+
+            # Stored labels must match a fresh walk of the graph
+            graph = load_snapshot(snap_file)
+            assert list(graph.components) == list(component_labels(graph.indptr, graph.indices))
+            del graph
+
+            text_time = cold_start(TEXT_START.format(path=map_file))
+            snap_time = cold_start(SNAPSHOT_START.format(path=snap_file))
+
+            print(f"{n:>8} {text_time:8.2f} {snap_time:11.2f} {text_time / snap_time:7.1f}x")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    run(args.sizes)
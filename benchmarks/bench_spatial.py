@@ -0,0 +1,84 @@
+"""
+Benchmark of nearest-classroom lookups from arbitrary positions:
+spatial index build time and nearest / k-nearest lookups per second,
+against a linear scan with ultils.distance on a sample of positions.
+On the same sample, University.nearest_classroom must skip classrooms
+closed with disable_node.
+
+Usage (from the project directory):
+python -m benchmarks.bench_spatial [--sizes 10000 100000 1000000] [--lookups 20000]
+"""
+
+import argparse
+import random
+from types import SimpleNamespace
+
+from aueb_pathfinding.classes import Classroom, University
+from aueb_pathfinding.spatial import SpatialIndex
+from aueb_pathfinding.ultils import distance
+from benchmarks.common import timed
+from benchmarks.generate_map import generate_rooms
+
+
+def check_closed(nodes, positions, floor_weight):
+    """
+    Closing the nearest classroom hands the lookup to the next one,
+    reopening it brings it back.
+    """
+
+    uni = University(nodes=nodes, floor_weight=floor_weight)
+    for x, y, floor in positions:
+        nearest, _ = uni.nearest_classroom(x, y, floor)
+        second = uni.spatial_index().k_nearest(x, y, floor, k=2)[1]
+
+        uni.disable_node(nearest)
+        assert uni.nearest_classroom(x, y, floor) == second
+        uni.enable_node(nearest)
+        assert uni.nearest_classroom(x, y, floor)[0] == nearest
+
+
+def run(sizes, lookups, k, floor_weight, scan):
+
+    print(f"{'nodes':>8} {'build s':>8} {'nearest/s':>10} {f'{k}-nearest/s':>12} {'scan/s':>8}")
+
+    for n in sizes:
+        nodes = [Classroom(*room) for room in generate_rooms(n, seed=n)]
+        index, build_time = timed(SpatialIndex, nodes, floor_weight)
+
+        # Positions anywhere on (and around) the campus, on any floor
+        rng = random.Random(n)
+        width = max(node.x for node in nodes) + 20
+        height = max(node.y for node in nodes) + 20
+        positions = [
+            (rng.uniform(-20, width), rng.uniform(-20, height), rng.randrange(5))
+            for _ in range(lookups)
+        ]
+
+        _, nearest_time = timed(lambda: [index.nearest(*position) for position in positions])
+        _, k_time = timed(lambda: [index.k_nearest(*position, k) for position in positions])
+
+        # Linear scan on a few positions, checking the index on the way
+        def linear():
+            for x, y, floor in positions[:scan]:
+                here = SimpleNamespace(x=x, y=y, floor=floor)
+                best = min(distance(here, node, floor_weight) for node in nodes)
+                assert abs(best - index.nearest(x, y, floor)[1]) < 1e-9
+
+        _, scan_time = timed(linear)
+        check_closed(nodes, positions[:scan], floor_weight)
+
+        print(f"{n:>8} {build_time:8.2f} {lookups / nearest_time:10.0f} {lookups / k_time:12.0f} "
+              f"{scan / scan_time:8.1f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    parser.add_argument("--scan", type=int, default=5, help="positions also answered by a linear scan")
+    args = parser.parse_args()
+
+    run(args.sizes, args.lookups, args.k, args.floor_weight, args.scan)
@@ -0,0 +1,85 @@
+"""
+Start-up benchmark based on python -X importtime.
+
+Imports the modules used by main.py and the routing modules in a fresh
+interpreter, reports their cumulative import time and fails if any of
+the heavy optional libraries (visualisation, NumPy) is pulled in, so
+the lazy imports cannot silently regress.
+
+Usage (from the project directory):
+python -m benchmarks.bench_startup [--repeat 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+# Imported at start-up by main.py and the routing entry points
+MODULES = [
+    "aueb_pathfinding.menu",
+    "aueb_pathfinding.ultils",
+    "aueb_pathfinding.classes",
+    "aueb_pathfinding.batch",
+    "aueb_pathfinding.snapshot",
+]
+
+# Must only be imported on demand
+HEAVY = ("networkx", "matplotlib", "numpy")
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    :Returns: dict
+        Cumulative import time (microseconds) of every imported module.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def run(repeat):
+
+    failures = []
+    print(f"{'module':>26} {'median ms':>10} {'modules':>8}")
+
+    for module in MODULES:
+        samples = []
+        for _ in range(repeat):
+            times = import_times(module)
+            samples.append(times[module] / 1000)
+
+        heavy = sorted(name for name in times if name.split(".")[0] in HEAVY)
+        if heavy:
+            failures.append((module, heavy))
+
+        print(f"{module:>26} {statistics.median(samples):10.1f} {len(times):8}")
+
+    for module, heavy in failures:
+        print(f"\n{module} imports heavy libraries: {', '.join(heavy[:5])}")
+
+    return not failures
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.repeat) else 1)
@@ -0,0 +1,59 @@
+"""
+Benchmark of multi-stop tour planning against the number of stops:
+time of the pairwise costs, exact Held-Karp order (small sets) and the
+nearest neighbour + 2-opt / Or-opt heuristic, with the tour costs of
+nearest neighbour alone, the heuristic and the exact order.
+
+Usage (from the project directory):
+python -m benchmarks.bench_tour [--nodes 20000] [--stops 5 10 15 20 50 100 200] [--budget 1]
+"""
+
+import argparse
+import random
+
+from aueb_pathfinding.tour import (
+    EXACT_LIMIT, held_karp, improve_order, nearest_neighbour, stop_costs, tour_cost,
+)
+from benchmarks.common import lattice_university, timed
+
+
+def run(n_nodes, stop_counts, budget, closed):
+
+    graph = lattice_university(n_nodes).freeze()
+    rng = random.Random(n_nodes)
+
+    print(f"{'stops':>6} {'costs s':>8} {'exact s':>8} {'heur s':>7} "
+          f"{'nn cost':>9} {'heur cost':>10} {'exact cost':>11} {'gap %':>6}")
+
+    for n in stop_counts:
+        stops = rng.sample(graph.nodes, n)
+        (costs, _), costs_time = timed(stop_costs, graph, stops)
+
+        nn_cost = tour_cost(nearest_neighbour(costs) + ([0] if closed else []), costs)
+        heuristic, heuristic_time = timed(improve_order, costs, closed, budget)
+        heuristic_cost = tour_cost(heuristic, costs, closed)
+
+        exact_time = exact_cost = gap = None
+        if n <= EXACT_LIMIT:
+            exact, exact_time = timed(held_karp, costs, closed)
+            exact_cost = tour_cost(exact, costs, closed)
+            gap = (heuristic_cost / exact_cost - 1) * 100 if exact_cost else 0.0
+
+        print(f"{n:>6} {costs_time:8.2f} {fmt(exact_time, 8, 2)} {heuristic_time:7.2f} "
+              f"{nn_cost:9.0f} {heuristic_cost:10.0f} {fmt(exact_cost, 11, 0)} {fmt(gap, 6, 2)}")
+
+
+def fmt(value, width, digits):
+    return f"{'-':>{width}}" if value is None else f"{value:{width}.{digits}f}"
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--stops", type=int, nargs="+", default=[5, 10, 15, 20, 50, 100, 200])
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds given to the heuristic")
+    parser.add_argument("--closed", action="store_true", help="return to the first stop")
+    args = parser.parse_args()
+
+    run(args.nodes, args.stops, args.budget, args.closed)
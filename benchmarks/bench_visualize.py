@@ -0,0 +1,57 @@
+"""
+Benchmark of the graph visualisation on generated campus maps, under
+the headless Agg backend: overview, one panel per floor, and overview
+with a highlighted shortest path (figure built and rendered).
+
+Usage (from the project directory):
+python -m benchmarks.bench_visualize [--sizes 10000 100000] [--vectorized]
+"""
+
+import argparse
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from aueb_pathfinding.classes import Classroom, University
+from aueb_pathfinding.visualize import draw_university
+from benchmarks.common import random_pairs, timed
+from benchmarks.generate_map import generate_rooms
+
+
+def render(uni, **options):
+    fig = draw_university(uni, **options)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def run(sizes, vectorized):
+
+    print(f"{'nodes':>8} {'edges':>9} {'overview s':>11} {'by floor s':>11} {'path s':>8}")
+
+    for n in sizes:
+        uni = University(max_distance=21.0, floor_weight=1.0)
+        for room in generate_rooms(n, seed=n):
+            uni.add_node(Classroom(*room))
+        uni.build_edges(vectorized=vectorized)
+        n_edges = sum(len(targets) for targets in uni.edges.values()) // 2
+
+        # Longest of a few random routes, to highlight
+        routes = (uni.shortest_path(start, target) for start, target in random_pairs(uni.nodes, 5, seed=n))
+        path = max(routes, key=lambda route: len(route[0]))[0]
+
+        _, overview = timed(render, uni)
+        _, by_floor = timed(render, uni, by_floor=True)
+        _, with_path = timed(render, uni, path=path)
+
+        print(f"{len(uni.nodes):>8} {n_edges:>9} {overview:11.2f} {by_floor:11.2f} {with_path:8.2f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--vectorized", action="store_true", help="build the edges with NumPy")
+    args = parser.parse_args()
+
+    run(args.sizes, args.vectorized)
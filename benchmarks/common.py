@@ -0,0 +1,132 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Builds synthetic campus graphs far larger than aueb_map.txt so that
+the algorithms can be measured at scale.
+"""
+
+import collections
+import math
+import random
+import time
+
+from aueb_pathfinding.classes import Classroom, University
+
+
+# ==============================================================
+#                   Synthetic Maps
+# ==============================================================
+
+def lattice_university(n_nodes, floors=4, spacing=10, seed=0,
+                       max_distance=21.0, floor_weight=1.5):
+    """
+    Build a synthetic University laid out as a jittered lattice.
+
+    Classrooms sit on a square grid on every floor, and edges are only
+    added between lattice neighbours (same floor) and between the same
+    lattice position on adjacent floors, so building the graph is linear.
+
+    :param n_nodes: int
+        Approximate number of classrooms.
+    :param floors: int
+        Number of floors.
+    :param spacing: int
+        Distance between lattice points.
+    :param seed: int
+        Random seed for the coordinate jitter.
+
+    :Returns: University
+        Synthetic university graph.
+    """
+
+    rng = random.Random(seed)
+    side = max(1, math.ceil(math.sqrt(n_nodes / floors)))
+    jitter = spacing // 4
+
+    uni = University(max_distance=max_distance, floor_weight=floor_weight)
+    grid = {}
+
+    # Nodes
+    for floor in range(floors):
+        for i in range(side):
+            for j in range(side):
+                if len(uni.nodes) >= n_nodes:
+                    break
+                node = Classroom(
+                    name=f"R{floor}_{i}_{j}",
+                    x=i * spacing + rng.randint(0, jitter),
+                    y=j * spacing + rng.randint(0, jitter),
+                    floor=floor,
+                )
+                uni.add_node(node)
+                grid[(floor, i, j)] = node
+
+    # Edges between lattice neighbours only
+    offsets = [(0, 1, 0), (0, 0, 1), (0, 1, 1), (0, 1, -1), (1, 0, 0)]
+    for (floor, i, j), node in grid.items():
+        for df, di, dj in offsets:
+            other = grid.get((floor + df, i + di, j + dj))
+            if other is not None:
+                uni.add_edge(node, other)
+
+    return uni
+
+
+def random_classrooms(n_nodes, floors=4, density=0.01, seed=0):
+    """
+    Scatter classrooms uniformly over a square campus.
+
+    The campus side grows with the number of classrooms so that the
+    number of rooms per unit area (density, per floor) stays constant.
+
+    :Returns: list[Classroom]
+        Randomly placed classrooms.
+    """
+
+    rng = random.Random(seed)
+    side = max(1, int(math.sqrt(n_nodes / floors / density)))
+
+    return [
+        Classroom(
+            name=f"R{k}",
+            x=rng.randint(0, side),
+            y=rng.randint(0, side),
+            floor=rng.randrange(floors),
+        )
+        for k in range(n_nodes)
+    ]
+
+
+def largest_component(uni):
+    """
+    Classrooms of the largest connected component of a University, in
+    node order (query pairs drawn from it are all reachable).
+    """
+
+    index = uni.component_index()
+    roots = [index.find(node) for node in uni.nodes]
+    largest = collections.Counter(roots).most_common(1)[0][0] if roots else None
+    return [node for node, root in zip(uni.nodes, roots) if root == largest]
+
+
+def random_pairs(nodes, n_pairs, seed=0):
+    """
+    Draw random (start, target) pairs from a list of classrooms.
+    """
+
+    rng = random.Random(seed)
+    return [(rng.choice(nodes), rng.choice(nodes)) for _ in range(n_pairs)]
+
+
+# ==============================================================
+#                   Timing
+# ==============================================================
+
+def timed(func, *args, **kwargs):
+    """
+    Run a function once and return (result, elapsed seconds).
+    """
+
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,147 @@
+"""
+Synthetic campus map generator.
+
+Writes map files in the aueb_map.txt format (name; x; y; floor),
+including the @#!$* noise removed by clean_values, so that the whole
+pipeline (load, build, query, visualise) can be run on large campuses.
+
+Rooms are grouped in buildings laid out on a square grid of sites,
+each building spreading its rooms uniformly over its own footprint
+on every floor.
+
+Usage (from the project directory):
+python -m benchmarks.generate_map big_map.txt [--rooms 100000] [--buildings 16] [--floors 5]
+"""
+
+import argparse
+import math
+import random
+import string
+
+
+# ==============================================================
+#                   Synthetic Campus
+# ==============================================================
+
+def building_label(k):
+    """
+    Spreadsheet-like building labels: A, B, ..., Z, AA, AB, ...
+    """
+
+    label = ""
+    k += 1
+    while k:
+        k, rest = divmod(k - 1, 26)
+        label = string.ascii_uppercase[rest] + label
+    return label
+
+
+def generate_rooms(n_rooms, buildings=4, floors=5, density=0.01, gap=50, seed=0):
+
+    """
+    Generate the classrooms of a synthetic campus.
+
+    :param n_rooms: int
+        Total number of classrooms.
+    :param buildings: int
+        Number of buildings (clusters of classrooms).
+    :param floors: int
+        Number of floors of every building (0 to floors - 1).
+    :param density: float
+        Classrooms per unit area on one floor of a building.
+    :param gap: int
+        Free space between two neighbouring buildings.
+    :param seed: int
+        Random seed, the same arguments always give the same campus.
+
+    :Returns: list[tuple]
+        (name, x, y, floor) of every classroom, names are unique.
+    """
+
+    rng = random.Random(seed)
+    buildings = max(1, min(buildings, n_rooms))
+
+    # Square footprint holding a building's rooms at the given density
+    per_floor = math.ceil(n_rooms / buildings / floors)
+    side = max(1, math.ceil(math.sqrt(per_floor / density)))
+
+    # Buildings on a square grid of sites
+    columns = math.ceil(math.sqrt(buildings))
+    pitch = side + gap
+
+    rooms = []
+    for b in range(buildings):
+
+        label = building_label(b)
+        x0, y0 = (b % columns) * pitch, (b // columns) * pitch
+
+        # Spread the rooms evenly between the buildings
+        count = n_rooms // buildings + (b < n_rooms % buildings)
+
+        for k in range(count):
+            floor = k % floors
+            rooms.append((
+                f"{label}{floor}_{k // floors}",
+                x0 + rng.randint(0, side),
+                y0 + rng.randint(0, side),
+                floor,
+            ))
+
+    return rooms
+
+
+# ==============================================================
+#                   Map File
+# ==============================================================
+
+def write_map(path, rooms, noise=0.5, seed=0):
+
+    """
+    Write classrooms to a map file with aueb_map.txt-like noise.
+
+    :param path: str
+        Output map file.
+    :param rooms: iterable
+        (name, x, y, floor) records.
+    :param noise: float
+        Probability of each field carrying one of the @#!$* symbols.
+    :param seed: int
+        Random seed of the noise.
+
+    :Returns: int
+        Number of lines written.
+    """
+
+    rng = random.Random(seed)
+    symbols = "@#!$*"
+
+    def field(value):
+        return f"{value}{rng.choice(symbols) if rng.random() < noise else ''}"
+
+    n_lines = 0
+    with open(path, "w") as file:
+        for room in rooms:
+            file.write("; ".join(field(v) for v in room) + "\n")
+            n_lines += 1
+
+    return n_lines
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="map file to write")
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--buildings", type=int, default=16)
+    parser.add_argument("--floors", type=int, default=5)
+    parser.add_argument("--density", type=float, default=0.01,
+                        help="classrooms per unit area on one floor of a building")
+    parser.add_argument("--gap", type=int, default=50, help="space between buildings")
+    parser.add_argument("--noise", type=float, default=0.5,
+                        help="probability of a field carrying a @#!$* symbol")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rooms = generate_rooms(args.rooms, args.buildings, args.floors, args.density, args.gap, args.seed)
+    n_lines = write_map(args.output, rooms, args.noise, args.seed)
+    print(f"{n_lines} classrooms written to {args.output}")
@@ -0,0 +1,261 @@
+"""
+Reproducible scaling benchmark of the whole pipeline.
+
+For every map size a synthetic campus is generated (generate_map.py)
+and the following stages are timed:
+
+- load:      parse the map file into a University
+- build:     build the edges (create_graph)
+- single:    one dijkstra query (median over --single queries)
+- batch:     many queries through batch_routes
+
+Buildings are --gap apart, by default less than max_distance, so the
+campus is one connected graph. Query pairs are drawn from its largest
+connected component all the same: pairs on different islands would
+only time the O(1) component check.
+- visualize: draw the graph (headless Agg backend, up to --visualize-max rooms)
+
+Results are written as JSON (with the commit and the parameters) so
+that two runs can be compared with --compare.
+
+Usage (from the project directory):
+python -m benchmarks.suite [--sizes 1000 10000 100000 1000000] [--output results.json]
+python -m benchmarks.suite --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from aueb_pathfinding.batch import batch_routes
+from aueb_pathfinding.menu import load_university
+from aueb_pathfinding.ultils import dijkstra
+from benchmarks.common import largest_component, random_pairs, timed
+from benchmarks.generate_map import generate_rooms, write_map
+
+
+STAGES = ["load", "build", "single_ms", "batch_qps", "visualize"]
+
+
+def git_commit():
+    """
+    Short hash of the checked-out commit (None outside a git tree).
+    """
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ==============================================================
+#                   Stages
+# ==============================================================
+
+def bench_size(path, n_rooms, params):
+
+    """
+    Time every stage on one generated map.
+
+    :Returns: dict
+        Map size and stage timings (None for skipped stages).
+    """
+
+    uni, load_time = timed(
+        load_university, path, params["max_distance"], params["floor_weight"], edges=False
+    )
+    _, build_time = timed(uni.build_edges, vectorized=params["vectorized"])
+    n_edges = sum(len(targets) for targets in uni.edges.values()) // 2
+
+    # Reachable query pairs only
+    reachable = largest_component(uni)
+
+    # Single queries on the mutable University
+    single = []
+    for start, target in random_pairs(reachable, params["single"], seed=n_rooms):
+        start_time = time.perf_counter()
+        dijkstra(uni, start, target)
+        single.append(time.perf_counter() - start_time)
+
+    # Batch queries on the frozen graph
+    pairs = [
+        (start.name, target.name)
+        for start, target in random_pairs(reachable, params["queries"], seed=n_rooms + 1)
+    ]
+    _, batch_time = timed(batch_routes, uni.freeze(), pairs, workers=params["workers"])
+
+    visualize_time, visualize_error = None, None
+    if n_rooms <= params["visualize_max"]:
+        try:
+            visualize_time = bench_visualize(uni)
+        except Exception as error:
+            # A drawing failure is a result too, the other stages still count
+            visualize_error = f"{type(error).__name__}: {error}"
+
+    return {
+        "nodes": len(uni.nodes),
+        "edges": n_edges,
+        "query_nodes": len(reachable),
+        "load": load_time,
+        "build": build_time,
+        "single_ms": statistics.median(single) * 1000 if single else None,
+        "batch_qps": len(pairs) / batch_time if pairs else None,
+        "visualize": visualize_time,
+        "visualize_error": visualize_error,
+    }
+
+
+def bench_visualize(uni):
+    """
+    Time the menu visualisation of a University (Agg backend).
+    """
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from aueb_pathfinding.menu import visualize_graph
+
+    def draw():
+        fig = visualize_graph(uni)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    return timed(draw)[1]
+
+
+def run(sizes, params):
+
+    results = []
+
+    print(f"{'nodes':>8} {'edges':>9} {'load s':>8} {'build s':>8} "
+          f"{'query ms':>9} {'batch q/s':>10} {'draw s':>8}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rooms in sizes:
+
+            # The same campus for the same size and seed
+            path = os.path.join(tmp, f"map_{n_rooms}.txt")
+            rooms = generate_rooms(
+                n_rooms, params["buildings"], params["floors"], params["density"],
+                gap=params["gap"], seed=params["seed"],
+            )
+            write_map(path, rooms, seed=params["seed"])
+            del rooms
+
+            row = bench_size(path, n_rooms, params)
+            os.remove(path)
+
+            results.append(row)
+            print(f"{row['nodes']:>8} {row['edges']:>9} {row['load']:8.2f} {row['build']:8.2f} "
+                  f"{fmt(row['single_ms'], 9, 3)} {fmt(row['batch_qps'], 10, 0)} "
+                  f"{fmt(row['visualize'], 8, 2)}", file=sys.stderr)
+            if row["visualize_error"]:
+                print(f"{'':>8} visualize failed: {row['visualize_error']}", file=sys.stderr)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": params,
+        "results": results,
+    }
+
+
+# ==============================================================
+#                   Comparison
+# ==============================================================
+
+def fmt(value, width, digits):
+    return f"{'-':>{width}}" if value is None else f"{value:{width}.{digits}f}"
+
+
+def compare(before, after):
+
+    """
+    Print the stage timings of two result files side by side.
+
+    Ratios are after / before, so below 1 is faster for the times
+    and above 1 is faster for batch_qps.
+    """
+
+    print(f"before: {before['commit']} ({before['date']})")
+    print(f"after:  {after['commit']} ({after['date']})")
+    if before["params"] != after["params"]:
+        print("warning: the two runs used different parameters")
+
+    old_rows = {row["nodes"]: row for row in before["results"]}
+
+    print(f"\n{'nodes':>8} {'stage':>10} {'before':>10} {'after':>10} {'ratio':>7}")
+    for row in after["results"]:
+        old = old_rows.get(row["nodes"])
+        if old is None:
+            continue
+        for stage in STAGES:
+            if old[stage] is None or row[stage] is None:
+                continue
+            ratio = row[stage] / old[stage] if old[stage] else float("inf")
+            print(f"{row['nodes']:>8} {stage:>10} {old[stage]:10.3f} {row[stage]:10.3f} {ratio:7.2f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--buildings", type=int, default=16)
+    parser.add_argument("--floors", type=int, default=5)
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--gap", type=int, default=15,
+                        help="space between buildings (below max_distance: one connected campus)")
+    parser.add_argument("--max-distance", type=float, default=21.0)
+    parser.add_argument("--floor-weight", type=float, default=1.5)
+    parser.add_argument("--single", type=int, default=50, help="number of single queries")
+    parser.add_argument("--queries", type=int, default=200, help="number of batch queries")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--vectorized", action="store_true", help="build the edges with NumPy")
+    parser.add_argument("--visualize-max", type=int, default=200_000,
+                        help="largest map that is drawn")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write the JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            compare(json.load(before), json.load(after))
+        sys.exit()
+
+    params = {
+        "buildings": args.buildings,
+        "floors": args.floors,
+        "density": args.density,
+        "gap": args.gap,
+        "max_distance": args.max_distance,
+        "floor_weight": args.floor_weight,
+        "single": args.single,
+        "queries": args.queries,
+        "workers": args.workers,
+        "vectorized": args.vectorized,
+        "visualize_max": args.visualize_max,
+        "seed": args.seed,
+    }
+
+    report = run(args.sizes, params)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
@@ -13,7 +13,6 @@ from aueb_pathfinding.menu import (
     print_shortest_path, get_user_node,
     map_init_check, uni_init_check
 )
-from aueb_pathfinding.ultils import dijkstra
 
 
 # ==============================================================
@@ -24,6 +23,9 @@ from aueb_pathfinding.ultils import dijkstra
 uni_map = None
 uni = None
 
+# Last shortest path found, highlighted by the visualization
+last_path = None
+
 print(
     "\nRecommendation:\n"
     "- Maximum Distance: 21\n"
@@ -72,6 +74,7 @@ while True:
             continue
 
         uni = create_graph(uni_map)
+        last_path = None
 
         # Display graph information if creation succeeded
         if uni is not None:
@@ -106,15 +109,16 @@ while True:
                 break
             print(f"\nTarget classroom: {tnode}\n")
 
-            # Compute shortest path using Dijkstra's algorithm
-            shortest_path, distance = dijkstra(uni, snode, tnode)
+            # Compute shortest path (repeated queries come from the route cache)
+            shortest_path, distance = uni.shortest_path(snode, tnode)
 
             if not shortest_path:
-                # No path found (already handled inside dijkstra)
-                pass
+                # No path found
+                print(f"{tnode.name} is unreachable from {snode.name} !")
             else:
                 result_str = print_shortest_path(shortest_path, distance)
                 print(result_str)
+                last_path = shortest_path
 
     # ----------------------------------------------------------
     # Option 4: Visualize Graph
@@ -128,10 +132,8 @@ while True:
         if not uni_init_check(uni):
             continue
 
-        # Generate and display visualization
-        graph_fig = visualize_graph(
-            uni.nodes, uni.max_distance, uni.floor_weight
-        )
+        # Generate and display visualization (with the last path found)
+        graph_fig = visualize_graph(uni, path=last_path)
         graph_fig.show()
 
         print("\nReturning to main menu:")